@@ -68,6 +68,17 @@ class Settings(BaseSettings):
     # Default 0.1: low temperature keeps factual document answers consistent and reproducible.
     # Planner / classifier calls always use 0.1 regardless of this setting.
     LLM_TEMPERATURE: float = 0.1
+    # Reuse RAG answers when the same (or a paraphrased) question is asked over the
+    # same retrieved context, conversation history and model. Paraphrases match when
+    # the question embeddings are within LLM_RESPONSE_CACHE_MAX_DISTANCE (cosine).
+    LLM_RESPONSE_CACHE_ENABLED: bool = True
+    LLM_RESPONSE_CACHE_MAX_ENTRIES: int = 256
+    LLM_RESPONSE_CACHE_TTL_SECONDS: int = 3600
+    LLM_RESPONSE_CACHE_MAX_DISTANCE: float = 0.08
+    # Exact-match cache for generate_simple (classification, summaries, JSON
+    # selection); 0 disables it
+    LLM_SIMPLE_CACHE_MAX_ENTRIES: int = 2048
+    LLM_SIMPLE_CACHE_TTL_SECONDS: int = 3600
     # Ollama (local)
     OLLAMA_BASE_URL: str = "http://localhost:11434"
     OLLAMA_MODEL: str = "tinyllama"
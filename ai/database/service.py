@@ -4,7 +4,7 @@ Database service layer for document processor integration
 
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, func, and_, or_, desc
+from sqlalchemy import select, insert, update, delete, func, and_, or_, desc
 from sqlalchemy.sql.expression import literal
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta, timezone
@@ -20,6 +20,9 @@ from utils import utc_isoformat
 
 logger = logging.getLogger(__name__)
 
+# Paths per IN (...) lookup; stays under SQLite's bound-parameter limit
+_IN_CLAUSE_BATCH = 500
+
 class DatabaseService:
     """Service for database operations"""
     
@@ -169,6 +172,87 @@ class DatabaseService:
             processing_status="metadata_only"  # Indicates content not yet indexed
         )
 
+    async def store_metadata_only_bulk(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Store metadata-only records for many files in one transaction.
+
+        Each row needs file_path, file_type, file_size and last_modified. The
+        result matches calling store_metadata_only() per row (existing documents
+        are reset to metadata_only) without a round trip and commit per file.
+
+        Returns:
+            Number of rows written
+        """
+        return await self.store_document_metadata_bulk([
+            dict(
+                row,
+                file_hash="",
+                content_preview="",
+                chunks_count=0,
+                processing_status="metadata_only",
+            )
+            for row in rows
+        ])
+
+    async def store_document_metadata_bulk(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Store or update metadata for many documents in one transaction.
+
+        Each row holds the keyword arguments of store_document_metadata() and is
+        applied the same way (file_type is only set on insert, document_category
+        only when given), without a round trip and commit per file.
+
+        Returns:
+            Number of rows written
+        """
+        if not rows:
+            return 0
+        now = datetime.utcnow()
+        async with AsyncSessionLocal() as session:
+            try:
+                paths = [row["file_path"] for row in rows]
+                existing_ids: Dict[str, int] = {}
+                for i in range(0, len(paths), _IN_CLAUSE_BATCH):
+                    stmt = select(IndexedDocument.id, IndexedDocument.file_path).where(
+                        IndexedDocument.file_path.in_(paths[i:i + _IN_CLAUSE_BATCH])
+                    )
+                    for doc_id, file_path in (await session.execute(stmt)).all():
+                        existing_ids[file_path] = doc_id
+
+                updates: List[Dict[str, Any]] = []
+                inserts: List[Dict[str, Any]] = []
+                for row in rows:
+                    values = dict(
+                        file_hash=row["file_hash"],
+                        file_size=row["file_size"],
+                        last_modified=_naive(row["last_modified"]),
+                        content_preview=row.get("content_preview", ""),
+                        chunks_count=row.get("chunks_count", 0),
+                        last_processed=now,
+                        processing_status=row.get("processing_status", "indexed"),
+                    )
+                    if row.get("document_category") is not None:
+                        values["document_category"] = row["document_category"]
+                    doc_id = existing_ids.get(row["file_path"])
+                    if doc_id is not None:
+                        values["id"] = doc_id
+                        updates.append(values)
+                    else:
+                        values["file_path"] = row["file_path"]
+                        values["file_type"] = row["file_type"]
+                        inserts.append(values)
+
+                # ORM bulk UPDATE by primary key / bulk INSERT (executemany)
+                if updates:
+                    await session.execute(update(IndexedDocument), updates)
+                if inserts:
+                    await session.execute(insert(IndexedDocument), inserts)
+                await session.commit()
+                return len(rows)
+            except Exception:
+                await session.rollback()
+                raise
+
     async def set_documents_indexed(self, file_paths: List[str]) -> int:
         """Set processing_status='indexed' for all given file paths. Returns count updated. Used after background indexing to ensure DB is consistent."""
         if not file_paths:
@@ -653,21 +737,49 @@ class DatabaseService:
             count = await session.scalar(stmt)
             return (count or 0) > 0
 
+    # Columns needed to rebuild the filename trie and metadata cache; skips
+    # content_preview and the other text columns of a full IndexedDocument
+    _INDEX_STATE_COLUMNS = (
+        IndexedDocument.file_path,
+        IndexedDocument.file_hash,
+        IndexedDocument.file_type,
+        IndexedDocument.file_size,
+        IndexedDocument.last_modified,
+        IndexedDocument.chunks_count,
+        IndexedDocument.processing_status,
+    )
+
     async def get_indexed_docs_for_directory(self, directory_path: str) -> Dict[str, Any]:
         """
-        Return a dict of {file_path: IndexedDocument} for all indexed/metadata_only
-        documents under directory_path. Used by resume-mode indexing to skip unchanged files.
+        Return a dict of {file_path: row} for all indexed/metadata_only documents
+        under directory_path. Used by resume-mode indexing to skip unchanged files.
+
+        Rows carry only the index-state columns (see get_index_state_rows).
         """
         import os
         normalized = os.path.normpath(os.path.abspath(directory_path))
         async with AsyncSessionLocal() as session:
-            stmt = select(IndexedDocument).where(
+            stmt = select(*self._INDEX_STATE_COLUMNS).where(
                 IndexedDocument.processing_status.in_(["indexed", "metadata_only"]),
                 IndexedDocument.file_path.like(f"{normalized}%"),
             )
             result = await session.execute(stmt)
-            docs = result.scalars().all()
-            return {doc.file_path: doc for doc in docs}
+            return {row.file_path: row for row in result}
+
+    async def get_index_state_rows(self) -> List[Any]:
+        """
+        Return lightweight rows for all indexed/metadata_only documents.
+
+        Each row has file_path, file_hash, file_type, file_size, last_modified,
+        chunks_count and processing_status attributes. Plain column rows skip
+        ORM entity construction, which dominates startup on large indexes.
+        """
+        async with AsyncSessionLocal() as session:
+            stmt = select(*self._INDEX_STATE_COLUMNS).where(
+                IndexedDocument.processing_status.in_(["indexed", "metadata_only"])
+            )
+            result = await session.execute(stmt)
+            return result.all()
 
     async def get_all_indexed_docs(self) -> List[IndexedDocument]:
         """Return all documents with processing_status in ('indexed', 'metadata_only')."""
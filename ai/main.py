@@ -57,6 +57,7 @@ async def lifespan(app: FastAPI):
     processor = getattr(app.state, "doc_processor", None)
     if processor:
         await processor.cleanup()
+    app.state.pptx_converter.shutdown()
     if _prewarming_task and not _prewarming_task.done():
         _prewarming_task.cancel()
 
@@ -11,11 +11,22 @@ from schemas.chat import ChatRequest, ChatResponse
 from dependencies import db_service, require_app_state
 from services.query_rewriter import rewrite_with_last_document
 
+try:
+    import orjson
+except ImportError:  # optional accelerator; stdlib json is used instead
+    orjson = None
+
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api", tags=["chat"])
 
 
 def _format_sse(event: str, data: dict) -> str:
+    # Called once per streamed token, so serialisation cost adds up
+    if orjson is not None:
+        try:
+            return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+        except TypeError:  # e.g. non-str dict keys, which json.dumps coerces
+            pass
     return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
 
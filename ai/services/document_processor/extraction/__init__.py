@@ -4,6 +4,7 @@ from .text_extractor import STANDALONE_DOC_TYPES, TextExtractor, extract_doc_tit
 from .chunker import DocumentChunker
 from .file_validator import FileValidator
 from .embedding_service import EmbeddingService
+from .embedding_batcher import EmbeddingBatcher
 from .pptx_converter import PPTXConverter
 from .ocr_service import OCRService
 from .spreadsheet_extractor import SpreadsheetExtractor, is_spreadsheet
@@ -15,6 +16,7 @@ __all__ = [
     "DocumentChunker",
     "FileValidator",
     "EmbeddingService",
+    "EmbeddingBatcher",
     "PPTXConverter",
     "OCRService",
     "SpreadsheetExtractor",
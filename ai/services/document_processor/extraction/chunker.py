@@ -1,6 +1,7 @@
 import bisect
 import logging
 import re
+import threading
 from typing import List, Optional, Tuple
 from ..models import DocumentChunk
 
@@ -40,24 +41,30 @@ class DocumentChunker:
         self.chunk_overlap = chunk_overlap
         self.max_tokens = max_tokens
         self._tokenizer = None  # set via set_tokenizer() once the embedding model loads
+        self._tokenizer_lock = threading.Lock()
 
     # ------------------------------------------------------------------
     # Tokenizer integration
     # ------------------------------------------------------------------
 
-    def set_tokenizer(self, tokenizer) -> None:
+    def set_tokenizer(self, tokenizer, lock: Optional[threading.Lock] = None) -> None:
         """
         Wire in the HuggingFace tokenizer from the embedding model for accurate
         token counts.  Call this once the embedding model has been loaded.
+        Pass the embedding service's tokenizer_lock as *lock* so chunking in one
+        thread never overlaps an encode using the same tokenizer in another.
         """
         self._tokenizer = tokenizer
+        if lock is not None:
+            self._tokenizer_lock = lock
         logger.debug("Chunker: tokenizer wired in (%s)", type(tokenizer).__name__)
 
     def _count_tokens(self, text: str) -> int:
         """Return the number of tokens in *text*."""
         if self._tokenizer is not None:
             try:
-                return len(self._tokenizer.encode(text, add_special_tokens=True))
+                with self._tokenizer_lock:
+                    return len(self._tokenizer.encode(text, add_special_tokens=True))
             except Exception:
                 pass
         return max(1, len(text) // _CHARS_PER_TOKEN)
@@ -70,11 +77,12 @@ class DocumentChunker:
         """
         if self._tokenizer is not None:
             try:
-                ids = self._tokenizer.encode(text, add_special_tokens=False)
-                if len(ids) <= self.max_tokens - 2:
-                    return text.strip()
-                trimmed_ids = ids[: self.max_tokens - 2]  # reserve 2 for CLS/SEP
-                return self._tokenizer.decode(trimmed_ids, skip_special_tokens=True).strip()
+                with self._tokenizer_lock:
+                    ids = self._tokenizer.encode(text, add_special_tokens=False)
+                    if len(ids) <= self.max_tokens - 2:
+                        return text.strip()
+                    trimmed_ids = ids[: self.max_tokens - 2]  # reserve 2 for CLS/SEP
+                    return self._tokenizer.decode(trimmed_ids, skip_special_tokens=True).strip()
             except Exception:
                 pass
         approx_chars = (self.max_tokens - 2) * _CHARS_PER_TOKEN
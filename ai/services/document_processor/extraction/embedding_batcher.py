@@ -0,0 +1,114 @@
+"""Dynamic batching of embedding requests across concurrently indexed files."""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+import numpy as np
+
+from .embedding_service import EmbeddingService
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_MAX_BATCH = 128
+_DEFAULT_MAX_WAIT_MS = 10
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces embedding requests from many files into one model call.
+
+    Each file's chunks are queued as a single request; a drain task collects
+    requests until ``max_batch`` texts are waiting or ``max_wait_ms`` passes,
+    encodes them in one forward pass and hands each caller back its own slice.
+    Requests are never split, so a batch may exceed ``max_batch`` by up to one
+    request. The drain task exits when the queue is empty and is restarted by
+    the next request, so there is nothing to shut down.
+    """
+
+    def __init__(
+        self,
+        embedding_service: EmbeddingService,
+        model_lock: Optional[asyncio.Lock] = None,
+        max_batch: int = _DEFAULT_MAX_BATCH,
+        max_wait_ms: float = _DEFAULT_MAX_WAIT_MS,
+    ):
+        self.embedding_service = embedding_service
+        self._model_lock = model_lock or asyncio.Lock()
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: Deque[Tuple[List[str], asyncio.Future]] = deque()
+        self._queued_texts = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._drain_task: Optional[asyncio.Task] = None
+        self._dim: Optional[int] = None  # learned from the first model call
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts, sharing the model call with other pending requests.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            float32 array of shape (len(texts), dim), rows in the same order
+        """
+        if not texts:
+            if not self._dim:
+                self._dim = await asyncio.to_thread(self.embedding_service.get_embedding_dimension)
+            return np.empty((0, self._dim), dtype=np.float32)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((list(texts), future))
+        self._queued_texts += len(texts)
+
+        if self._drain_task is None or self._drain_task.done():
+            self._wakeup = asyncio.Event()
+            self._drain_task = loop.create_task(self._drain())
+        elif self._queued_texts >= self.max_batch:
+            self._wakeup.set()
+        return await future
+
+    async def _drain(self) -> None:
+        while self._queue:
+            if self._queued_texts < self.max_batch:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.max_wait)
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+
+            batch: List[Tuple[List[str], asyncio.Future]] = []
+            count = 0
+            while self._queue and count < self.max_batch:
+                texts, future = self._queue.popleft()
+                self._queued_texts -= len(texts)
+                if future.done():  # caller was cancelled while waiting
+                    continue
+                batch.append((texts, future))
+                count += len(texts)
+            if batch:
+                await self._encode_batch(batch)
+
+    async def _encode_batch(self, batch: List[Tuple[List[str], asyncio.Future]]) -> None:
+        all_texts = [text for texts, _ in batch for text in texts]
+        try:
+            async with self._model_lock:
+                embeddings = await asyncio.to_thread(
+                    self.embedding_service.encode_texts, all_texts
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self._dim = embeddings.shape[1]
+        logger.debug(f"Embedded {len(all_texts)} chunks for {len(batch)} request(s) in one call")
+        start = 0
+        for texts, future in batch:
+            end = start + len(texts)
+            if not future.done():
+                future.set_result(embeddings[start:end])
+            start = end
@@ -18,6 +18,9 @@ class EmbeddingService:
         self.model_name = model_name
         self.embed_model = None
         self._init_lock = threading.Lock()
+        # Serialises use of the model's HF tokenizer, which raises "Already
+        # borrowed" when two threads touch it at once. Shared with the chunker.
+        self.tokenizer_lock = threading.Lock()
         # Don't initialize model immediately - use lazy loading
     
     def _initialize_model(self):
@@ -37,7 +40,16 @@ class EmbeddingService:
                 logger.info(f"Loading embedding model: {self.model_name}")
                 # Force CPU to avoid device auto-detection edge cases on Windows
                 # that can surface as meta-tensor transfer errors in some torch builds.
-                self.embed_model = SentenceTransformer(self.model_name, device="cpu")
+                try:
+                    # Load from the local HF cache first: otherwise every cold start
+                    # asks the Hub for updates (several round trips, or a long stall
+                    # when offline) before the model can be used.
+                    self.embed_model = SentenceTransformer(
+                        self.model_name, device="cpu", local_files_only=True
+                    )
+                except Exception as e:
+                    logger.info(f"Embedding model not in local cache ({e}); downloading")
+                    self.embed_model = SentenceTransformer(self.model_name, device="cpu")
                 logger.info("Embedding model loaded successfully")
             except Exception as e:
                 logger.error(f"Failed to load embedding model: {e}")
@@ -51,10 +63,16 @@ class EmbeddingService:
     # faithfully respected after the decode → re-encode round-trip.
     _MAX_EMBED_CHARS = 1800
 
-    def encode_texts(self, texts: List[str]) -> List[List[float]]:
-        """Encode a list of texts to embeddings"""
+    def encode_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode a list of texts to embeddings.
+
+        Returns:
+            C-contiguous float32 array of shape (len(texts), dim), handed to the
+            vector store as-is rather than expanded into Python lists
+        """
         if not texts:
-            return []
+            return np.empty((0, 0), dtype=np.float32)
         
         try:
             # Initialize model if needed
@@ -70,13 +88,12 @@ class EmbeddingService:
                 for t in texts
             ]
             
-            # Convert to numpy array for batch processing
-            embeddings = self.embed_model.encode(safe_texts, show_progress_bar=False)
+            with self.tokenizer_lock:
+                embeddings = self.embed_model.encode(
+                    safe_texts, show_progress_bar=False, convert_to_numpy=True
+                )
             
-            # Convert to list of lists
-            if isinstance(embeddings, np.ndarray):
-                return embeddings.tolist()
-            return embeddings
+            return np.ascontiguousarray(embeddings, dtype=np.float32)
             
         except Exception as e:
             logger.error(f"Error encoding texts: {e}")
@@ -84,7 +101,7 @@ class EmbeddingService:
     
     def encode_single_text(self, text: str) -> List[float]:
         """Encode a single document text to embedding (no prefix)."""
-        return self.encode_texts([text])[0]
+        return self.encode_texts([text])[0].tolist()
 
     def encode_query(self, text: str) -> List[float]:
         """Encode a search query.
@@ -2,7 +2,9 @@ import hashlib
 import logging
 import os
 import re
-from typing import Tuple, Dict, Optional
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, Dict, Iterable, List, Optional
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -19,6 +21,17 @@ logger = logging.getLogger(__name__)
 BASE_SUPPORTED_EXTENSIONS = frozenset({".pdf", ".docx", ".txt", ".xlsx", ".xls", ".pptx"})
 IMAGE_EXTENSIONS_OCR = frozenset({".jpg", ".jpeg", ".png", ".tiff", ".tif", ".bmp"})
 
+# hashlib.file_digest (Python 3.11+) runs the read/update loop on one reused
+# buffer; older interpreters use the equivalent readinto loop below.
+_file_digest = getattr(hashlib, "file_digest", None)
+_HASH_CHUNK_SIZE = 1024 * 1024
+# Linux/BSD only
+_fadvise = getattr(os, "posix_fadvise", None)
+
+# hash_many(): below this many files the pool start-up is not worth it
+_PARALLEL_HASH_MIN_FILES = 4
+_MAX_HASH_WORKERS = 8
+
 
 class FileValidator:
     """Service for validating files and managing file metadata"""
@@ -38,57 +51,165 @@ class FileValidator:
     
     def validate_file(self, file_path: str) -> Tuple[bool, str]:
         """Validate file and return (is_valid, error_message)"""
+        is_valid, error, _ = self.validate_file_stat(file_path)
+        return is_valid, error
+    
+    def validate_file_stat(
+        self, file_path: str, stat_info: Optional[os.stat_result] = None
+    ) -> Tuple[bool, str, Optional[os.stat_result]]:
+        """
+        Validate file and return (is_valid, error_message, stat_result).
+        
+        Existence, file type and size all come from one os.stat() call (skipped
+        when the caller already has stat_info); pass the returned stat_result on
+        to extract_file_metadata() to reuse it. stat_result is None when the
+        path could not be stat'ed.
+        """
         try:
-            path_obj = Path(file_path)
+            if stat_info is None:
+                try:
+                    stat_info = os.stat(file_path)
+                except (FileNotFoundError, NotADirectoryError):
+                    return False, "File does not exist", None
             
-            if not path_obj.exists():
-                return False, "File does not exist"
-
-            if not path_obj.is_file():
-                return False, "Path is not a file"
+            if not stat.S_ISREG(stat_info.st_mode):
+                return False, "Path is not a file", stat_info
 
-            # Reject lock files and our own backups before any extension check
-            filename = path_obj.name
-            for pattern in _IGNORED_FILENAME_PATTERNS:
-                if pattern.search(filename):
-                    return False, f"Ignored file pattern: {filename}"
-
-            if path_obj.suffix.lower() not in self.supported_extensions:
-                return False, f"Unsupported file type: {path_obj.suffix}"
+            name_error = self._filename_error(os.path.basename(file_path))
+            if name_error:
+                return False, name_error, stat_info
             
-            file_size = path_obj.stat().st_size
+            file_size = stat_info.st_size
             if file_size > self.max_file_size_bytes:
-                return False, f"File too large ({file_size / 1024 / 1024:.1f}MB)"
+                return False, f"File too large ({file_size / 1024 / 1024:.1f}MB)", stat_info
             
             if file_size == 0:
-                return False, "File is empty"
+                return False, "File is empty", stat_info
             
             if not os.access(file_path, os.R_OK):
-                return False, "File not readable"
+                return False, "File not readable", stat_info
             
-            return True, ""
+            return True, "", stat_info
             
         except Exception as e:
-            return False, f"Validation error: {e}"
+            return False, f"Validation error: {e}", None
     
+    def _filename_error(self, filename: str) -> str:
+        """Reason a file with this name is never indexed, or "" if the name is fine."""
+        # Reject lock files and our own backups before any extension check
+        for pattern in _IGNORED_FILENAME_PATTERNS:
+            if pattern.search(filename):
+                return f"Ignored file pattern: {filename}"
+        suffix = Path(filename).suffix
+        if suffix.lower() not in self.supported_extensions:
+            return f"Unsupported file type: {suffix}"
+        return ""
+
+    def scan_directory(self, directory_path: str) -> List[Tuple[str, os.stat_result]]:
+        """
+        Walk directory_path and return (path, stat_result) for every valid file.
+
+        Entries are filtered by name before anything is stat'ed, directories are
+        recognised from the directory listing, and DirEntry.stat() comes free
+        with the listing on Windows. Paths match str(Path.rglob()) results and,
+        like rglob, symlinked directories are not descended into.
+        Blocking: call via asyncio.to_thread.
+        """
+        found: List[Tuple[str, os.stat_result]] = []
+        pending = [str(Path(directory_path))]
+        while pending:
+            current = pending.pop()
+            subdirs = []
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirs.append(entry.path)
+                                continue
+                            if self._filename_error(entry.name):
+                                continue
+                            is_valid, _, stat_info = self.validate_file_stat(
+                                entry.path, stat_info=entry.stat()
+                            )
+                        except OSError:
+                            continue  # vanished or dangling symlink
+                        if is_valid:
+                            found.append((entry.path, stat_info))
+            except OSError as e:
+                logger.warning(f"Could not scan directory {current}: {e}")
+                continue
+            # Depth-first, in listing order
+            pending.extend(reversed(subdirs))
+        return found
+
     def calculate_file_hash(self, file_path: str) -> str:
         """Calculate SHA-256 hash of file content efficiently"""
         try:
-            hash_sha256 = hashlib.sha256()
-            with open(file_path, "rb") as f:
-                # Read in larger chunks for better performance
-                for chunk in iter(lambda: f.read(65536), b""):
-                    hash_sha256.update(chunk)
-            return hash_sha256.hexdigest()
+            # Unbuffered: file_digest reads straight into its own reusable buffer
+            with open(file_path, "rb", buffering=0) as f:
+                if _fadvise is not None:
+                    # Whole-file sequential read: let the kernel read ahead further.
+                    # No DONTNEED afterwards; the file is usually parsed next.
+                    try:
+                        _fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                    except OSError:
+                        pass
+                if _file_digest is not None:
+                    return _file_digest(f, "sha256").hexdigest()
+                
+                hash_sha256 = hashlib.sha256()
+                buf = bytearray(_HASH_CHUNK_SIZE)
+                view = memoryview(buf)
+                while True:
+                    n = f.readinto(buf)
+                    if not n:
+                        break
+                    hash_sha256.update(view[:n])
+                return hash_sha256.hexdigest()
         except Exception as e:
             logger.error(f"Error calculating hash for {file_path}: {e}")
             return ""
     
-    def extract_file_metadata(self, file_path: str) -> Dict:
-        """Extract comprehensive file metadata"""
+    def hash_many(self, file_paths: Iterable[str]) -> Dict[str, str]:
+        """
+        Hash several files, in parallel for batches of 4 or more.
+        
+        hashlib releases the GIL while digesting, so threads hash separate
+        files on separate cores. Blocking: call via asyncio.to_thread from
+        async code.
+        
+        Returns:
+            file_path -> SHA-256 hex digest ("" where hashing failed)
+        """
+        paths = list(file_paths)
+        if len(paths) < _PARALLEL_HASH_MIN_FILES:
+            return {fp: self.calculate_file_hash(fp) for fp in paths}
+        
+        workers = min(_MAX_HASH_WORKERS, os.cpu_count() or 1, len(paths))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="file-hash") as pool:
+            return dict(zip(paths, pool.map(self.calculate_file_hash, paths)))
+    
+    def extract_file_metadata(
+        self,
+        file_path: str,
+        stat_info: Optional[os.stat_result] = None,
+        include_hash: bool = True,
+    ) -> Dict:
+        """
+        Extract comprehensive file metadata.
+        
+        Args:
+            file_path: Path to the file
+            stat_info: Result of an earlier os.stat() (e.g. from
+                validate_file_stat) to reuse instead of stat'ing again
+            include_hash: Hash the file content; callers that hash separately
+                (off the event loop) or do not need it pass False
+        """
         try:
             path_obj = Path(file_path)
-            stat_info = path_obj.stat()
+            if stat_info is None:
+                stat_info = os.stat(file_path)
             
             return {
                 "file_path": str(file_path),
@@ -101,7 +222,7 @@ class FileValidator:
                 "accessed_at": datetime.fromtimestamp(stat_info.st_atime, tz=timezone.utc),
                 "is_readable": os.access(file_path, os.R_OK),
                 "is_writable": os.access(file_path, os.W_OK),
-                "hash": self.calculate_file_hash(file_path)
+                "hash": self.calculate_file_hash(file_path) if include_hash else "",
             }
         except Exception as e:
             logger.error(f"Error extracting metadata for {file_path}: {e}")
@@ -111,14 +232,60 @@ class FileValidator:
         """Check if file type is supported"""
         return Path(file_path).suffix.lower() in self.supported_extensions
     
-    def get_file_size_mb(self, file_path: str) -> float:
-        """Get file size in MB"""
+    def get_file_size_mb(self, file_path: str, stat_info: Optional[os.stat_result] = None) -> float:
+        """Get file size in MB (from stat_info when the caller has one)"""
         try:
-            return Path(file_path).stat().st_size / 1024 / 1024
+            if stat_info is None:
+                stat_info = os.stat(file_path)
+            return stat_info.st_size / 1024 / 1024
         except Exception:
             return 0.0
     
-    def has_file_changed(self, file_path: str, previous_hash: str) -> bool:
-        """Check if file has changed by comparing hashes"""
+    def is_unchanged_since(
+        self,
+        file_path: str,
+        previous_size: Optional[int],
+        previous_modified_at: Optional[datetime],
+        stat_info: Optional[os.stat_result] = None,
+    ) -> bool:
+        """
+        True when the file still has the size and mtime recorded with its hash.
+        
+        A single stat() (or the caller's stat_info) instead of re-reading the
+        file; naive datetimes are treated as UTC, which is how the database
+        stores them.
+        """
+        if previous_size is None or previous_modified_at is None:
+            return False
+        if stat_info is None:
+            try:
+                stat_info = os.stat(file_path)
+            except OSError:
+                return False
+        if previous_modified_at.tzinfo is None:
+            previous_modified_at = previous_modified_at.replace(tzinfo=timezone.utc)
+        return (
+            stat_info.st_size == previous_size
+            and datetime.fromtimestamp(stat_info.st_mtime, tz=timezone.utc) == previous_modified_at
+        )
+    
+    def has_file_changed(
+        self,
+        file_path: str,
+        previous_hash: str,
+        previous_size: Optional[int] = None,
+        previous_modified_at: Optional[datetime] = None,
+        stat_info: Optional[os.stat_result] = None,
+    ) -> bool:
+        """
+        Check if file has changed by comparing hashes.
+        
+        When the size and modification time stored alongside previous_hash
+        are given and still match, the file is reported unchanged without
+        hashing it. stat_info, if the caller already has one, saves the
+        extra stat() for that check.
+        """
+        if self.is_unchanged_since(file_path, previous_size, previous_modified_at, stat_info):
+            return False
         current_hash = self.calculate_file_hash(file_path)
         return current_hash != previous_hash if current_hash else True
@@ -6,13 +6,19 @@ Uses Tesseract OCR to extract text from:
 - Image files (JPG, PNG, TIFF, BMP)
 
 Includes caching to avoid re-OCR of unchanged files.
+
+When the optional ``tesserocr`` binding is installed, OCR runs in-process on
+pooled, already-initialised Tesseract API instances instead of spawning the
+tesseract CLI (and reloading its language models) for every image/page.
 """
 
 import logging
 import hashlib
 import os
 import platform
+import queue
 import shutil
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Optional, List
 import asyncio
@@ -49,6 +55,11 @@ class OCRService:
         # Supported image formats
         self.supported_image_extensions = {".jpg", ".jpeg", ".png", ".tiff", ".tif", ".bmp"}
         
+        # Idle tesserocr API instances (one per concurrent OCR call at most);
+        # _tesserocr_usable is None until the first OCR call probes the binding
+        self._tess_apis: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._tesserocr_usable: Optional[bool] = None
+        
         if not self.tesseract_path:
             logger.warning("Tesseract OCR not found. OCR functionality will not be available.")
         else:
@@ -102,6 +113,72 @@ class OCRService:
         """Check if Tesseract OCR is available"""
         return self.tesseract_path is not None and os.path.exists(self.tesseract_path)
     
+    def _new_tess_api(self):
+        """Create an initialised tesserocr API, or None when the binding is unusable."""
+        if self._tesserocr_usable is False:
+            return None
+        try:
+            import tesserocr
+            
+            kwargs = {"lang": self.languages}
+            # A custom Tesseract install keeps its models next to the executable
+            if self.tesseract_path and os.path.isabs(self.tesseract_path):
+                tessdata = Path(self.tesseract_path).parent / "tessdata"
+                if tessdata.is_dir():
+                    kwargs["path"] = str(tessdata)
+            api = tesserocr.PyTessBaseAPI(**kwargs)
+        except ImportError:
+            self._tesserocr_usable = False
+            return None
+        except Exception as e:
+            logger.warning(f"tesserocr could not initialise ({e}); using the tesseract CLI")
+            self._tesserocr_usable = False
+            return None
+        
+        if self._tesserocr_usable is None:
+            logger.info("OCR using in-process tesserocr API")
+        self._tesserocr_usable = True
+        return api
+    
+    @contextmanager
+    def _tess_api(self):
+        """
+        Borrow a tesserocr API for the duration of one image or document.
+        
+        Yields None when tesserocr is not available; callers then use pytesseract.
+        """
+        try:
+            api = self._tess_apis.get_nowait()
+        except queue.Empty:
+            api = self._new_tess_api()
+        try:
+            yield api
+        finally:
+            if api is not None:
+                self._tess_apis.put(api)
+    
+    def _ocr_image(self, image, api=None) -> str:
+        """OCR one PIL image with a borrowed tesserocr API, else via pytesseract."""
+        if api is not None:
+            api.SetImage(image)
+            return api.GetUTF8Text()
+        
+        import pytesseract
+        
+        # Set Tesseract path if specified
+        if self.tesseract_path and self.tesseract_path != "tesseract" and self.tesseract_path != "tesseract.exe":
+            pytesseract.pytesseract.tesseract_cmd = self.tesseract_path
+        return pytesseract.image_to_string(image, lang=self.languages)
+    
+    def shutdown(self) -> None:
+        """Release pooled tesserocr API instances."""
+        while True:
+            try:
+                api = self._tess_apis.get_nowait()
+            except queue.Empty:
+                return
+            api.End()
+    
     def _calculate_file_hash(self, file_path: str) -> str:
         """Calculate SHA256 hash of file for cache key"""
         sha256_hash = hashlib.sha256()
@@ -212,19 +289,15 @@ class OCRService:
         
         # Perform OCR
         try:
-            import pytesseract
             from PIL import Image
             
-            # Set Tesseract path if specified
-            if self.tesseract_path and self.tesseract_path != "tesseract" and self.tesseract_path != "tesseract.exe":
-                pytesseract.pytesseract.tesseract_cmd = self.tesseract_path
-            
             # Open and process image
             image = Image.open(image_path)
             
             # Perform OCR with specified languages
             logger.info(f"Running OCR on {image_path_obj.name} (languages: {self.languages})...")
-            text = pytesseract.image_to_string(image, lang=self.languages)
+            with self._tess_api() as api:
+                text = self._ocr_image(image, api)
             
             # Clean up extracted text
             text = text.strip()
@@ -254,13 +327,15 @@ class OCRService:
             logger.error(f"OCR extraction failed for {image_path}: {e}")
             raise RuntimeError(f"OCR extraction failed: {str(e)}")
     
-    def _extract_text_from_scanned_pdf_sync(self, pdf_path: str, use_cache: bool = True) -> str:
+    def _extract_text_from_scanned_pdf_sync(self, pdf_path: str, use_cache: bool = True, doc=None) -> str:
         """
         Synchronously extract text from a scanned PDF by converting pages to images and OCRing.
         
         Args:
             pdf_path: Path to PDF file
             use_cache: Whether to use cached result if available
+            doc: Optional already-open fitz.Document for pdf_path. The caller keeps
+                 ownership and is responsible for closing it.
             
         Returns:
             Extracted text from all pages
@@ -286,46 +361,47 @@ class OCRService:
         # Convert PDF pages to images and OCR each page
         try:
             import fitz  # PyMuPDF
-            import pytesseract
             from PIL import Image
             import io
             
-            # Set Tesseract path if specified
-            if self.tesseract_path and self.tesseract_path != "tesseract" and self.tesseract_path != "tesseract.exe":
-                pytesseract.pytesseract.tesseract_cmd = self.tesseract_path
-            
-            doc = fitz.open(pdf_path)
+            owns_doc = doc is None
+            if owns_doc:
+                doc = fitz.open(pdf_path)
             total_pages = len(doc)
             
             if total_pages == 0:
-                doc.close()
+                if owns_doc:
+                    doc.close()
                 return ""
             
             logger.info(f"Processing {total_pages} pages from scanned PDF: {pdf_path_obj.name}")
             
             all_text_parts = []
             
-            for page_num in range(total_pages):
-                page = doc[page_num]
+            # One Tesseract API serves every page of the document
+            with self._tess_api() as api:
+                for page_num in range(total_pages):
+                    page = doc[page_num]
                 
-                # Convert page to image (300 DPI for good OCR quality)
-                mat = fitz.Matrix(300/72, 300/72)  # 300 DPI
-                pix = page.get_pixmap(matrix=mat)
+                    # Convert page to image (300 DPI for good OCR quality)
+                    mat = fitz.Matrix(300/72, 300/72)  # 300 DPI
+                    pix = page.get_pixmap(matrix=mat)
                 
-                # Convert to PIL Image
-                img_data = pix.tobytes("png")
-                image = Image.open(io.BytesIO(img_data))
+                    # Convert to PIL Image
+                    img_data = pix.tobytes("png")
+                    image = Image.open(io.BytesIO(img_data))
                 
-                # Perform OCR on this page
-                logger.debug(f"OCR page {page_num + 1}/{total_pages}...")
-                page_text = pytesseract.image_to_string(image, lang=self.languages)
+                    # Perform OCR on this page
+                    logger.debug(f"OCR page {page_num + 1}/{total_pages}...")
+                    page_text = self._ocr_image(image, api)
                 
-                if page_text.strip():
-                    all_text_parts.append(f"Page {page_num + 1}:\n{page_text.strip()}")
+                    if page_text.strip():
+                        all_text_parts.append(f"Page {page_num + 1}:\n{page_text.strip()}")
                 
-                pix = None  # Free memory
+                    pix = None  # Free memory
             
-            doc.close()
+            if owns_doc:
+                doc.close()
             
             # Combine all pages
             text = "\n\n".join(all_text_parts)
@@ -5,20 +5,89 @@ Converts PowerPoint files to PDF using LibreOffice headless mode.
 Includes caching to avoid re-conversion of unchanged files.
 """
 
+import functools
 import logging
 import subprocess
 import shutil
 import hashlib
+import mmap
 import os
 import platform
 import signal
+import tempfile
+import time
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Files above this size are hashed through mmap instead of buffered reads
+_MMAP_HASH_THRESHOLD = 8 * 1024 * 1024
+
+# Short-lived memo for _is_cache_valid stat checks
+_CACHE_VALID_MEMO_SIZE = 128
+_CACHE_VALID_TTL_SECONDS = 1.0
+
+
+@functools.lru_cache(maxsize=1)
+def _detect_libreoffice_cached(system: str) -> Optional[str]:
+    """
+    Auto-detect LibreOffice installation path.
+    
+    Cached per platform so repeated PPTXConverter construction does not
+    re-probe the filesystem.
+    
+    Args:
+        system: platform.system() value the lookup is keyed on
+    
+    Returns:
+        Path to LibreOffice executable, or None if not found
+    """
+    # Most installers put soffice on PATH; only probe fixed locations if not
+    executable = "soffice.exe" if system == "Windows" else "soffice"
+    if shutil.which(executable):
+        return executable
+    
+    # Common installation paths
+    if system == "Windows":
+        possible_paths = [
+            r"C:\Program Files\LibreOffice\program\soffice.exe",
+            r"C:\Program Files (x86)\LibreOffice\program\soffice.exe",
+            os.path.expanduser(r"~\AppData\Local\Programs\LibreOffice\program\soffice.exe"),
+        ]
+    elif system == "Darwin":  # macOS
+        possible_paths = [
+            "/Applications/LibreOffice.app/Contents/MacOS/soffice",
+            "/usr/local/bin/soffice",
+            "/opt/homebrew/bin/soffice",
+        ]
+    else:  # Linux
+        possible_paths = [
+            "/usr/bin/soffice",
+            "/usr/local/bin/soffice",
+            "/opt/libreoffice*/program/soffice",
+        ]
+    
+    # Check possible paths
+    for path in possible_paths:
+        if "*" in path:
+            # Handle glob patterns
+            import glob
+            matches = glob.glob(path)
+            if matches:
+                path = matches[0]
+        
+        if os.path.exists(path) and os.access(path, os.X_OK):
+            logger.info(f"Found LibreOffice at: {path}")
+            return path
+    
+    logger.warning("LibreOffice not found in common locations")
+    return None
+
 
 class PPTXConverter:
     """Service for converting PPTX files to PDF using LibreOffice"""
@@ -31,77 +100,44 @@ class PPTXConverter:
             libreoffice_path: Path to LibreOffice executable. If None, will auto-detect.
             cache_dir: Directory to store cached PDF conversions
         """
-        self.libreoffice_path = libreoffice_path or self._detect_libreoffice()
+        self.libreoffice_path = libreoffice_path or _detect_libreoffice_cached(platform.system())
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
         # Conversion timeout (seconds)
         self.conversion_timeout = 60
         
+        # Each soffice process costs hundreds of MB, so a semaphore caps how many
+        # run at once. The pool only backs the blocking fallback in _convert_sync
+        # (threads are spawned lazily, so it costs nothing when unused).
+        self.max_concurrent_conversions = max(1, (os.cpu_count() or 2) // 2)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent_conversions,
+            thread_name_prefix="pptx-conv",
+        )
+        self._conversion_semaphore = asyncio.Semaphore(self.max_concurrent_conversions)
+        
+        # (source path, cache path) → (is_valid, checked_at); FIFO, max _CACHE_VALID_MEMO_SIZE
+        self._cache_valid_memo: OrderedDict = OrderedDict()
+        
         if not self.libreoffice_path:
             logger.warning("LibreOffice not found. PPTX preview will not work.")
         else:
             logger.info(f"PPTX Converter initialized with LibreOffice: {self.libreoffice_path}")
     
-    def _detect_libreoffice(self) -> Optional[str]:
-        """
-        Auto-detect LibreOffice installation path.
-        
-        Returns:
-            Path to LibreOffice executable, or None if not found
-        """
-        system = platform.system()
-        
-        # Common installation paths
-        if system == "Windows":
-            possible_paths = [
-                r"C:\Program Files\LibreOffice\program\soffice.exe",
-                r"C:\Program Files (x86)\LibreOffice\program\soffice.exe",
-                os.path.expanduser(r"~\AppData\Local\Programs\LibreOffice\program\soffice.exe"),
-            ]
-            # Also check PATH
-            if shutil.which("soffice.exe"):
-                return "soffice.exe"
-        elif system == "Darwin":  # macOS
-            possible_paths = [
-                "/Applications/LibreOffice.app/Contents/MacOS/soffice",
-                "/usr/local/bin/soffice",
-                "/opt/homebrew/bin/soffice",
-            ]
-            if shutil.which("soffice"):
-                return "soffice"
-        else:  # Linux
-            possible_paths = [
-                "/usr/bin/soffice",
-                "/usr/local/bin/soffice",
-                "/opt/libreoffice*/program/soffice",
-            ]
-            if shutil.which("soffice"):
-                return "soffice"
-        
-        # Check possible paths
-        for path in possible_paths:
-            if "*" in path:
-                # Handle glob patterns
-                import glob
-                matches = glob.glob(path)
-                if matches:
-                    path = matches[0]
-            
-            if os.path.exists(path) and os.access(path, os.X_OK):
-                logger.info(f"Found LibreOffice at: {path}")
-                return path
-        
-        logger.warning("LibreOffice not found in common locations")
-        return None
-    
     def _calculate_file_hash(self, file_path: str) -> str:
         """Calculate SHA256 hash of file for cache key"""
         sha256_hash = hashlib.sha256()
         with open(file_path, "rb") as f:
-            # Read file in chunks to handle large files
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
+            size = os.fstat(f.fileno()).st_size
+            if size > _MMAP_HASH_THRESHOLD:
+                # Large decks: hash straight from the page cache, no Python-level copies
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    sha256_hash.update(mm)
+            else:
+                # Read file in chunks to handle large files
+                for byte_block in iter(lambda: f.read(65536), b""):
+                    sha256_hash.update(byte_block)
         return sha256_hash.hexdigest()
     
     def _get_cache_path(self, pptx_path: str) -> Path:
@@ -116,18 +152,28 @@ class PPTXConverter:
         Cache is valid if:
         1. Cache file exists
         2. Source file hasn't been modified since cache was created
+        
+        Results are memoized for a second so the common "convert, then probe
+        get_cached_pdf" sequence within one request does not re-stat both files.
         """
-        if not cache_path.exists():
-            return False
+        key = (pptx_path, str(cache_path))
+        now = time.monotonic()
+        memo = self._cache_valid_memo.get(key)
+        if memo is not None and now - memo[1] < _CACHE_VALID_TTL_SECONDS:
+            return memo[0]
         
         try:
-            pptx_mtime = os.path.getmtime(pptx_path)
-            cache_mtime = os.path.getmtime(cache_path)
-            
+            pptx_mtime = os.stat(pptx_path).st_mtime_ns
+            cache_mtime = os.stat(cache_path).st_mtime_ns
             # Cache is valid if it's newer than the source file
-            return cache_mtime >= pptx_mtime
+            is_valid = cache_mtime >= pptx_mtime
         except OSError:
-            return False
+            is_valid = False
+        
+        self._cache_valid_memo[key] = (is_valid, now)
+        if len(self._cache_valid_memo) > _CACHE_VALID_MEMO_SIZE:
+            self._cache_valid_memo.popitem(last=False)
+        return is_valid
     
     async def convert_to_pdf(
         self,
@@ -159,35 +205,57 @@ class PPTXConverter:
         if not src.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
 
-        if use_cache:
-            cache_path = self._get_cache_path(file_path)
-            if self._is_cache_valid(file_path, cache_path):
-                logger.info("Using cached PDF for %s", src.name)
-                return str(cache_path)
-
-        if output_path is None:
-            output_path = str(self._get_cache_path(file_path))
+        cache_path = self._get_cache_path(file_path)
+        if use_cache and self._is_cache_valid(file_path, cache_path):
+            logger.info("Using cached PDF for %s", src.name)
+            return str(cache_path)
 
-        output_path_obj = Path(output_path)
-        output_dir = output_path_obj.parent
-        output_dir.mkdir(parents=True, exist_ok=True)
+        # Private work dir per call: two sources sharing a stem (e.g. report.pptx in
+        # different folders) would otherwise both write <stem>.pdf into one directory.
+        work_dir = Path(tempfile.mkdtemp(prefix="lo_out_", dir=str(self.cache_dir)))
+        try:
+            async with self._conversion_semaphore:
+                try:
+                    await self._convert_async(file_path, str(work_dir))
+                except NotImplementedError:
+                    # Selector event loops (uvicorn --reload on Windows) cannot spawn
+                    # subprocesses; fall back to a blocking Popen on the conversion pool.
+                    loop = asyncio.get_running_loop()
+                    await loop.run_in_executor(self._executor, self._convert_sync, file_path, str(work_dir))
 
-        await asyncio.to_thread(self._convert_sync, file_path, str(output_dir))
+            expected_pdf = work_dir / f"{src.stem}.pdf"
+            if not expected_pdf.exists():
+                raise RuntimeError(
+                    f"PDF conversion failed: output file not found at {expected_pdf}"
+                )
 
-        expected_pdf = output_dir / f"{src.stem}.pdf"
-        if not expected_pdf.exists():
-            raise RuntimeError(
-                f"PDF conversion failed: output file not found at {expected_pdf}"
-            )
+            # The result always lands in the cache so later calls skip LibreOffice,
+            # even when the caller asked for the PDF somewhere else.
+            os.replace(expected_pdf, cache_path)
+            self._cache_valid_memo.pop((file_path, str(cache_path)), None)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
 
-        if expected_pdf != output_path_obj:
-            if output_path_obj.exists():
-                output_path_obj.unlink()
-            shutil.move(str(expected_pdf), str(output_path_obj))
+        if output_path is None or Path(output_path) == cache_path:
+            logger.info("Converted %s → %s", src.name, cache_path)
+            return str(cache_path)
 
+        output_path_obj = Path(output_path)
+        self._link_or_copy(cache_path, output_path_obj)
         logger.info("Converted %s → %s", src.name, output_path_obj)
         return str(output_path_obj)
 
+    @staticmethod
+    def _link_or_copy(src: Path, dst: Path):
+        """Hardlink src to dst, copying when links are unsupported or cross-device."""
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        if dst.exists():
+            dst.unlink()
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
     async def convert_pptx_to_pdf(
         self,
         pptx_path: str,
@@ -197,24 +265,116 @@ class PPTXConverter:
         """Backward-compatible alias for convert_to_pdf."""
         return await self.convert_to_pdf(pptx_path, output_path, use_cache)
     
+    def _build_command(self, pptx_path: str, output_dir: str, profile_dir: str) -> List[str]:
+        """LibreOffice headless command line for a single conversion."""
+        return [
+            self.libreoffice_path,
+            # A private user profile per call: LibreOffice locks its profile directory,
+            # so concurrent conversions sharing the default one serialize or fail.
+            f"-env:UserInstallation={Path(profile_dir).as_uri()}",
+            "--headless",
+            "--convert-to", "pdf",
+            "--outdir", output_dir,
+            pptx_path
+        ]
+    
+    async def _convert_async(self, pptx_path: str, output_dir: str):
+        """
+        Convert using LibreOffice headless mode without tying up a thread.
+        
+        Args:
+            pptx_path: Path to PPTX file
+            output_dir: Directory to save PDF output
+            
+        Raises:
+            NotImplementedError: If the running event loop cannot spawn subprocesses
+        """
+        profile_dir = tempfile.mkdtemp(prefix="lo_profile_")
+        try:
+            cmd = self._build_command(pptx_path, output_dir, profile_dir)
+            logger.debug(f"Running LibreOffice conversion: {' '.join(cmd)}")
+            
+            if platform.system() == "Windows":
+                # New process group so taskkill /T can take down soffice.bin too
+                spawn_kwargs = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+            else:
+                # Own session, so the whole soffice tree can be killed via its pgid
+                spawn_kwargs = {"start_new_session": True}
+            
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    **spawn_kwargs,
+                )
+            except FileNotFoundError:
+                raise RuntimeError(
+                    f"LibreOffice executable not found at: {self.libreoffice_path}"
+                )
+            
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(), timeout=self.conversion_timeout
+                )
+            except asyncio.TimeoutError:
+                await self._kill_process_tree(process)
+                raise RuntimeError(
+                    f"PPTX conversion timed out after {self.conversion_timeout} seconds. "
+                    "File may be too large or complex."
+                )
+            except asyncio.CancelledError:
+                # Caller gave up (e.g. the preview endpoint's own timeout)
+                await self._kill_process_tree(process)
+                raise
+            
+            if process.returncode != 0:
+                error_msg = (stderr or stdout).decode(errors="replace") or "Unknown error"
+                raise RuntimeError(
+                    f"LibreOffice conversion failed (exit code {process.returncode}): {error_msg}"
+                )
+            
+            logger.debug("LibreOffice conversion completed successfully")
+        finally:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+    
+    async def _kill_process_tree(self, process: asyncio.subprocess.Process):
+        """Kill a LibreOffice process and its children, then reap it."""
+        if process.returncode is not None:
+            return
+        try:
+            if platform.system() == "Windows":
+                killer = await asyncio.create_subprocess_exec(
+                    "taskkill", "/F", "/T", "/PID", str(process.pid),
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+                await asyncio.wait_for(killer.wait(), timeout=5)
+            else:
+                os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            # Process already dead
+            pass
+        except Exception as kill_error:
+            logger.warning(f"Error killing LibreOffice process: {kill_error}")
+            process.kill()
+        await process.wait()
+    
     def _convert_sync(self, pptx_path: str, output_dir: str):
         """
         Synchronous conversion using LibreOffice headless mode.
         
+        Only used when the event loop cannot spawn subprocesses itself.
+        
         Args:
             pptx_path: Path to PPTX file
             output_dir: Directory to save PDF output
         """
         process = None
+        profile_dir = tempfile.mkdtemp(prefix="lo_profile_")
         try:
             # Build LibreOffice command
-            cmd = [
-                self.libreoffice_path,
-                "--headless",
-                "--convert-to", "pdf",
-                "--outdir", output_dir,
-                pptx_path
-            ]
+            cmd = self._build_command(pptx_path, output_dir, profile_dir)
             
             logger.debug(f"Running LibreOffice conversion: {' '.join(cmd)}")
             
@@ -318,6 +478,7 @@ class PPTXConverter:
                         process.kill()
                     except Exception:
                         pass
+            shutil.rmtree(profile_dir, ignore_errors=True)
     
     def get_cached_pdf(self, file_path: str) -> Optional[str]:
         """Return path to cached PDF if still valid, else None."""
@@ -341,33 +502,27 @@ class PPTXConverter:
             return {
                 "cleared_count": 0,
                 "total_size_bytes": 0,
+                "total_size_mb": 0,
                 "cache_dir": str(self.cache_dir)
             }
         
-        now = datetime.now().timestamp()
+        # Anything modified before the cutoff is stale; None clears everything
+        cutoff = None
+        if older_than_days is not None:
+            cutoff = datetime.now().timestamp() - older_than_days * 24 * 60 * 60
         cleared_count = 0
         total_size_bytes = 0
         
-        for cache_file in self.cache_dir.glob("*.pdf"):
+        for cache_file, st in self._scan_cache_entries():
             try:
-                file_size = cache_file.stat().st_size
-                should_delete = False
-                
-                if older_than_days is None:
-                    should_delete = True
-                else:
-                    file_age = now - cache_file.stat().st_mtime
-                    age_days = file_age / (24 * 60 * 60)
-                    if age_days > older_than_days:
-                        should_delete = True
-                
-                if should_delete:
-                    cache_file.unlink()
+                if cutoff is None or st.st_mtime < cutoff:
+                    os.unlink(cache_file)
                     cleared_count += 1
-                    total_size_bytes += file_size
+                    total_size_bytes += st.st_size
             except Exception as e:
                 logger.warning(f"Failed to delete cache file {cache_file}: {e}")
         
+        self._cache_valid_memo.clear()
         logger.info(f"Cleared {cleared_count} cached PDF files ({total_size_bytes / (1024*1024):.2f} MB)")
         
         return {
@@ -377,6 +532,27 @@ class PPTXConverter:
             "cache_dir": str(self.cache_dir)
         }
     
+    def _scan_cache_entries(self) -> List[Tuple[str, os.stat_result]]:
+        """
+        List cached PDFs with their stat results in a single directory pass.
+        
+        os.scandir reads directory entries in batches, and each entry is
+        stat'ed exactly once. Entries that vanish mid-scan are skipped.
+        """
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(".pdf"):
+                        continue
+                    try:
+                        entries.append((entry.path, entry.stat()))
+                    except OSError:
+                        continue
+        except FileNotFoundError:
+            pass
+        return entries
+    
     def get_cache_stats(self) -> dict:
         """
         Get statistics about the cache directory.
@@ -394,19 +570,15 @@ class PPTXConverter:
                 "newest_file_age_days": 0
             }
         
-        cache_files = list(self.cache_dir.glob("*.pdf"))
+        cache_files = self._scan_cache_entries()
         file_count = len(cache_files)
-        total_size_bytes = sum(f.stat().st_size for f in cache_files if f.exists())
+        total_size_bytes = sum(st.st_size for _, st in cache_files)
         
         if cache_files:
             now = datetime.now().timestamp()
-            file_ages = [
-                (now - f.stat().st_mtime) / (24 * 60 * 60)
-                for f in cache_files
-                if f.exists()
-            ]
-            oldest_age = max(file_ages) if file_ages else 0
-            newest_age = min(file_ages) if file_ages else 0
+            mtimes = [st.st_mtime for _, st in cache_files]
+            oldest_age = (now - min(mtimes)) / (24 * 60 * 60)
+            newest_age = (now - max(mtimes)) / (24 * 60 * 60)
         else:
             oldest_age = 0
             newest_age = 0
@@ -420,6 +592,10 @@ class PPTXConverter:
             "newest_file_age_days": round(newest_age, 2)
         }
     
+    def shutdown(self):
+        """Release the conversion thread pool."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
     def is_available(self) -> bool:
         """Check if LibreOffice is available for conversion"""
         return self.libreoffice_path is not None and os.path.exists(self.libreoffice_path)
@@ -26,9 +26,11 @@ text-extractor + prose-chunker pipeline with
 ``SpreadsheetExtractor.extract_chunks(file_path)``.
 """
 
+import io
 import logging
+from datetime import date, datetime, time
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from ..models import DocumentChunk
 
@@ -50,6 +52,66 @@ def is_spreadsheet(file_path: str) -> bool:
     return Path(file_path).suffix.lower() in SPREADSHEET_EXTENSIONS
 
 
+def _format_row(values) -> List[str]:
+    """
+    Stringify one row of raw cell values, dropping trailing empty cells.
+
+    This is the per-cell hot loop shared by the XLSX and XLS readers.  Because
+    trailing empties are trimmed, a blank row comes back as an empty list.
+    """
+    # Deliberately branch-free per type: str() on str/int/float is a C fast
+    # path, and an explicit ``v.__class__ is str`` test measured slower.
+    cells = [str(v).strip() if v is not None else "" for v in values]
+    if cells and not cells[-1]:
+        # Find where the trailing run of empties starts, then drop it with one
+        # slice delete instead of a pop() per cell (rows padded to max_column)
+        end = len(cells) - 1
+        while end and not cells[end - 1]:
+            end -= 1
+        del cells[end:]
+    return cells
+
+
+def _split_header_rows(value_rows) -> Tuple[List[str], List[str]]:
+    """
+    First non-blank row becomes the headers; remaining non-blank rows are data.
+
+    Data rows are kept as their final ``a | b | c`` strings: one object per row
+    instead of a list plus one string per cell, while the whole sheet is held.
+    """
+    headers: List[str] = []
+    rows: List[str] = []
+    first_data_row = True
+
+    for row_values in value_rows:
+        cells = _format_row(row_values)
+        if not cells:
+            continue  # skip blank rows
+
+        if first_data_row:
+            headers = cells
+            first_data_row = False
+        else:
+            rows.append(" | ".join(cells))
+
+    return headers, rows
+
+
+def _from_calamine(value):
+    """
+    Map a calamine cell value onto what openpyxl returns for the same cell.
+
+    calamine reports every number as float and date-only cells as date;
+    openpyxl gives int for whole numbers and always datetime, and chunk text
+    should not depend on which parser was installed.
+    """
+    if value.__class__ is float and value.is_integer():
+        return int(value)
+    if value.__class__ is date:
+        return datetime.combine(value, time())
+    return value
+
+
 # ---------------------------------------------------------------------------
 # SpreadsheetExtractor
 # ---------------------------------------------------------------------------
@@ -106,6 +168,48 @@ class SpreadsheetExtractor:
     # ------------------------------------------------------------------
 
     def _extract_xlsx_chunks(self, file_path: str) -> List[DocumentChunk]:
+        sheets = self._read_xlsx_calamine(file_path)
+        if sheets is None:
+            sheets = self._read_xlsx_openpyxl(file_path)
+
+        chunks: List[DocumentChunk] = []
+        chunk_id = 0
+        for sheet_name, headers, rows in sheets:
+            new = self._rows_to_chunks(headers, rows, sheet_name, file_path, chunk_id)
+            chunks.extend(new)
+            chunk_id += len(new)
+
+        return chunks
+
+    @staticmethod
+    def _read_xlsx_calamine(file_path: str) -> Optional[List[Tuple[str, List[str], List[str]]]]:
+        """
+        Read every sheet with python-calamine (Rust parser), if installed.
+
+        Returns None when calamine is unavailable or cannot read the file,
+        so the caller falls back to openpyxl.
+        """
+        try:
+            from python_calamine import CalamineWorkbook
+        except ImportError:
+            return None
+
+        try:
+            wb = CalamineWorkbook.from_path(file_path)
+            sheets = []
+            for sheet_name in wb.sheet_names:
+                # skip_empty_area=False keeps leading blank columns, like openpyxl
+                values = wb.get_sheet_by_name(sheet_name).to_python(skip_empty_area=False)
+                headers, rows = _split_header_rows(
+                    [_from_calamine(v) for v in row] for row in values
+                )
+                sheets.append((sheet_name, headers, rows))
+            return sheets
+        except Exception as exc:
+            logger.debug("calamine could not read %s, using openpyxl: %s", file_path, exc)
+            return None
+
+    def _read_xlsx_openpyxl(self, file_path: str) -> List[Tuple[str, List[str], List[str]]]:
         try:
             from openpyxl import load_workbook
         except ImportError as exc:
@@ -118,17 +222,15 @@ class SpreadsheetExtractor:
         except Exception as exc:
             raise ValueError(f"Cannot open XLSX file '{file_path}': {exc}") from exc
 
-        chunks: List[DocumentChunk] = []
-        chunk_id = 0
-        for sheet_name in wb.sheetnames:
-            sheet = wb[sheet_name]
-            headers, rows = self._read_xlsx_sheet(sheet)
-            new = self._rows_to_chunks(headers, rows, sheet_name, file_path, chunk_id)
-            chunks.extend(new)
-            chunk_id += len(new)
-
-        wb.close()
-        return chunks
+        # One pass over a single read-only workbook. Parsing is GIL-bound, so
+        # reading sheets on worker threads (each with its own workbook) was slower.
+        try:
+            return [
+                (sheet_name, *self._read_xlsx_sheet(wb[sheet_name]))
+                for sheet_name in wb.sheetnames
+            ]
+        finally:
+            wb.close()
 
     def _extract_xls_chunks(self, file_path: str) -> List[DocumentChunk]:
         try:
@@ -156,54 +258,31 @@ class SpreadsheetExtractor:
         return chunks
 
     # ------------------------------------------------------------------
-    # Sheet readers — return (headers, list-of-row-value-lists)
+    # Sheet readers — return (headers, list of joined row strings)
     # ------------------------------------------------------------------
 
     @staticmethod
-    def _read_xlsx_sheet(sheet) -> Tuple[List[str], List[List[str]]]:
+    def _read_xlsx_sheet(sheet) -> Tuple[List[str], List[str]]:
         """Read an openpyxl sheet into (headers, rows)."""
-        headers: List[str] = []
-        rows: List[List[str]] = []
-        first_data_row = True
-
-        for row_tuple in sheet.iter_rows(values_only=True):
-            cells = [str(v).strip() if v is not None else "" for v in row_tuple]
-            # Trim trailing empty cells.
-            while cells and not cells[-1]:
-                cells.pop()
-            if not any(cells):
-                continue  # skip blank rows
-
-            if first_data_row:
-                headers = cells
-                first_data_row = False
-            else:
-                rows.append(cells)
-
-        return headers, rows
+        return _split_header_rows(sheet.iter_rows(values_only=True))
 
     @staticmethod
-    def _read_xls_sheet(sheet) -> Tuple[List[str], List[List[str]]]:
+    def _read_xls_sheet(sheet) -> Tuple[List[str], List[str]]:
         """Read an xlrd sheet into (headers, rows)."""
         headers: List[str] = []
-        rows: List[List[str]] = []
+        rows: List[str] = []
 
         for row_idx in range(sheet.nrows):
-            cells = [
-                str(sheet.cell_value(row_idx, col)).strip()
-                if sheet.cell_value(row_idx, col)
-                else ""
-                for col in range(sheet.ncols)
-            ]
-            while cells and not cells[-1]:
-                cells.pop()
-            if not any(cells):
+            # row_values() returns the whole row as plain values in one call,
+            # instead of two cell_value() lookups per cell.
+            cells = _format_row(sheet.row_values(row_idx))
+            if not cells:
                 continue
 
             if row_idx == 0:
                 headers = cells
             else:
-                rows.append(cells)
+                rows.append(" | ".join(cells))
 
         return headers, rows
 
@@ -214,7 +293,7 @@ class SpreadsheetExtractor:
     def _rows_to_chunks(
         self,
         headers: List[str],
-        rows: List[List[str]],
+        rows: List[str],
         sheet_name: str,
         file_path: str,
         chunk_id_offset: int,
@@ -227,24 +306,22 @@ class SpreadsheetExtractor:
         chunks: List[DocumentChunk] = []
 
         for group_start in range(0, len(rows), self.rows_per_chunk):
-            group = rows[group_start: group_start + self.rows_per_chunk]
-            row_start = group_start + 1       # 1-based display index
-            row_end = group_start + len(group)
+            row_end = min(group_start + self.rows_per_chunk, len(rows))
 
-            meta_line = (
+            # Write straight into one buffer rather than collecting per-row
+            # strings in intermediate lists and joining them afterwards.
+            buf = io.StringIO()
+            buf.write(
                 f"[File: {file_name} | Sheet: {sheet_name} | "
-                f"Rows: {row_start}-{row_end}]"
+                f"Rows: {group_start + 1}-{row_end}]"
             )
-            row_lines = [
-                f"Row {row_start + i}: {' | '.join(r)}"
-                for i, r in enumerate(group)
-            ]
-
-            parts = [meta_line]
             if header_line:
-                parts.append(header_line)
-            parts.extend(row_lines)
-            text = "\n".join(parts)
+                buf.write("\n")
+                buf.write(header_line)
+            for row_idx in range(group_start, row_end):
+                buf.write(f"\nRow {row_idx + 1}: ")
+                buf.write(rows[row_idx])
+            text = buf.getvalue()
 
             chunks.append(
                 DocumentChunk(
@@ -1,8 +1,18 @@
+import codecs
+import gc
+import itertools
 import json
 import logging
+import mmap
+import multiprocessing
+import os
+import posixpath
 import re as _re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import FrozenSet, Optional
+from typing import FrozenSet, List, Optional
 import asyncio
 
 from .file_validator import BASE_SUPPORTED_EXTENSIONS, IMAGE_EXTENSIONS_OCR
@@ -44,6 +54,36 @@ STANDALONE_DOC_TYPES: FrozenSet[str] = _load_standalone_doc_types()
 # How far into the document to scan for a type label.
 _PRIMARY_TYPE_SCAN_CHARS = 16000
 
+# OOXML namespaces used by the direct-XML PPTX reader
+_NS_P = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+_NS_A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+_NS_R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# Leading PDF pages checked for text before a file is treated as scanned and sent to OCR.
+_SCANNED_PDF_PROBE_PAGES = 3
+
+
+# .txt files larger than this are decoded from an mmap instead of read() into bytes.
+_MMAP_TEXT_THRESHOLD = 8 * 1024 * 1024
+
+# Byte-order marks checked before the fallback encodings in _extract_txt.
+# UTF-32 must come first: its little-endian BOM starts with the UTF-16 one.
+_TEXT_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def _normalize_newlines(text: str) -> str:
+    """Turn CRLF and lone CR line endings into LF, as text-mode open() does."""
+    if "\r" not in text:
+        return text
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
 
 def _normalize_title_line(line: str) -> str:
     """Collapse internal whitespace for robust match against OCR / large headings."""
@@ -116,9 +156,55 @@ def build_layout_aware_preview(text: str, max_chars: int = 500) -> str:
     return composed
 
 
+# Formats whose parsing is pure-Python object-model work (python-docx,
+# python-pptx).  These hold the GIL for the whole extraction, so concurrent
+# files only really run in parallel in separate processes.  PDF stays on
+# threads because its OCR fallback needs the parent's OCRService and cache.
+_PROCESS_POOL_EXTENSIONS = frozenset({".docx", ".pptx"})
+_MAX_PROCESS_WORKERS = 4
+
+# One OCR-less extractor per worker process, created on first use
+_worker_extractor = None
+
+
+def _worker_mp_context():
+    """
+    Start method for extraction workers.
+
+    Forking the server would copy a multithreaded process (tokenizer, search
+    and indexing threads) whose locks may be held mid-operation. A forkserver
+    is started clean, imports this module once, and forks each worker from
+    that small single-threaded process, so workers neither inherit those locks
+    nor import the parent's model libraries. Spawn is the fallback where
+    forkserver is unavailable (Windows).
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload([__name__])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+def _extract_in_worker(file_path: str) -> str:
+    """Process-pool entry point (top-level so it pickles)."""
+    global _worker_extractor
+    if _worker_extractor is None:
+        _worker_extractor = TextExtractor()
+    return _worker_extractor._extract_text_sync(file_path)
+
+
 class TextExtractor:
     """Service for extracting text from various document formats"""
     
+    # Extension → extractor method name, resolved once per call with getattr
+    _DISPATCH = {
+        ".pdf": "_extract_pdf",
+        ".docx": "_extract_docx",
+        ".txt": "_extract_txt",
+        ".pptx": "_extract_pptx",
+        **{ext: "_extract_image" for ext in IMAGE_EXTENSIONS_OCR},
+    }
+    
     def __init__(self, ocr_service=None):
         """
         Initialize text extractor.
@@ -126,9 +212,10 @@ class TextExtractor:
         Args:
             ocr_service: Optional OCRService instance for scanned document processing
         """
-        self.supported_extensions = set(BASE_SUPPORTED_EXTENSIONS)
         if ocr_service and ocr_service.is_available():
-            self.supported_extensions.update(IMAGE_EXTENSIONS_OCR)
+            self.supported_extensions = BASE_SUPPORTED_EXTENSIONS | IMAGE_EXTENSIONS_OCR
+        else:
+            self.supported_extensions = BASE_SUPPORTED_EXTENSIONS
         
         self.ocr_service = ocr_service
         
@@ -137,34 +224,53 @@ class TextExtractor:
         self.max_rows_per_sheet = 10000  # Limit rows per sheet
         # PowerPoint processing limits
         self.max_slides_per_presentation = 200  # Limit slides to prevent memory issues
+        
+        # Created on first DOCX/PPTX extraction; None again after shutdown()
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_broken = False
     
     async def extract_text_async(self, file_path: str) -> str:
         """Extract text asynchronously to avoid blocking"""
-        def sync_extract():
-            return self._extract_text_sync(file_path)
+        loop = asyncio.get_running_loop()
+        ext = os.path.splitext(file_path)[1].lower()
+        
+        if ext in _PROCESS_POOL_EXTENSIONS and not self._process_pool_broken:
+            try:
+                return await loop.run_in_executor(
+                    self._get_process_pool(), _extract_in_worker, file_path
+                )
+            except BrokenProcessPool as e:
+                # Worker died or processes cannot be spawned here; stay on threads
+                logger.warning(f"Extraction process pool unavailable, using threads: {e}")
+                self._process_pool_broken = True
+                self.shutdown()
         
         # Run in thread pool for CPU-intensive operations
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, sync_extract)
+        return await loop.run_in_executor(None, self._extract_text_sync, file_path)
+    
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            workers = min(_MAX_PROCESS_WORKERS, os.cpu_count() or 1)
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=_worker_mp_context()
+            )
+        return self._process_pool
+    
+    def shutdown(self) -> None:
+        """Stop the extraction worker processes, if any were started."""
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
     
     def _extract_text_sync(self, file_path: str) -> str:
         """Synchronous text extraction with better error handling"""
-        path_obj = Path(file_path)
-        ext = path_obj.suffix.lower()
+        ext = os.path.splitext(file_path)[1].lower()
         
         try:
-            if ext == ".pdf":
-                return self._extract_pdf(file_path)
-            elif ext == ".docx":
-                return self._extract_docx(file_path)
-            elif ext == ".txt":
-                return self._extract_txt(file_path)
-            elif ext == ".pptx":
-                return self._extract_pptx(file_path)
-            elif ext in {".jpg", ".jpeg", ".png", ".tiff", ".tif", ".bmp"}:
-                return self._extract_image(file_path)
-            else:
+            method_name = self._DISPATCH.get(ext)
+            if method_name is None:
                 raise ValueError(f"Unsupported file type: {ext}")
+            return getattr(self, method_name)(file_path)
         except Exception as e:
             logger.error(f"Text extraction failed for {file_path}: {e}")
             raise
@@ -177,154 +283,177 @@ class TextExtractor:
         try:
             import fitz
             doc = fitz.open(file_path)
+            # Layout parsing only reads text lines; without PRESERVE_IMAGES MuPDF
+            # skips decoding embedded images, which dominates on scanned pages.
+            text_flags = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
             text_parts = []
-            for page_idx, page in enumerate(doc, start=1):
-                # Industry-standard layout reconstruction:
-                # - Use "dict" (lines/spans with bounding boxes), not "blocks".
-                #   Blocks are often merged across columns/boxes, which is exactly
-                #   what caused DELIVER TO + REFERENCES to flatten together.
-                page_rect = page.rect
-                page_w = float(page_rect.width) if page_rect else 0.0
-                page_h = float(page_rect.height) if page_rect else 0.0
-                x_mid = page_w / 2.0 if page_w else 0.0
-
-                extracted = page.get_text("dict") or {}
-                blocks = extracted.get("blocks") or []
-
-                full_lines = []
-                left_lines = []
-                right_lines = []
-
-                def _is_full_width(x0f: float, x1f: float) -> bool:
-                    if not page_w:
-                        return False
-                    width = max(0.0, x1f - x0f)
-                    return bool(
-                        width >= 0.55 * page_w
-                        or (x0f <= 0.15 * page_w and x1f >= 0.85 * page_w)
-                    )
-
-                for b in blocks:
-                    if not isinstance(b, dict):
-                        continue
-                    lines = b.get("lines") or []
-                    for ln in lines:
-                        if not isinstance(ln, dict):
-                            continue
-                        bbox = ln.get("bbox") or None
-                        spans = ln.get("spans") or []
-                        if not bbox or len(bbox) != 4 or not spans:
-                            continue
-                        x0, y0, x1, y1 = bbox
-                        try:
-                            x0f, y0f, x1f, y1f = float(x0), float(y0), float(x1), float(y1)
-                        except (TypeError, ValueError):
-                            continue
-
-                        # Reconstruct line text by x-order spans.
-                        span_texts = []
-                        span_items = []
-                        for sp in spans:
-                            if not isinstance(sp, dict):
-                                continue
-                            t = sp.get("text") or ""
-                            sb = sp.get("bbox") or None
-                            if not t or not isinstance(t, str):
-                                continue
-                            if sb and len(sb) == 4:
-                                try:
-                                    sx0 = float(sb[0])
-                                except (TypeError, ValueError):
-                                    sx0 = x0f
-                            else:
-                                sx0 = x0f
-                            span_items.append((sx0, t))
-                        if not span_items:
-                            continue
-                        span_items.sort(key=lambda t: t[0])
-                        line_text = "".join(t[1] for t in span_items).strip()
-                        if not line_text:
-                            continue
-
-                        entry = (y0f, x0f, line_text)
-                        if _is_full_width(x0f, x1f):
-                            full_lines.append(entry)
-                            continue
-                        cx = (x0f + x1f) / 2.0
-                        if x_mid and cx < x_mid:
-                            left_lines.append(entry)
-                        else:
-                            right_lines.append(entry)
-
-                # If dict extraction produced nothing (rare), fall back to plain text.
-                if not (full_lines or left_lines or right_lines):
-                    t = page.get_text() or ""
-                    if t.strip():
-                        text_parts.append(f"[Page {page_idx}]\n{t.strip()}")
-                    continue
-
-                full_lines.sort(key=lambda t: (t[0], t[1]))
-                left_lines.sort(key=lambda t: (t[0], t[1]))
-                right_lines.sort(key=lambda t: (t[0], t[1]))
-
-                # Keep region labels, but preserve vertical reading intent:
-                # - "full" headers at the top should appear first
-                # - then left/right panels
-                # - then remaining full-width body text (e.g. long cargo description)
-                full_top = []
-                full_rest = []
-                # Heuristic: treat "top of page" full-width lines as headers/titles.
-                # This is more stable than comparing against panel y because PDF
-                # extraction sometimes reports body blocks with unexpectedly small y.
-                if not page_h:
-                    full_top = full_lines
-                else:
-                    top_cut = 0.32 * page_h
-                    for ln in full_lines:
-                        (full_top if ln[0] <= top_cut else full_rest).append(ln)
-
-                page_lines = [f"[Page {page_idx}]"]
-                if full_top:
-                    page_lines.append("[Region: full]")
-                    page_lines.append("\n".join(t[2] for t in full_top))
-                if left_lines:
-                    page_lines.append("[Region: left]")
-                    page_lines.append("\n".join(t[2] for t in left_lines))
-                if right_lines:
-                    page_lines.append("[Region: right]")
-                    page_lines.append("\n".join(t[2] for t in right_lines))
-                if full_rest:
-                    page_lines.append("[Region: full]")
-                    page_lines.append("\n".join(t[2] for t in full_rest))
-                page_text = "\n".join(page_lines).strip()
-                if page_text:
-                    text_parts.append(page_text)
-            doc.close()
-            text = "\n\n".join(text_parts)
-            
-            # Check if PDF has extractable text
-            if text.strip():
-                # PDF has text, return it
-                return text
-            else:
-                # PDF appears to be scanned (no text), try OCR
-                if self.ocr_service and self.ocr_service.is_available():
+            ocr_available = bool(self.ocr_service and self.ocr_service.is_available())
+            try:
+                for page_idx, page in enumerate(doc, start=1):
+                    if ocr_available and not text_parts and page_idx > _SCANNED_PDF_PROBE_PAGES:
+                        # Leading pages are all blank: treat as scanned and skip
+                        # layout-parsing the rest, since OCR re-reads every page anyway.
+                        break
+                    page_text = self._extract_pdf_page(page, page_idx, text_flags)
+                    if page_text:
+                        text_parts.append(page_text)
+                
+                # Pages are only kept when non-blank, so an empty list means no extractable text
+                if not text_parts and ocr_available:
+                    # PDF appears to be scanned (no text), try OCR on the already-open document
                     logger.info(f"PDF {file_path} has no extractable text, attempting OCR...")
                     try:
                         # Use sync method directly (OCR service has sync methods for internal use)
-                        ocr_text = self.ocr_service._extract_text_from_scanned_pdf_sync(file_path)
+                        ocr_text = self.ocr_service._extract_text_from_scanned_pdf_sync(file_path, doc=doc)
                         return ocr_text if ocr_text else ""
                     except Exception as ocr_error:
                         logger.warning(f"OCR failed for PDF {file_path}: {ocr_error}")
                         return ""
-                else:
-                    logger.warning(f"PDF {file_path} has no extractable text and OCR is not available")
-                    return ""
+            finally:
+                # Release the MuPDF handle even if a page fails to parse
+                doc.close()
+            
+            if text_parts:
+                return "\n\n".join(text_parts)
+            logger.warning(f"PDF {file_path} has no extractable text and OCR is not available")
+            return ""
                     
         except Exception as e:
             logger.error(f"PDF extraction failed for {file_path}: {e}")
             raise
     
+    @staticmethod
+    def _extract_pdf_page(page, page_idx: int, text_flags: Optional[int] = None) -> str:
+        """
+        Extract one PDF page with layout-aware region labels.
+        
+        Args:
+            page: PyMuPDF page
+            page_idx: 1-based page number used in the page label
+            text_flags: Optional TEXT_* flags for ``get_text("dict")``
+        
+        Returns an empty string when the page has no extractable text.
+        """
+        # Industry-standard layout reconstruction:
+        # - Use "dict" (lines/spans with bounding boxes), not "blocks".
+        #   Blocks are often merged across columns/boxes, which is exactly
+        #   what caused DELIVER TO + REFERENCES to flatten together.
+        page_rect = page.rect
+        page_w = float(page_rect.width) if page_rect else 0.0
+        page_h = float(page_rect.height) if page_rect else 0.0
+        x_mid = page_w / 2.0 if page_w else 0.0
+
+        if text_flags is None:
+            extracted = page.get_text("dict") or {}
+        else:
+            extracted = page.get_text("dict", flags=text_flags) or {}
+        blocks = extracted.get("blocks") or []
+
+        full_lines = []
+        left_lines = []
+        right_lines = []
+
+        def _is_full_width(x0f: float, x1f: float) -> bool:
+            if not page_w:
+                return False
+            width = max(0.0, x1f - x0f)
+            return bool(
+                width >= 0.55 * page_w
+                or (x0f <= 0.15 * page_w and x1f >= 0.85 * page_w)
+            )
+
+        for b in blocks:
+            if not isinstance(b, dict):
+                continue
+            lines = b.get("lines") or []
+            for ln in lines:
+                if not isinstance(ln, dict):
+                    continue
+                bbox = ln.get("bbox") or None
+                spans = ln.get("spans") or []
+                if not bbox or len(bbox) != 4 or not spans:
+                    continue
+                x0, y0, x1, y1 = bbox
+                try:
+                    x0f, y0f, x1f, y1f = float(x0), float(y0), float(x1), float(y1)
+                except (TypeError, ValueError):
+                    continue
+
+                # Reconstruct line text by x-order spans.
+                span_texts = []
+                span_items = []
+                for sp in spans:
+                    if not isinstance(sp, dict):
+                        continue
+                    t = sp.get("text") or ""
+                    sb = sp.get("bbox") or None
+                    if not t or not isinstance(t, str):
+                        continue
+                    if sb and len(sb) == 4:
+                        try:
+                            sx0 = float(sb[0])
+                        except (TypeError, ValueError):
+                            sx0 = x0f
+                    else:
+                        sx0 = x0f
+                    span_items.append((sx0, t))
+                if not span_items:
+                    continue
+                span_items.sort(key=lambda t: t[0])
+                line_text = "".join(t[1] for t in span_items).strip()
+                if not line_text:
+                    continue
+
+                entry = (y0f, x0f, line_text)
+                if _is_full_width(x0f, x1f):
+                    full_lines.append(entry)
+                    continue
+                cx = (x0f + x1f) / 2.0
+                if x_mid and cx < x_mid:
+                    left_lines.append(entry)
+                else:
+                    right_lines.append(entry)
+
+        # If dict extraction produced nothing (rare), fall back to plain text.
+        if not (full_lines or left_lines or right_lines):
+            t = page.get_text() or ""
+            return f"[Page {page_idx}]\n{t.strip()}" if t.strip() else ""
+
+        full_lines.sort(key=lambda t: (t[0], t[1]))
+        left_lines.sort(key=lambda t: (t[0], t[1]))
+        right_lines.sort(key=lambda t: (t[0], t[1]))
+
+        # Keep region labels, but preserve vertical reading intent:
+        # - "full" headers at the top should appear first
+        # - then left/right panels
+        # - then remaining full-width body text (e.g. long cargo description)
+        full_top = []
+        full_rest = []
+        # Heuristic: treat "top of page" full-width lines as headers/titles.
+        # This is more stable than comparing against panel y because PDF
+        # extraction sometimes reports body blocks with unexpectedly small y.
+        if not page_h:
+            full_top = full_lines
+        else:
+            top_cut = 0.32 * page_h
+            for ln in full_lines:
+                (full_top if ln[0] <= top_cut else full_rest).append(ln)
+
+        page_lines = [f"[Page {page_idx}]"]
+        if full_top:
+            page_lines.append("[Region: full]")
+            page_lines.append("\n".join(t[2] for t in full_top))
+        if left_lines:
+            page_lines.append("[Region: left]")
+            page_lines.append("\n".join(t[2] for t in left_lines))
+        if right_lines:
+            page_lines.append("[Region: right]")
+            page_lines.append("\n".join(t[2] for t in right_lines))
+        if full_rest:
+            page_lines.append("[Region: full]")
+            page_lines.append("\n".join(t[2] for t in full_rest))
+        return "\n".join(page_lines).strip()
+
     def _extract_docx(self, file_path: str) -> str:
         """Extract text from DOCX"""
         try:
@@ -355,6 +484,11 @@ class TextExtractor:
         Returns:
             Structured text representation of PowerPoint content
         """
+        # Fast path: read the slide XML directly; python-pptx only when that fails
+        xml_text = self._extract_pptx_xml(file_path)
+        if xml_text is not None:
+            return xml_text
+        
         try:
             from pptx import Presentation
             
@@ -365,163 +499,44 @@ class TextExtractor:
                 logger.error(f"Failed to open PowerPoint file {file_path}: {e}")
                 raise
             
-            text_parts = []
-            
-            # Safely get slides count
+            # Safely get slides count; len() only counts sldId entries, and
+            # islice builds Slide objects for just the slides we will read.
             try:
-                slides_list = list(prs.slides) if hasattr(prs, 'slides') else []
-                slide_count = min(len(slides_list), self.max_slides_per_presentation)
+                total_slides = len(prs.slides) if hasattr(prs, 'slides') else 0
+                slide_count = min(total_slides, self.max_slides_per_presentation)
                 
-                logger.info(f"PowerPoint file {file_path}: Found {len(slides_list)} slides, processing {slide_count}")
+                logger.info(f"PowerPoint file {file_path}: Found {total_slides} slides, processing {slide_count}")
                 
-                if len(slides_list) > self.max_slides_per_presentation:
+                if total_slides > self.max_slides_per_presentation:
                     logger.warning(
-                        f"PowerPoint file {file_path} has {len(slides_list)} slides, "
+                        f"PowerPoint file {file_path} has {total_slides} slides, "
                         f"processing only first {self.max_slides_per_presentation}"
                     )
+                slides = list(itertools.islice(prs.slides, slide_count)) if slide_count else []
             except Exception as e:
                 logger.error(f"Failed to access slides in {file_path}: {e}")
                 return ""
             
-            for slide_idx, slide in enumerate(slides_list[:slide_count], start=1):
-                try:
-                    slide_text_parts = [f"Slide {slide_idx}:"]
-                    
-                    # Extract text from all shapes
-                    # Use minimal approach to avoid 'rId' errors with problematic PowerPoint files
-                    try:
-                        # Try to get shapes - this might fail with rId error
-                        try:
-                            shapes_iter = iter(slide.shapes) if hasattr(slide, 'shapes') else iter([])
-                            shapes = list(shapes_iter)
-                        except AttributeError as e:
-                            if "'list' object has no attribute 'rId'" in str(e) or "rId" in str(e):
-                                logger.warning(f"PowerPoint file has rId error on slide {slide_idx}, skipping shape iteration")
-                                shapes = []
-                            else:
-                                raise
-                        
-                        for shape in shapes:
-                            try:
-                                # Try text_frame first (most reliable)
-                                text_extracted = False
-                                if hasattr(shape, "has_text_frame"):
-                                    try:
-                                        if shape.has_text_frame:
-                                            text_frame = shape.text_frame
-                                            if text_frame:
-                                                # Extract text from paragraphs and runs (more comprehensive)
-                                                para_texts = []
-                                                try:
-                                                    # Method 1: Extract from paragraphs (standard approach)
-                                                    for paragraph in text_frame.paragraphs:
-                                                        para_text = paragraph.text
-                                                        if para_text and para_text.strip():
-                                                            para_texts.append(para_text.strip())
-                                                    
-                                                    # Method 2: Also extract from runs (handles formatted text better)
-                                                    # This is important for Canva files which may have complex formatting
-                                                    if not para_texts:
-                                                        for paragraph in text_frame.paragraphs:
-                                                            run_texts = []
-                                                            for run in paragraph.runs:
-                                                                if run.text and run.text.strip():
-                                                                    run_texts.append(run.text.strip())
-                                                            if run_texts:
-                                                                para_texts.append(" ".join(run_texts))
-                                                except Exception as para_e:
-                                                    # If paragraph iteration fails, try direct text_frame.text
-                                                    try:
-                                                        direct_text = text_frame.text
-                                                        if direct_text and direct_text.strip():
-                                                            para_texts.append(direct_text.strip())
-                                                    except Exception:
-                                                        logger.debug(f"Error extracting from text_frame on slide {slide_idx}: {para_e}")
-                                                
-                                                if para_texts:
-                                                    slide_text_parts.append("\n".join(para_texts))
-                                                    text_extracted = True
-                                    except (AttributeError, TypeError) as e:
-                                        if "rId" in str(e):
-                                            logger.debug(f"Skipping shape with rId error on slide {slide_idx}")
-                                            continue
-                                        logger.debug(f"Error reading text_frame: {e}")
-                                
-                                # Fallback: try direct text access (less reliable but sometimes works)
-                                if not text_extracted and hasattr(shape, "text"):
-                                    try:
-                                        text_content = shape.text
-                                        if text_content and text_content.strip():
-                                            slide_text_parts.append(text_content.strip())
-                                            text_extracted = True
-                                    except (AttributeError, TypeError) as e:
-                                        if "rId" in str(e):
-                                            logger.debug(f"Skipping shape with rId error on slide {slide_idx}")
-                                            continue
-                                        logger.debug(f"Error reading text: {e}")
-                                
-                                # Handle grouped shapes (Canva often uses grouped shapes)
-                                if not text_extracted and hasattr(shape, "shapes"):
-                                    try:
-                                        # This is a group shape - recursively extract from nested shapes
-                                        group_texts = []
-                                        for sub_shape in shape.shapes:
-                                            if hasattr(sub_shape, "has_text_frame") and sub_shape.has_text_frame:
-                                                try:
-                                                    sub_text = sub_shape.text_frame.text
-                                                    if sub_text and sub_text.strip():
-                                                        group_texts.append(sub_text.strip())
-                                                except Exception:
-                                                    pass
-                                        if group_texts:
-                                            slide_text_parts.append("\n".join(group_texts))
-                                            text_extracted = True
-                                    except Exception as e:
-                                        logger.debug(f"Error processing group shape on slide {slide_idx}: {e}")
-                                
-                                # Extract text from tables (if no rId error occurred)
-                                if hasattr(shape, "has_table"):
-                                    try:
-                                        if shape.has_table and hasattr(shape, "table"):
-                                            table = shape.table
-                                            table_text = self._extract_table_from_slide(table)
-                                            if table_text:
-                                                slide_text_parts.append(f"Table:\n{table_text}")
-                                    except (AttributeError, TypeError) as e:
-                                        if "rId" in str(e):
-                                            logger.debug(f"Skipping table with rId error on slide {slide_idx}")
-                                            continue
-                                        logger.debug(f"Error extracting table: {e}")
-                            except (AttributeError, TypeError) as e:
-                                if "rId" in str(e):
-                                    logger.debug(f"Skipping shape with rId error on slide {slide_idx}")
-                                    continue
-                                logger.debug(f"Error processing shape on slide {slide_idx}: {e}")
-                                continue
-                    except (AttributeError, TypeError) as e:
-                        if "rId" in str(e):
-                            logger.warning(f"PowerPoint file has rId error accessing shapes on slide {slide_idx}")
-                        else:
-                            logger.warning(f"Error processing shapes on slide {slide_idx}: {e}")
-                    
-                    # Only add slides with content
-                    if len(slide_text_parts) > 1:  # More than just "Slide X:"
-                        slide_content = "\n".join(slide_text_parts)
-                        text_parts.append(slide_content)
-                        logger.debug(f"Slide {slide_idx}: Extracted {len(slide_content)} characters")
-                    else:
-                        logger.debug(f"Slide {slide_idx}: No extractable content")
-                except Exception as e:
-                    # If entire slide processing fails, log and continue with next slide
-                    logger.warning(f"Failed to process slide {slide_idx} in {file_path}: {e}")
-                    continue
+            # Walking the shape trees is GIL-bound, so threads would not help
+            text_parts = []
+            for slide_num, slide in enumerate(slides, start=1):
+                slide_text = self._extract_slide(slide, slide_num, file_path)
+                if slide_text:
+                    text_parts.append(slide_text)
+            
+            # python-pptx parts and their package reference each other, so the
+            # whole in-memory OPC package survives dropping prs until the cycle
+            # collector runs; collect now rather than at the next gen-2 pass.
+            slides = None
+            prs = None
+            gc.collect()
             
             if not text_parts:
                 logger.warning(f"No extractable content found in {file_path}")
                 return ""
             
             extracted_text = "\n\n".join(text_parts)
-            logger.info(f"PowerPoint extraction complete for {file_path}: {len(slides_list)} slides processed, {len(text_parts)} slides with content, {len(extracted_text)} total characters")
+            logger.info(f"PowerPoint extraction complete for {file_path}: {slide_count} slides processed, {len(text_parts)} slides with content, {len(extracted_text)} total characters")
             return extracted_text
             
         except Exception as e:
@@ -534,6 +549,225 @@ class TextExtractor:
                 logger.error(f"PPTX extraction failed for {file_path}: {e}")
                 raise
     
+    def _extract_pptx_xml(self, file_path: str) -> Optional[str]:
+        """
+        Extract PowerPoint text straight from the slide XML parts of the .pptx zip.
+        
+        Skips building python-pptx's shape/paragraph/run object model, which
+        is pure overhead for text extraction. Output matches the python-pptx
+        path: "Slide N:" headers, one line per non-empty paragraph, and
+        tables rendered as Headers/Row lines.
+        
+        Returns:
+            Extracted text ("" if no slide has content), or None when the file is
+            not a readable OOXML package so the caller falls back to python-pptx
+        """
+        try:
+            from lxml import etree
+        except ImportError:
+            return None
+        
+        parser = etree.XMLParser(resolve_entities=False, no_network=True)
+        try:
+            with zipfile.ZipFile(file_path) as package:
+                slide_parts = self._pptx_slide_part_names(package, parser)
+                slide_count = min(len(slide_parts), self.max_slides_per_presentation)
+                
+                logger.info(f"PowerPoint file {file_path}: Found {len(slide_parts)} slides, processing {slide_count}")
+                if len(slide_parts) > self.max_slides_per_presentation:
+                    logger.warning(
+                        f"PowerPoint file {file_path} has {len(slide_parts)} slides, "
+                        f"processing only first {self.max_slides_per_presentation}"
+                    )
+                
+                text_parts = []
+                for slide_idx, part_name in enumerate(slide_parts[:slide_count], start=1):
+                    root = etree.fromstring(package.read(part_name), parser)
+                    slide_text_parts = [f"Slide {slide_idx}:"]
+                    sp_tree = root.find(f"{_NS_P}cSld/{_NS_P}spTree")
+                    if sp_tree is not None:
+                        self._collect_xml_shape_text(sp_tree, slide_text_parts)
+                    if len(slide_text_parts) > 1:  # More than just "Slide X:"
+                        text_parts.append("\n".join(slide_text_parts))
+        except (zipfile.BadZipFile, KeyError, ValueError, OSError, etree.XMLSyntaxError) as e:
+            logger.debug(f"Direct XML read failed for {file_path}, using python-pptx: {e}")
+            return None
+        
+        if not text_parts:
+            logger.warning(f"No extractable content found in {file_path}")
+            return ""
+        
+        extracted_text = "\n\n".join(text_parts)
+        logger.info(f"PowerPoint extraction complete for {file_path}: {slide_count} slides processed, {len(text_parts)} slides with content, {len(extracted_text)} total characters")
+        return extracted_text
+    
+    @staticmethod
+    def _pptx_slide_part_names(package: zipfile.ZipFile, parser) -> List[str]:
+        """Zip member names of the slides, in presentation order (sldIdLst)."""
+        from lxml import etree
+        
+        rels = etree.fromstring(package.read("ppt/_rels/presentation.xml.rels"), parser)
+        targets = {
+            rel.get("Id"): rel.get("Target")
+            for rel in rels.iter(f"{_NS_PKG_REL}Relationship")
+        }
+        presentation = etree.fromstring(package.read("ppt/presentation.xml"), parser)
+        part_names = []
+        for sld_id in presentation.iter(f"{_NS_P}sldId"):
+            target = targets[sld_id.get(f"{_NS_R}id")]
+            if target.startswith("/"):
+                part_names.append(target.lstrip("/"))
+            else:
+                part_names.append(posixpath.normpath(posixpath.join("ppt", target)))
+        return part_names
+    
+    @classmethod
+    def _collect_xml_shape_text(cls, sp_tree, slide_text_parts: List[str]) -> None:
+        """Append text of every shape under *sp_tree* in document order, descending into groups."""
+        stack = list(sp_tree)[::-1]
+        while stack:
+            element = stack.pop()
+            tag = element.tag
+            if tag == f"{_NS_P}grpSp":
+                stack.extend(list(element)[::-1])
+            elif tag == f"{_NS_P}sp":
+                tx_body = element.find(f"{_NS_P}txBody")
+                if tx_body is not None:
+                    text = "\n".join(
+                        t for t in (cls._xml_paragraph_text(p).strip() for p in tx_body.iterchildren(f"{_NS_A}p")) if t
+                    )
+                    if text:
+                        slide_text_parts.append(text)
+            elif tag == f"{_NS_P}graphicFrame":
+                table = element.find(f".//{_NS_A}tbl")
+                if table is not None:
+                    table_text = cls._format_xml_table(table)
+                    if table_text:
+                        slide_text_parts.append(f"Table:\n{table_text}")
+    
+    @staticmethod
+    def _xml_paragraph_text(paragraph) -> str:
+        """Paragraph text the way python-pptx builds it: runs and fields, line breaks as \\v."""
+        pieces = []
+        for child in paragraph:
+            tag = child.tag
+            if tag == f"{_NS_A}r" or tag == f"{_NS_A}fld":
+                t = child.find(f"{_NS_A}t")
+                if t is not None and t.text:
+                    pieces.append(t.text)
+            elif tag == f"{_NS_A}br":
+                pieces.append("\v")
+        return "".join(pieces)
+    
+    @classmethod
+    def _format_xml_table(cls, table) -> str:
+        """Render an a:tbl element like _extract_table_from_slide does."""
+        lines = []
+        for row_idx, row in enumerate(table.iterchildren(f"{_NS_A}tr")):
+            cells = []
+            for cell in row.iterchildren(f"{_NS_A}tc"):
+                tx_body = cell.find(f"{_NS_A}txBody")
+                if tx_body is None:
+                    cells.append("")
+                    continue
+                cells.append("\n".join(
+                    cls._xml_paragraph_text(p) for p in tx_body.iterchildren(f"{_NS_A}p")
+                ).strip())
+            if row_idx == 0:
+                if cells:
+                    lines.append(f"Headers: {' | '.join(cells)}")
+            elif any(cells):
+                lines.append(f"Row {row_idx}: {' | '.join(cells)}")
+        return "\n".join(lines)
+    
+    def _extract_slide(self, slide, slide_idx: int, file_path: str) -> str:
+        """
+        Extract text from a single slide.
+        
+        Shapes are walked with an explicit stack in document order, descending
+        into group shapes (Canva often nests them) at any depth.
+        
+        Returns an empty string when the slide has no extractable content.
+        """
+        try:
+            slide_text_parts = [f"Slide {slide_idx}:"]
+            
+            # Shape enumeration can fail with rId errors on problematic PowerPoint files
+            try:
+                stack = list(getattr(slide, "shapes", ()))[::-1]
+            except (AttributeError, TypeError) as e:
+                if "rId" in str(e):
+                    logger.warning(f"PowerPoint file has rId error on slide {slide_idx}, skipping shape iteration")
+                else:
+                    logger.warning(f"Error processing shapes on slide {slide_idx}: {e}")
+                stack = []
+            
+            # Per-shape failures are only logged at DEBUG; decide once per slide
+            # so str(e) and the rId probe are skipped entirely when it is off
+            log_shape_errors = logger.isEnabledFor(logging.DEBUG)
+            
+            while stack:
+                shape = stack.pop()
+                try:
+                    sub_shapes = getattr(shape, "shapes", None)
+                    if sub_shapes is not None:
+                        # Group shape: visit children next, keeping their order
+                        stack.extend(list(sub_shapes)[::-1])
+                        continue
+                    
+                    if getattr(shape, "has_text_frame", False):
+                        text = self._extract_text_frame(shape.text_frame)
+                        if text:
+                            slide_text_parts.append(text)
+                    
+                    if getattr(shape, "has_table", False):
+                        table_text = self._extract_table_from_slide(shape.table)
+                        if table_text:
+                            slide_text_parts.append(f"Table:\n{table_text}")
+                except Exception as e:
+                    if not log_shape_errors:
+                        continue
+                    if "rId" in str(e):
+                        logger.debug(f"Skipping shape with rId error on slide {slide_idx}")
+                    else:
+                        logger.debug(f"Error processing shape on slide {slide_idx}: {e}")
+            
+            # Only return slides with content
+            if len(slide_text_parts) > 1:  # More than just "Slide X:"
+                slide_content = "\n".join(slide_text_parts)
+                logger.debug(f"Slide {slide_idx}: Extracted {len(slide_content)} characters")
+                return slide_content
+            logger.debug(f"Slide {slide_idx}: No extractable content")
+            return ""
+        except Exception as e:
+            # If entire slide processing fails, log and continue with next slide
+            logger.warning(f"Failed to process slide {slide_idx} in {file_path}: {e}")
+            return ""
+    
+    @staticmethod
+    def _extract_text_frame(text_frame) -> str:
+        """Text of a shape's text frame, one stripped line per non-empty paragraph."""
+        try:
+            para_texts = []
+            for paragraph in text_frame.paragraphs:
+                para_text = paragraph.text
+                if para_text and para_text.strip():
+                    para_texts.append(para_text.strip())
+            
+            # Runs handle formatted text better; important for Canva files with complex formatting
+            if not para_texts:
+                for paragraph in text_frame.paragraphs:
+                    run_texts = [run.text.strip() for run in paragraph.runs if run.text and run.text.strip()]
+                    if run_texts:
+                        para_texts.append(" ".join(run_texts))
+            return "\n".join(para_texts)
+        except Exception:
+            # If paragraph iteration fails, fall back to the frame's flattened text
+            try:
+                return (text_frame.text or "").strip()
+            except Exception:
+                return ""
+    
     def _extract_table_from_slide(self, table) -> str:
         """
         Extract text from a PowerPoint table.
@@ -547,55 +781,52 @@ class TextExtractor:
         try:
             lines = []
             
-            # Safely access table rows
-            if not hasattr(table, 'rows'):
-                return ""
-            
-            # Convert rows to list to avoid slice/int comparison errors
+            # Stream rows: take the header with next() and keep iterating for data rows
             try:
-                rows_list = list(table.rows) if table.rows else []
+                rows_iter = iter(getattr(table, 'rows', None) or ())
+                header_row = next(rows_iter)
+            except StopIteration:
+                return ""
             except (TypeError, AttributeError) as e:
                 logger.debug(f"Error accessing table rows: {e}")
                 return ""
             
-            if not rows_list:
+            # Every row of a table is the same _Row type, so probe for .cells once
+            if not hasattr(header_row, 'cells'):
                 return ""
             
             # Extract headers (first row)
             try:
-                header_row = rows_list[0]
                 headers = []
-                if hasattr(header_row, 'cells'):
-                    for cell in header_row.cells:
-                        try:
-                            cell_text = cell.text.strip() if cell.text else ""
-                            headers.append(cell_text)
-                        except Exception as e:
-                            logger.debug(f"Error reading header cell: {e}")
-                            headers.append("")
+                for cell in header_row.cells:
+                    try:
+                        cell_text = cell.text.strip() if cell.text else ""
+                        headers.append(cell_text)
+                    except Exception as e:
+                        logger.debug(f"Error reading header cell: {e}")
+                        headers.append("")
                 
                 if headers:
                     lines.append(f"Headers: {' | '.join(headers)}")
-            except (IndexError, AttributeError) as e:
+            except AttributeError as e:
                 logger.debug(f"Error extracting table headers: {e}")
             
-            # Extract data rows (skip first row as it's the header)
+            # Extract data rows (the header row has already been consumed)
             try:
-                for row_idx, row in enumerate(rows_list[1:], start=1):
+                for row_idx, row in enumerate(rows_iter, start=1):
                     try:
                         row_values = []
                         has_content = False
                         
-                        if hasattr(row, 'cells'):
-                            for cell in row.cells:
-                                try:
-                                    cell_text = cell.text.strip() if cell.text else ""
-                                    row_values.append(cell_text)
-                                    if cell_text:
-                                        has_content = True
-                                except Exception as e:
-                                    logger.debug(f"Error reading cell: {e}")
-                                    row_values.append("")
+                        for cell in row.cells:
+                            try:
+                                cell_text = cell.text.strip() if cell.text else ""
+                                row_values.append(cell_text)
+                                if cell_text:
+                                    has_content = True
+                            except Exception as e:
+                                logger.debug(f"Error reading cell: {e}")
+                                row_values.append("")
                         
                         if has_content:
                             lines.append(f"Row {row_idx}: {' | '.join(row_values)}")
@@ -614,21 +845,36 @@ class TextExtractor:
     def _extract_txt(self, file_path: str) -> str:
         """Extract text from TXT with encoding detection"""
         try:
-            encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-            for encoding in encodings:
-                try:
-                    with open(file_path, "r", encoding=encoding) as f:
-                        return f.read()
-                except UnicodeDecodeError:
-                    continue
-            
-            # Fallback with error handling
-            with open(file_path, "r", encoding='utf-8', errors='ignore') as f:
-                return f.read()
+            # Read the file once; every encoding attempt below decodes in memory.
+            # Large files are decoded straight from an mmap of the page cache,
+            # skipping the intermediate full-size bytes object.
+            # Decoding bytes skips universal newlines; the chunker looks for
+            # "\n\n" and ".\n" boundaries, so CRLF files need LF on both paths
+            with open(file_path, "rb") as f:
+                if os.fstat(f.fileno()).st_size > _MMAP_TEXT_THRESHOLD:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        return _normalize_newlines(self._decode_text(mm))
+                return _normalize_newlines(self._decode_text(f.read()))
         except Exception as e:
             logger.error(f"TXT extraction failed for {file_path}: {e}")
             raise
     
+    @staticmethod
+    def _decode_text(data) -> str:
+        """Decode a bytes-like object, honouring BOMs and then trying fallback encodings."""
+        for bom, encoding in _TEXT_BOMS:
+            if data[:len(bom)] == bom:
+                return str(data, encoding, errors="replace")
+        
+        for encoding in ('utf-8', 'latin-1', 'cp1252', 'iso-8859-1'):
+            try:
+                return str(data, encoding)
+            except UnicodeDecodeError:
+                continue
+        
+        # Fallback with error handling
+        return str(data, "utf-8", errors="ignore")
+    
     def _extract_image(self, file_path: str) -> str:
         """
         Extract text from image file using OCR.
@@ -660,4 +906,4 @@ class TextExtractor:
     
     def is_supported_file(self, file_path: str) -> bool:
         """Check if file type is supported"""
-        return Path(file_path).suffix.lower() in self.supported_extensions
+        return os.path.splitext(file_path)[1].lower() in self.supported_extensions
@@ -23,6 +23,7 @@ from .models import ProcessingResult
 from .extraction.text_extractor import TextExtractor, build_layout_aware_preview
 from .extraction.chunker import DocumentChunker
 from .extraction.embedding_service import EmbeddingService
+from .extraction.embedding_batcher import EmbeddingBatcher
 from .extraction.file_validator import FileValidator
 from .extraction.spreadsheet_extractor import SpreadsheetExtractor, is_spreadsheet
 from .extraction.text_extractor import extract_doc_title
@@ -38,6 +39,60 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_METADATA_CACHE_MAX_SIZE = 2000
 
+# Scanned files are handed to FilenameTrie.add_many in batches of this size,
+# so names become searchable while a large directory is still being scanned
+TRIE_ADD_BATCH_SIZE = 1000
+# Metadata-only rows written per transaction during the directory scan
+METADATA_WRITE_BATCH_SIZE = 500
+# Chunks embedded per model call in add_document; each sub-batch is upserted
+# while the next one is being embedded
+EMBED_INSERT_BATCH_SIZE = 64
+# Files in flight during background content indexing. Extraction is mostly I/O
+# and parser work in threads; chunking/embedding is serialized by _model_lock.
+CONTENT_INDEX_CONCURRENCY = min(32, (os.cpu_count() or 1) * 4)
+
+
+def _mtime_rank(modified: Any) -> float:
+    """Filename-trie rank for a file: its mtime as a UTC timestamp (newest first)."""
+    if modified is None:
+        return 0.0
+    if isinstance(modified, datetime):
+        if modified.tzinfo is None:
+            # DB stores UTC without tzinfo (see database.service._naive)
+            modified = modified.replace(tzinfo=timezone.utc)
+        return modified.timestamp()
+    return float(modified)
+
+
+def _existing_state_entries(
+    docs: List[Any], cache_slots: int
+) -> Tuple[List[Tuple[str, str, float]], List[Tuple[str, str, Dict[str, Any]]]]:
+    """
+    Turn index-state rows into filename-trie entries and metadata-cache entries.
+
+    Pure computation with no shared state, so it can run in a worker thread.
+    Only the first cache_slots rows get cache entries.
+    """
+    trie_entries = [
+        (os.path.basename(doc.file_path), doc.file_path, _mtime_rank(doc.last_modified))
+        for doc in docs
+    ]
+    cache_entries = [
+        (
+            doc.file_path,
+            doc.file_hash or "",
+            {
+                "file_type": doc.file_type,
+                "size_bytes": doc.file_size,
+                "modified_at": doc.last_modified,
+                "chunks": doc.chunks_count,
+                "processing_status": doc.processing_status,
+            },
+        )
+        for doc in docs[:cache_slots]
+    ]
+    return trie_entries, cache_entries
+
 
 class MetadataCache:
     """
@@ -100,6 +155,7 @@ class IndexingService:
         update_queue: UpdateQueue,
         update_worker: Optional[UpdateWorker] = None,
         spreadsheet_extractor: Optional[SpreadsheetExtractor] = None,
+        trie_persist_path: Optional[str] = None,
     ) -> None:
         self.text_extractor = text_extractor
         self.file_validator = file_validator
@@ -113,7 +169,18 @@ class IndexingService:
         self.update_worker = update_worker
 
         # Shared with RetrievalService (passed by reference)
-        self.filename_trie = FilenameTrie()
+        self.filename_trie = FilenameTrie(persist_path=trie_persist_path)
+
+        # Chunking and embedding run in worker threads, one file at a time: they
+        # share the embedding model's tokenizer (see EmbeddingService.tokenizer_lock)
+        # and torch already spreads a single encode over all cores. Gating here
+        # keeps waiting files from tying up executor threads; other files in the
+        # batch keep extracting text and writing to the stores meanwhile.
+        self._model_lock = asyncio.Lock()
+        # Chunks from files in flight are embedded together in one model call
+        self.embedding_batcher = EmbeddingBatcher(
+            self.embedding_service, model_lock=self._model_lock
+        )
 
         # Bounded LRU cache; DB is source of truth
         self._metadata_cache = MetadataCache(max_size=DEFAULT_METADATA_CACHE_MAX_SIZE)
@@ -211,6 +278,8 @@ class IndexingService:
                 directory_path, resume_mode=resume_mode
             )
             metadata_elapsed = asyncio.get_running_loop().time() - metadata_start
+            # Every file on disk is in the trie now; keep the index for the next start
+            self.filename_trie.save()
 
             if not metadata_files:
                 if resume_mode:
@@ -250,13 +319,17 @@ class IndexingService:
         """
         Build metadata index quickly (< 1 second for most directories).
         Stores file metadata in database immediately, allowing filename queries.
-        Returns list of file paths that need content indexing.
+        Returns list of file paths that need content indexing, largest first so
+        big files start early instead of straggling at the end of the run
+        (sizes come from the scan's stat, not a second one).
 
         In resume_mode, files that are already fully indexed and whose mtime has not
         changed are added to the trie but excluded from the returned list.
         """
-        dir_path = Path(directory_path)
         supported_files = []
+        trie_entries: List[Tuple[str, str, float]] = []
+        pending_rows: List[Dict[str, Any]] = []
+        sizes: Dict[str, int] = {}
 
         existing_docs: Dict[str, Any] = {}
         if resume_mode:
@@ -267,22 +340,22 @@ class IndexingService:
                 f"Resume mode: {len(existing_docs)} existing indexed documents found in DB"
             )
 
-        for file_path in dir_path.rglob("*"):
-            if not file_path.is_file():
-                continue
+        # Walked off the event loop; unsupported names are skipped without a stat
+        # and each valid file's stat result is reused below
+        scanned = await asyncio.to_thread(self.file_validator.scan_directory, directory_path)
 
-            is_valid, error = self.file_validator.validate_file(str(file_path))
-            if not is_valid:
-                continue
+        for fp_str, stat_info in scanned:
+            if len(trie_entries) >= TRIE_ADD_BATCH_SIZE:
+                self.filename_trie.add_many(trie_entries)
+                trie_entries.clear()
 
-            fp_str = str(file_path)
-            filename = file_path.name
+            filename = os.path.basename(fp_str)
 
             if resume_mode and fp_str in existing_docs:
                 existing = existing_docs[fp_str]
                 if existing.processing_status == "indexed":
                     try:
-                        disk_mtime = file_path.stat().st_mtime
+                        disk_mtime = stat_info.st_mtime
                         db_mtime = existing.last_modified
                         if db_mtime is not None:
                             if hasattr(db_mtime, "timestamp"):
@@ -290,7 +363,7 @@ class IndexingService:
                             else:
                                 db_ts = float(db_mtime)
                             if abs(disk_mtime - db_ts) < 2.0:
-                                self.filename_trie.add(filename, fp_str)
+                                trie_entries.append((filename, fp_str, _mtime_rank(disk_mtime)))
                                 meta = {
                                     "file_type": existing.file_type or "",
                                     "size_bytes": existing.file_size or 0,
@@ -307,53 +380,87 @@ class IndexingService:
                         pass
 
             try:
-                file_metadata = self.file_validator.extract_file_metadata(fp_str)
-                file_type = file_metadata.get("file_type", "unknown")
-                file_size = file_metadata.get("size_bytes", 0)
-                last_modified = file_metadata.get("modified_at")
-
-                await self.database_service.store_document_metadata(
-                    file_path=fp_str,
-                    file_hash="",
-                    file_type=file_type,
-                    file_size=file_size,
-                    last_modified=last_modified,
-                    content_preview="",
-                    chunks_count=0,
-                    processing_status="metadata_only",
+                # Metadata-only row (file_hash=""), so skip hashing here
+                file_metadata = self.file_validator.extract_file_metadata(
+                    fp_str, stat_info=stat_info, include_hash=False
                 )
-
-                self.filename_trie.add(filename, fp_str)
-                meta = {
-                    "file_type": file_type,
-                    "size_bytes": file_size,
-                    "modified_at": last_modified,
-                    "chunks": 0,
-                    "processing_status": "metadata_only",
-                }
-                if len(self._metadata_cache) < self._metadata_cache.max_size:
-                    self._metadata_cache.set(fp_str, "", meta)
-
-                supported_files.append(fp_str)
-
             except Exception as e:
                 logger.warning(f"Could not index metadata for {fp_str}: {e}")
                 continue
-
+            sizes[fp_str] = stat_info.st_size
+            pending_rows.append({
+                "file_path": fp_str,
+                "file_type": file_metadata.get("file_type", "unknown"),
+                "file_size": file_metadata.get("size_bytes", 0),
+                "last_modified": file_metadata.get("modified_at"),
+            })
+            if len(pending_rows) >= METADATA_WRITE_BATCH_SIZE:
+                await self._store_metadata_rows(pending_rows, trie_entries, supported_files)
+                pending_rows.clear()
+
+        await self._store_metadata_rows(pending_rows, trie_entries, supported_files)
+        self.filename_trie.add_many(trie_entries)
+        supported_files.sort(key=sizes.__getitem__, reverse=True)
         return supported_files
 
+    async def _store_metadata_rows(
+        self,
+        rows: List[Dict[str, Any]],
+        trie_entries: List[Tuple[str, str, float]],
+        supported_files: List[str],
+    ) -> None:
+        """
+        Write metadata-only rows in one transaction, then register the files.
+
+        If the bulk write fails the rows are retried one by one, so a single bad
+        row only drops its own file. Stored files are appended to trie_entries,
+        supported_files and the metadata cache.
+        """
+        if not rows:
+            return
+        try:
+            await self.database_service.store_metadata_only_bulk(rows)
+            stored = rows
+        except Exception as e:
+            logger.warning(f"Bulk metadata write failed, storing files one by one: {e}")
+            stored = []
+            for row in rows:
+                try:
+                    await self.database_service.store_metadata_only(file_hash="", **row)
+                    stored.append(row)
+                except Exception as e:
+                    logger.warning(f"Could not index metadata for {row['file_path']}: {e}")
+
+        for row in stored:
+            fp_str = row["file_path"]
+            last_modified = row["last_modified"]
+            trie_entries.append((os.path.basename(fp_str), fp_str, _mtime_rank(last_modified)))
+            meta = {
+                "file_type": row["file_type"],
+                "size_bytes": row["file_size"],
+                "modified_at": last_modified,
+                "chunks": 0,
+                "processing_status": "metadata_only",
+            }
+            if len(self._metadata_cache) < self._metadata_cache.max_size:
+                self._metadata_cache.set(fp_str, "", meta)
+            supported_files.append(fp_str)
+
     async def _index_content_background(
         self, file_paths: List[str], directory_path: str
     ) -> None:
         """
-        Background content indexing. Processes files in batches without blocking.
-        Updates documents from 'metadata_only' to 'indexed' status.
+        Background content indexing. Keeps CONTENT_INDEX_CONCURRENCY files in flight,
+        in the given order, without blocking. Every BATCH_SIZE files BM25 is persisted
+        and the files indexed since the last checkpoint are moved from 'metadata_only'
+        to 'indexed' in one DB transaction.
         Exits early if _shutdown is set (e.g. user switched to another directory).
         """
         from config import settings
 
         logger.info(f"Background content indexing started for {len(file_paths)} files")
         batch_size = settings.BATCH_SIZE
+        total = len(file_paths)
         processed = 0
         failed = 0
 
@@ -366,34 +473,62 @@ class IndexingService:
                 self.embedding_service._initialize_model()
                 tok = self.embedding_service.get_tokenizer()
                 if tok is not None:
-                    self.chunker.set_tokenizer(tok)
+                    self.chunker.set_tokenizer(tok, lock=self.embedding_service.tokenizer_lock)
             except Exception as _e:
                 logger.warning("Could not pre-wire tokenizer into chunker: %s", _e)
 
-        try:
-            for i in range(0, len(file_paths), batch_size):
+        # Workers pull the next file as soon as they finish one, so a single slow
+        # file (large PDF) no longer holds up a whole fixed batch. file_paths comes
+        # largest first from _build_metadata_index, so the tail is made of quick ones.
+        pending = iter(file_paths)
+        unsaved = 0
+        save_lock = asyncio.Lock()  # one BM25 rebuild/write at a time
+        # 'indexed' rows from add_document, written at each checkpoint after the
+        # BM25 save so a document is never marked indexed before its chunks are saved
+        indexed_rows: List[Dict[str, Any]] = []
+
+        async def worker() -> None:
+            nonlocal processed, failed, unsaved
+            for file_path in pending:
                 if self._shutdown:
-                    logger.info("Background content indexing cancelled (directory was changed)")
                     return
-                batch = file_paths[i:i + batch_size]
-                tasks = [self._process_single_file(file_path) for file_path in batch]
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-                for result in results:
-                    if isinstance(result, Exception):
-                        failed += 1
-                        logger.error(f"Background indexing failed: {result}")
-                    else:
-                        processed += 1
+                result = await self._process_single_file(file_path, indexed_rows)
+                if result.success:
+                    processed += 1
+                else:
+                    failed += 1
                 self._progress["processed"] = processed
                 self._progress["failed"] = failed
-                await asyncio.to_thread(self.bm25_service.save)
-                if (i + batch_size) % 50 == 0 or i + batch_size >= len(file_paths):
+                done = processed + failed
+                unsaved += 1
+                if unsaved >= batch_size or done == total:
+                    unsaved = 0
+                    async with save_lock:
+                        rows = indexed_rows[:]
+                        del indexed_rows[:]
+                        await asyncio.to_thread(self.bm25_service.save)
+                        await self._store_indexed_rows(rows)
+                if done % 50 == 0 or done == total:
                     logger.info(
-                        f"Background indexing progress: {processed + failed}/{len(file_paths)} files "
+                        f"Background indexing progress: {done}/{total} files "
                         f"({processed} indexed, {failed} failed)"
                     )
-                if i + batch_size < len(file_paths):
-                    await asyncio.sleep(0.1)
+
+        concurrency = min(max(CONTENT_INDEX_CONCURRENCY, batch_size), total)
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        try:
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                # As a TaskGroup would: on error or cancellation, stop the other
+                # workers and wait for them, so none is still writing when the
+                # BM25 save below runs
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+            if self._shutdown:
+                logger.info("Background content indexing cancelled (directory was changed)")
+                return
             logger.info(
                 f"Background content indexing complete: {processed} indexed, {failed} failed"
             )
@@ -409,6 +544,9 @@ class IndexingService:
         finally:
             self._indexing_task = None
             self._progress["is_active"] = False
+            if not self._shutdown and indexed_rows:
+                # Left over when the run stopped early; BM25 was saved above
+                await self._store_indexed_rows(indexed_rows)
             if not self._shutdown and file_paths and processed > 0:
                 try:
                     n = await self.database_service.set_documents_indexed(file_paths)
@@ -424,16 +562,39 @@ class IndexingService:
                 except Exception as e:
                     logger.warning(f"Post-index hook failed: {e}")
 
-    async def _process_single_file(self, file_path: str) -> ProcessingResult:
+    async def _store_indexed_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Write rows buffered by add_document(metadata_rows=...) in one transaction.
+
+        If the bulk write fails the rows are retried one by one, so a single bad
+        row only affects its own file.
+        """
+        if not rows:
+            return
+        try:
+            await self.database_service.store_document_metadata_bulk(rows)
+        except Exception as e:
+            logger.warning(f"Bulk metadata write failed, storing documents one by one: {e}")
+            for row in rows:
+                try:
+                    await self.database_service.store_document_metadata(**row)
+                except Exception as e:
+                    logger.warning(f"Could not store metadata for {row['file_path']}: {e}")
+
+    async def _process_single_file(
+        self, file_path: str, metadata_rows: Optional[List[Dict[str, Any]]] = None
+    ) -> ProcessingResult:
         """Process a single file (used in batch processing)."""
         start_time = asyncio.get_running_loop().time()
         try:
-            await self.add_document(file_path, use_queue=False)
+            chunks_created = await self.add_document(
+                file_path, use_queue=False, metadata_rows=metadata_rows
+            )
             processing_time = asyncio.get_running_loop().time() - start_time
             return ProcessingResult(
                 success=True,
                 file_path=file_path,
-                chunks_created=0,
+                chunks_created=chunks_created,
                 processing_time=processing_time,
             )
         except Exception as e:
@@ -456,10 +617,34 @@ class IndexingService:
         file_path: str,
         update_type: str = "modified",
         user_requested: bool = False,
+        stat_info: Optional[os.stat_result] = None,
     ) -> bool:
-        """Enqueue a document update to the priority queue."""
+        """
+        Enqueue a document update to the priority queue.
+
+        stat_info: the caller's os.stat() result for file_path, if it has one,
+        so size and mtime are not read from disk a second time.
+
+        Unless user_requested, an event for a file whose cached hash was taken at
+        its current size and mtime is dropped here instead of being queued for
+        the worker to discard (editors often fire several saves per change).
+        """
         try:
-            file_metadata = self.file_validator.extract_file_metadata(file_path)
+            if stat_info is None:
+                try:
+                    stat_info = os.stat(file_path)
+                except OSError:
+                    pass  # queued as before; the worker reports the failure
+            if not user_requested and stat_info is not None:
+                cached = self._metadata_cache.get(file_path)
+                if cached is not None and cached[0] and self.file_validator.is_unchanged_since(
+                    file_path, cached[1].get("size_bytes"), cached[1].get("modified_at"), stat_info
+                ):
+                    logger.debug(f"File {file_path} unchanged, not enqueueing {update_type}")
+                    return True
+            file_metadata = self.file_validator.extract_file_metadata(
+                file_path, stat_info=stat_info, include_hash=False
+            )
             file_size_bytes = file_metadata.get("size_bytes", 0)
             last_queried = file_metadata.get("modified_at") or datetime.now(timezone.utc)
             success = await self.update_queue.enqueue(
@@ -484,7 +669,8 @@ class IndexingService:
         file_path: str,
         force_reindex: bool = False,
         use_queue: bool = True,
-    ) -> None:
+        metadata_rows: Optional[List[Dict[str, Any]]] = None,
+    ) -> int:
         """
         Add or update a document with incremental indexing.
 
@@ -493,36 +679,65 @@ class IndexingService:
             force_reindex: If True, re-index even if the file hasn't changed.
             use_queue: If True, use update queue (incremental updates).
                        If False, process directly (initial indexing).
+            metadata_rows: If given, the 'indexed' metadata row is appended here
+                       for the caller to write in bulk instead of being stored now.
+
+        Returns:
+            Number of chunks indexed; 0 when the file was skipped or queued.
         """
-        is_valid, reason = self.file_validator.validate_file(file_path)
+        is_valid, reason, stat_info = self.file_validator.validate_file_stat(file_path)
         if not is_valid:
             logger.debug(f"Skipping {file_path}: {reason}")
-            return
+            return 0
 
         if use_queue:
-            current_hash = await asyncio.to_thread(self.file_validator.calculate_file_hash, file_path)
-            stored_hash, _ = await self._get_cached_or_db_hash_metadata(file_path)
-            if not force_reindex and stored_hash and stored_hash == current_hash:
-                logger.debug(f"File {file_path} unchanged, skipping update")
-                return
-            await self.enqueue_update(file_path, update_type="modified")
-            return
+            stored_hash, stored_meta = await self._get_cached_or_db_hash_metadata(file_path)
+            if not force_reindex and stored_hash:
+                # Same size + mtime as when stored_hash was taken: no need to rehash
+                changed = await asyncio.to_thread(
+                    self.file_validator.has_file_changed,
+                    file_path,
+                    stored_hash,
+                    (stored_meta or {}).get("size_bytes"),
+                    (stored_meta or {}).get("modified_at"),
+                    stat_info,
+                )
+                if not changed:
+                    logger.debug(f"File {file_path} unchanged, skipping update")
+                    return 0
+            # Size and mtime for the queue priority come from the same stat()
+            await self.enqueue_update(file_path, update_type="modified", stat_info=stat_info)
+            return 0
 
         if file_path in self.files_being_processed:
             logger.debug(f"File {file_path} is already being processed, skipping duplicate")
-            return
+            return 0
 
+        # Released by the finally below on every exit, early returns included
         self.files_being_processed.add(file_path)
 
         try:
-            file_metadata = self.file_validator.extract_file_metadata(file_path)
+            stored_hash, stored_meta = await self._get_cached_or_db_hash_metadata(file_path)
+            if (
+                not force_reindex
+                and stored_hash
+                and stored_meta
+                and self.file_validator.is_unchanged_since(
+                    file_path, stored_meta.get("size_bytes"), stored_meta.get("modified_at"), stat_info
+                )
+            ):
+                logger.debug(f"File {file_path} unchanged (size and mtime), skipping re-index")
+                return 0
+
+            # Hashed once, off the event loop, rather than also inside extract_file_metadata
+            file_metadata = self.file_validator.extract_file_metadata(
+                file_path, stat_info=stat_info, include_hash=False
+            )
             current_hash = await asyncio.to_thread(self.file_validator.calculate_file_hash, file_path)
 
-            stored_hash, _ = await self._get_cached_or_db_hash_metadata(file_path)
             if not force_reindex and stored_hash and stored_hash == current_hash:
                 logger.debug(f"File {file_path} unchanged, skipping re-index")
-                self.files_being_processed.discard(file_path)
-                return
+                return 0
 
             existing_doc = await self.database_service.get_document_by_path(file_path)
             if (
@@ -533,8 +748,7 @@ class IndexingService:
                 if not force_reindex:
                     logger.debug(f"File {file_path} already fully indexed, skipping")
                 self._metadata_cache.set(file_path, current_hash, file_metadata)
-                self.files_being_processed.discard(file_path)
-                return
+                return 0
 
             if stored_hash and stored_hash != current_hash:
                 logger.info(f"File {file_path} changed, removing old chunks")
@@ -561,8 +775,7 @@ class IndexingService:
                         chunks_count=0,
                         processing_status="error",
                     )
-                    self.files_being_processed.discard(file_path)
-                    return
+                    return 0
                 doc_title = None  # Spreadsheet chunks have metadata headers, not titles
             else:
                 text = await self.text_extractor.extract_text_async(file_path)
@@ -578,17 +791,17 @@ class IndexingService:
                         chunks_count=0,
                         processing_status="error",
                     )
-                    self.files_being_processed.discard(file_path)
-                    return
-                chunks = self.chunker.create_chunks(text, file_path)
+                    return 0
+                async with self._model_lock:
+                    chunks = await asyncio.to_thread(self.chunker.create_chunks, text, file_path)
                 content_preview = build_layout_aware_preview(text, max_chars=1500)
                 # Extract document's self-declared title from the first lines of text.
                 # This populates document_category so the listing context shows
                 # [Type: DELIVERY RECEIPT] / [Type: BRING-IN PERMIT] next to each file,
                 # preventing the LLM from misclassifying documents based on references.
                 doc_title = extract_doc_title(text)
-            embeddings = self.embedding_service.encode_texts([chunk.text for chunk in chunks])
-            await self.vector_store.batch_insert_chunks(chunks, embeddings)
+            await self._embed_and_insert(chunks)
+            file_type = file_metadata["file_type"]
             bm25_documents = [
                 {
                     "id": f"{chunk.file_path}:{chunk.chunk_id}",
@@ -596,7 +809,7 @@ class IndexingService:
                     "metadata": {
                         "file_path": chunk.file_path,
                         "chunk_id": chunk.chunk_id,
-                        "file_type": file_metadata["file_type"],
+                        "file_type": file_type,
                     },
                 }
                 for chunk in chunks
@@ -604,7 +817,7 @@ class IndexingService:
             self.bm25_service.add_documents(bm25_documents)
             logger.debug(f"Added {len(chunks)} chunks to BM25 index for {file_path}")
 
-            await self.database_service.store_document_metadata(
+            row = dict(
                 file_path=file_path,
                 file_hash=current_hash,
                 file_type=file_metadata["file_type"],
@@ -615,8 +828,13 @@ class IndexingService:
                 processing_status="indexed",
                 document_category=doc_title,
             )
+            if metadata_rows is not None:
+                metadata_rows.append(row)
+            else:
+                await self.database_service.store_document_metadata(**row)
 
             self._metadata_cache.set(file_path, current_hash, file_metadata)
+            return len(chunks)
 
         except Exception as e:
             logger.error(f"Error processing document {file_path}: {e}")
@@ -637,6 +855,36 @@ class IndexingService:
         finally:
             self.files_being_processed.discard(file_path)
 
+    async def _embed_and_insert(self, chunks: List[Any]) -> None:
+        """
+        Embed chunks and upsert them into the vector store in sub-batches.
+
+        At most two sub-batches of vectors are held at once. Each sub-batch goes
+        through the shared EmbeddingBatcher, so small files in flight together
+        share one model call and a large file does not hold the model between
+        its sub-batches. Chunk ids are deterministic upserts, so a failure part-way
+        through leaves nothing that a retry would duplicate.
+        """
+        pending_insert: Optional[asyncio.Task] = None
+        try:
+            for start in range(0, len(chunks), EMBED_INSERT_BATCH_SIZE):
+                batch = chunks[start:start + EMBED_INSERT_BATCH_SIZE]
+                embeddings = await self.embedding_batcher.encode(
+                    [chunk.text for chunk in batch]
+                )
+                if pending_insert is not None:
+                    await pending_insert
+                pending_insert = asyncio.create_task(
+                    self.vector_store.batch_insert_chunks(batch, embeddings)
+                )
+            if pending_insert is not None:
+                await pending_insert
+        finally:
+            # On failure, stop (and reap) an upsert still in flight
+            if pending_insert is not None:
+                pending_insert.cancel()
+                await asyncio.gather(pending_insert, return_exceptions=True)
+
     async def remove_document(self, file_path: str) -> None:
         """Remove document from vector store, database, trie, and metadata cache."""
         try:
@@ -670,20 +918,17 @@ class IndexingService:
     async def _load_existing_metadata(self) -> None:
         """Load existing documents: rebuild trie for all, fill LRU cache up to max_size."""
         try:
-            docs = await self.database_service.get_all_indexed_docs()
-
-            for doc in docs:
-                filename = Path(doc.file_path).name
-                self.filename_trie.add(filename, doc.file_path)
-                if len(self._metadata_cache) < self._metadata_cache.max_size:
-                    meta = {
-                        "file_type": doc.file_type,
-                        "size_bytes": doc.file_size,
-                        "modified_at": doc.last_modified,
-                        "chunks": doc.chunks_count,
-                        "processing_status": doc.processing_status,
-                    }
-                    self._metadata_cache.set(doc.file_path, doc.file_hash or "", meta)
+            docs = await self.database_service.get_index_state_rows()
+
+            # Entries are computed off the event loop; the trie and cache are
+            # shared with query handlers, so they are only updated here on it
+            cache = self._metadata_cache
+            trie_entries, cache_entries = await asyncio.to_thread(
+                _existing_state_entries, docs, max(cache.max_size - len(cache), 0)
+            )
+            self.filename_trie.add_many(trie_entries)
+            for file_path, file_hash, meta in cache_entries:
+                cache.set(file_path, file_hash, meta)
 
             indexed_count = sum(1 for d in docs if d.processing_status == "indexed")
             metadata_only_count = sum(1 for d in docs if d.processing_status == "metadata_only")
@@ -12,11 +12,16 @@ context truncation — concerns that exist regardless of HTTP client.
 """
 
 import asyncio
+import importlib.util
+import json
 import logging
 import random
-from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, List, Optional, Tuple
 
 from config import settings
+from .response_cache import SemanticResponseCache
 from .provider_adapters import (
     create_adapter_for_provider,
     LLMProviderAdapter,
@@ -28,6 +33,40 @@ from .provider_adapters import (
 
 logger = logging.getLogger(__name__)
 
+# Shared connection pool for every LiteLLM call. Generation can run for minutes,
+# so only the connect phase gets a short timeout. Sized for bursts such as
+# context compression, which calls the LLM once per retrieved chunk in parallel.
+_HTTP_TIMEOUT_SECONDS = 600.0
+_HTTP_CONNECT_TIMEOUT_SECONDS = 5.0
+_HTTP_MAX_CONNECTIONS = 64
+_HTTP_MAX_KEEPALIVE_CONNECTIONS = 32
+_HTTP_KEEPALIVE_EXPIRY_SECONDS = 60.0
+# Connect-phase retries only (httpx never resends a request that reached the server)
+_HTTP_CONNECT_RETRIES = 1
+
+# Static RAG instructions shared by every _build_messages call
+_RAG_SYSTEM_PROMPT = (
+    "Use the document context below when it is relevant to the user's question. "
+    "Cite sources as [Document: filename].\n\n"
+    "Rules:\n"
+    "- Use the documents when they help answer the question. If asked for an overview, "
+    "summarize what the context says and what the documents are about.\n"
+    "- If the question is general conversation (e.g. greetings), respond normally; "
+    "do not force document citations.\n"
+    "- Combine information from multiple chunks of the same document into one answer. "
+    "When asked for a list, include every matching item from the context.\n"
+    "- Only say 'the context doesn't contain the answer' when the user clearly asked a "
+    "factual question that is not in the context.\n"
+    "- Use specific details and quotes when relevant."
+)
+
+# Prompt-cache breakpoint for providers that need one marked explicitly (Anthropic)
+_CACHE_CONTROL = {"type": "ephemeral"}
+
+# Providers whose LiteLLM route accepts stream_options; streamed responses only
+# carry a usage chunk when include_usage is requested
+_STREAM_USAGE_PROVIDERS = frozenset({"openai", "groq", "xai", "anthropic", "gemini"})
+
 
 class LLMService:
     """Multi-provider LLM service backed by LiteLLM."""
@@ -48,6 +87,7 @@ class LLMService:
         xai_model: str = "grok-3-mini",
         provider: str = "ollama",
         adapter: Optional[LLMProviderAdapter] = None,
+        embed_query: Optional[Callable[[str], List[float]]] = None,
     ):
         self.base_url = ollama_base_url
         self.model = ollama_model
@@ -64,6 +104,23 @@ class LLMService:
         self.provider = provider.lower().strip()
         self._adapter: LLMProviderAdapter = adapter or create_adapter_for_provider(self.provider, settings)
         self._token_usage: Dict[str, int] = {"prompt": 0, "completion": 0, "total": 0}
+        self._http_client = None
+        # Identical requests already running -> their shared task (see _coalesced)
+        self._inflight: Dict[Hashable, "asyncio.Task[str]"] = {}
+        # RAG answers reused for repeated / paraphrased questions over the same
+        # context; embed_query enables the paraphrase (semantic) matching
+        self._response_cache: Optional[SemanticResponseCache] = None
+        if getattr(settings, "LLM_RESPONSE_CACHE_ENABLED", True):
+            self._response_cache = SemanticResponseCache(
+                embed_query,
+                max_entries=getattr(settings, "LLM_RESPONSE_CACHE_MAX_ENTRIES", 256),
+                ttl_seconds=getattr(settings, "LLM_RESPONSE_CACHE_TTL_SECONDS", 3600),
+                max_distance=getattr(settings, "LLM_RESPONSE_CACHE_MAX_DISTANCE", 0.08),
+            )
+        # generate_simple answers by exact request digest -> (stored_at, text)
+        self._simple_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._simple_cache_max = getattr(settings, "LLM_SIMPLE_CACHE_MAX_ENTRIES", 2048)
+        self._simple_cache_ttl = getattr(settings, "LLM_SIMPLE_CACHE_TTL_SECONDS", 3600)
         logger.info("LLMService initialized with provider: %s", self.provider)
 
     # ── Retry helper ─────────────────────────────────────────────────────────
@@ -97,6 +154,58 @@ class LLMService:
                 )
                 await asyncio.sleep(delay)
 
+    # ── Request coalescing ────────────────────────────────────────────────────
+
+    async def _coalesced(self, key: Hashable, coro_factory: Callable) -> str:
+        """
+        Run `coro_factory()` once for concurrent callers with the same key.
+
+        LLM chat APIs have no low-latency batch endpoint, so concurrent
+        requests cannot be merged into one call; identical ones can share it.
+        The call runs as its own task and each caller awaits it through
+        asyncio.shield, so one caller being cancelled does not cancel the
+        answer for the others.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coro_factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        else:
+            logger.debug("Coalesced identical in-flight LLM request")
+        return await asyncio.shield(task)
+
+    # ── HTTP client ───────────────────────────────────────────────────────────
+
+    def _litellm(self):
+        """
+        Import LiteLLM and point it at one pooled httpx.AsyncClient.
+
+        Without a shared session each provider call may open its own connection
+        and pay the TCP/TLS handshake again. HTTP/2 is enabled when the optional
+        h2 package is installed, so concurrent queries to cloud providers
+        multiplex over one connection.
+        """
+        import litellm
+        if self._http_client is None:
+            import httpx
+            # Pool limits and HTTP/2 belong to the transport once one is passed
+            transport = httpx.AsyncHTTPTransport(
+                http2=importlib.util.find_spec("h2") is not None,
+                limits=httpx.Limits(
+                    max_connections=_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+                ),
+                retries=_HTTP_CONNECT_RETRIES,
+            )
+            self._http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(_HTTP_TIMEOUT_SECONDS, connect=_HTTP_CONNECT_TIMEOUT_SECONDS),
+                transport=transport,
+            )
+            litellm.aclient_session = self._http_client
+        return litellm
+
     # ── Provider helpers ──────────────────────────────────────────────────────
 
     def _litellm_model(self) -> str:
@@ -130,22 +239,35 @@ class LLMService:
             return {"api_base": self.base_url}
         return {}
 
+    def _stream_kwargs(self) -> Dict[str, Any]:
+        kwargs = self._extra_kwargs()
+        if self.provider in _STREAM_USAGE_PROVIDERS:
+            kwargs["stream_options"] = {"include_usage": True}
+        return kwargs
+
     def _record_usage(self, response: Any, label: str = "") -> None:
         try:
             usage = getattr(response, "usage", None)
             p = int(getattr(usage, "prompt_tokens", 0) or 0)
             c = int(getattr(usage, "completion_tokens", 0) or 0)
+            # Prompt tokens served from the provider's prompt cache, if reported
+            details = getattr(usage, "prompt_tokens_details", None)
+            cached = int(
+                getattr(details, "cached_tokens", 0)
+                or getattr(usage, "cache_read_input_tokens", 0)
+                or 0
+            )
         except Exception:
-            p = c = 0
+            p = c = cached = 0
         t = p + c
         self._token_usage["prompt"] += p
         self._token_usage["completion"] += c
         self._token_usage["total"] += t
         if t:
             logger.info(
-                "LLM token usage%s: prompt=%s, completion=%s, total=%s (cumulative=%s)",
+                "LLM token usage%s: prompt=%s (cached=%s), completion=%s, total=%s (cumulative=%s)",
                 f" ({label})" if label else "",
-                p, c, t, self._token_usage["total"],
+                p, cached, c, t, self._token_usage["total"],
             )
 
     # ── Public interface ──────────────────────────────────────────────────────
@@ -215,20 +337,7 @@ class LLMService:
 
     def _build_messages(self, query: str, context: str, conversation_history: list) -> List[Dict[str, Any]]:
         """Build structured messages list for LiteLLM (fixes F5: single-blob prompt)."""
-        system_parts = [
-            "Use the document context below when it is relevant to the user's question. "
-            "Cite sources as [Document: filename].\n\n"
-            "Rules:\n"
-            "- Use the documents when they help answer the question. If asked for an overview, "
-            "summarize what the context says and what the documents are about.\n"
-            "- If the question is general conversation (e.g. greetings), respond normally; "
-            "do not force document citations.\n"
-            "- Combine information from multiple chunks of the same document into one answer. "
-            "When asked for a list, include every matching item from the context.\n"
-            "- Only say 'the context doesn't contain the answer' when the user clearly asked a "
-            "factual question that is not in the context.\n"
-            "- Use specific details and quotes when relevant."
-        ]
+        system_parts = [_RAG_SYSTEM_PROMPT]
         history_messages: List[Dict[str, Any]] = []
 
         for msg in (conversation_history or []):
@@ -241,9 +350,31 @@ class LLMService:
             elif role in ("user", "assistant"):
                 history_messages.append({"role": role, "content": content})
 
-        messages: List[Dict[str, Any]] = [{"role": "system", "content": "\n".join(system_parts)}]
+        system_content = _RAG_SYSTEM_PROMPT if len(system_parts) == 1 else "\n".join(system_parts)
+        if self.provider != "anthropic":
+            # OpenAI, Gemini, Groq and xAI cache repeated prompt prefixes on their
+            # own; keeping the instructions first and the question last is enough.
+            messages: List[Dict[str, Any]] = [{"role": "system", "content": system_content}]
+            messages.extend(history_messages)
+            messages.append({"role": "user", "content": f"Context:\n{context}\n\nQuestion: {query}"})
+            return messages
+
+        # Anthropic only caches up to explicit breakpoints: one after the
+        # instructions and one after the retrieved context, so a follow-up
+        # question over the same chunks re-reads them from the prompt cache.
+        # Prefixes below the provider's minimum cacheable length are sent as-is.
+        messages = [{
+            "role": "system",
+            "content": [{"type": "text", "text": system_content, "cache_control": _CACHE_CONTROL}],
+        }]
         messages.extend(history_messages)
-        messages.append({"role": "user", "content": f"Context:\n{context}\n\nQuestion: {query}"})
+        messages.append({
+            "role": "user",
+            "content": [
+                {"type": "text", "text": f"Context:\n{context}", "cache_control": _CACHE_CONTROL},
+                {"type": "text", "text": f"\n\nQuestion: {query}"},
+            ],
+        })
         return messages
 
     # ── Core generation ───────────────────────────────────────────────────────
@@ -254,13 +385,27 @@ class LLMService:
         prompt_type: str = PROMPT_TYPE_CLASSIFICATION,
         max_completion_tokens: Optional[int] = None,
     ) -> str:
-        import litellm
         prompt = self._adapter.truncate_prompt(prompt)
         out_tokens = (
             max_completion_tokens
             if max_completion_tokens is not None
             else self._adapter.get_max_output_tokens(prompt_type)
         )
+        # Digest rather than the raw prompt, which can be tens of KB
+        key = SemanticResponseCache.bucket_key(
+            "simple", self._litellm_model(), str(self._extra_kwargs().get("api_base")), str(out_tokens), prompt
+        )
+        cached = self._simple_cache.get(key)
+        if cached is not None:
+            if time.monotonic() - cached[0] < self._simple_cache_ttl:
+                self._simple_cache.move_to_end(key)
+                logger.debug("generate_simple cache hit")
+                return cached[1]
+            del self._simple_cache[key]
+        return await self._coalesced(key, lambda: self._generate_simple(prompt, out_tokens, key))
+
+    async def _generate_simple(self, prompt: str, out_tokens: int, cache_key: str) -> str:
+        litellm = self._litellm()
         try:
             response = await self._with_retry(
                 lambda: litellm.acompletion(
@@ -274,7 +419,14 @@ class LLMService:
                 label="generate_simple",
             )
             self._record_usage(response, label=f"generate_simple_{self.provider}")
-            return (response.choices[0].message.content or "").strip() or "I couldn't generate a response."
+            text = (response.choices[0].message.content or "").strip()
+            if not text:
+                return "I couldn't generate a response."
+            if self._simple_cache_max > 0:
+                self._simple_cache[cache_key] = (time.monotonic(), text)
+                if len(self._simple_cache) > self._simple_cache_max:
+                    self._simple_cache.popitem(last=False)
+            return text
         except Exception as e:
             logger.error("generate_simple failed: %s", e)
             return "I couldn't generate a response due to an error."
@@ -282,55 +434,109 @@ class LLMService:
     async def generate_response(
         self, query: str, context: str, conversation_history: list = None
     ) -> str:
-        import litellm
-        context = self._adapter.truncate_context(context)
-        messages = self._build_messages(query, context, conversation_history or [])
-        max_tokens = getattr(settings, "LLM_MAX_RESPONSE_TOKENS", 8192)
+        bucket = self._rag_bucket_key(context, conversation_history)
+        if self._response_cache is not None:
+            cached = await self._response_cache.lookup(bucket, query)
+            if cached is not None:
+                return cached
+        key = ("rag", bucket, " ".join(query.lower().split()))
+        return await self._coalesced(
+            key, lambda: self._generate_response(query, context, conversation_history, bucket)
+        )
+
+    async def _generate_response(
+        self, query: str, context: str, conversation_history: Optional[list], bucket: str
+    ) -> str:
+        # Same streamed request as generate_response_stream, so the connection
+        # is busy for the generation only and not for a final full-body wait
         try:
-            response = await self._with_retry(
-                lambda: litellm.acompletion(
-                    model=self._litellm_model(),
-                    messages=messages,
-                    api_key=self._api_key(),
-                    temperature=getattr(settings, "LLM_TEMPERATURE", 0.1),
-                    max_tokens=max_tokens,
-                    **self._extra_kwargs(),
-                ),
-                label="generate_response",
-            )
-            self._record_usage(response, label=f"generate_response_{self.provider}")
-            return (response.choices[0].message.content or "").strip() or "I couldn't generate a response."
+            parts = [
+                delta
+                async for delta in self._stream_response(
+                    query, context, conversation_history, label="generate_response"
+                )
+            ]
+            text = "".join(parts).strip()
         except Exception as e:
             logger.error("generate_response failed: %s", e)
             return "I couldn't generate a response due to an error."
+        if not text:
+            return "I couldn't generate a response."
+        if self._response_cache is not None:
+            self._response_cache.store(bucket, query, text)
+        return text
 
     async def generate_response_stream(
         self, query: str, context: str, conversation_history: list = None
     ) -> AsyncIterator[str]:
-        import litellm
-        context = self._adapter.truncate_context(context)
-        messages = self._build_messages(query, context, conversation_history or [])
-        max_tokens = getattr(settings, "LLM_MAX_RESPONSE_TOKENS", 8192)
+        bucket = self._rag_bucket_key(context, conversation_history)
+        if self._response_cache is not None:
+            cached = await self._response_cache.lookup(bucket, query)
+            if cached is not None:
+                yield cached
+                return
+        parts: List[str] = []
         try:
-            stream = await self._with_retry(
-                lambda: litellm.acompletion(
-                    model=self._litellm_model(),
-                    messages=messages,
-                    api_key=self._api_key(),
-                    temperature=getattr(settings, "LLM_TEMPERATURE", 0.1),
-                    max_tokens=max_tokens,
-                    stream=True,
-                    **self._extra_kwargs(),
-                ),
-                label="generate_response_stream",
-            )
-            async for chunk in stream:
-                delta = (chunk.choices[0].delta.content or "") if chunk.choices else ""
-                if delta:
-                    yield delta
+            async for delta in self._stream_response(
+                query, context, conversation_history, label="generate_response_stream"
+            ):
+                parts.append(delta)
+                yield delta
         except Exception as e:
             logger.error("generate_response_stream failed: %s", e)
             yield "I couldn't generate a response due to an error."
+            return
+        text = "".join(parts).strip()
+        if text and self._response_cache is not None:
+            self._response_cache.store(bucket, query, text)
+
+    def _rag_bucket_key(self, context: str, conversation_history: Optional[list]) -> str:
+        """Hash of a RAG request minus the question (response-cache bucket)."""
+        history = [
+            (msg.get("role", "user"), (msg.get("content") or "").strip())
+            for msg in (conversation_history or [])
+        ]
+        return SemanticResponseCache.bucket_key(
+            self.provider,
+            self._litellm_model(),
+            self.base_url if self.provider == "ollama" else "",
+            str(getattr(settings, "LLM_TEMPERATURE", 0.1)),
+            str(getattr(settings, "LLM_MAX_RESPONSE_TOKENS", 8192)),
+            _RAG_SYSTEM_PROMPT,
+            json.dumps(history, ensure_ascii=False),
+            context,
+        )
+
+    async def _stream_response(
+        self, query: str, context: str, conversation_history: Optional[list], label: str
+    ) -> AsyncIterator[str]:
+        """Stream a RAG answer as text deltas; errors propagate to the caller."""
+        litellm = self._litellm()
+        context = self._adapter.truncate_context(context)
+        messages = self._build_messages(query, context, conversation_history or [])
+        max_tokens = getattr(settings, "LLM_MAX_RESPONSE_TOKENS", 8192)
+        stream = await self._with_retry(
+            lambda: litellm.acompletion(
+                model=self._litellm_model(),
+                messages=messages,
+                api_key=self._api_key(),
+                temperature=getattr(settings, "LLM_TEMPERATURE", 0.1),
+                max_tokens=max_tokens,
+                stream=True,
+                **self._stream_kwargs(),
+            ),
+            label=label,
+        )
+        usage_chunk = None
+        async for chunk in stream:
+            if getattr(chunk, "usage", None) is not None:
+                usage_chunk = chunk
+            delta = (chunk.choices[0].delta.content or "") if chunk.choices else ""
+            if delta:
+                yield delta
+        # Providers that report usage put it on a (usually the last) stream chunk
+        if usage_chunk is not None:
+            self._record_usage(usage_chunk, label=f"{label}_{self.provider}")
 
     async def chat_with_tools(
         self,
@@ -338,7 +544,7 @@ class LLMService:
         tools: List[Dict[str, Any]],
         max_tokens: int = 4096,
     ) -> Tuple[Optional[str], Optional[List[Dict[str, Any]]]]:
-        import litellm
+        litellm = self._litellm()
         try:
             response = await self._with_retry(
                 lambda: litellm.acompletion(
@@ -437,7 +643,7 @@ class LLMService:
         messages: List[Dict[str, Any]],
         max_tokens: int = 4096,
     ) -> Optional[str]:
-        import litellm
+        litellm = self._litellm()
         # Replace the system message with a plain instruction so the model doesn't
         # try to write tool call JSON when no tools are available via the API.
         clean_messages = []
@@ -473,7 +679,7 @@ class LLMService:
         messages: List[Dict[str, Any]],
         max_tokens: int = 4096,
     ) -> AsyncIterator[str]:
-        import litellm
+        litellm = self._litellm()
         try:
             stream = await self._with_retry(
                 lambda: litellm.acompletion(
@@ -483,20 +689,40 @@ class LLMService:
                     temperature=0.1,
                     max_tokens=max_tokens,
                     stream=True,
-                    **self._extra_kwargs(),
+                    **self._stream_kwargs(),
                 ),
                 label="chat_messages_stream",
             )
+            usage_chunk = None
             async for chunk in stream:
+                if getattr(chunk, "usage", None) is not None:
+                    usage_chunk = chunk
                 delta = (chunk.choices[0].delta.content or "") if chunk.choices else ""
                 if delta:
                     yield delta
+            if usage_chunk is not None:
+                self._record_usage(usage_chunk, label=f"chat_messages_stream_{self.provider}")
         except Exception as e:
             logger.error("chat_messages_stream failed: %s", e)
             yield "I couldn't generate a response due to an error."
 
+    def clear_response_cache(self) -> None:
+        """Drop all cached RAG and generate_simple answers."""
+        if self._response_cache is not None:
+            self._response_cache.clear()
+        self._simple_cache.clear()
+
     async def cleanup(self):
-        pass  # LiteLLM manages its own connections
+        if self._http_client is None:
+            return
+        client, self._http_client = self._http_client, None
+        try:
+            import litellm
+            if litellm.aclient_session is client:
+                litellm.aclient_session = None
+        except ImportError:
+            pass
+        await client.aclose()
 
     async def __aenter__(self):
         return self
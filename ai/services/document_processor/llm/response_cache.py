@@ -0,0 +1,177 @@
+"""
+SemanticResponseCache — reuse RAG answers for repeated or paraphrased questions.
+
+Answers are grouped in buckets keyed by an exact hash of everything that shapes
+the completion apart from the question wording: provider/model, sampling
+settings, system prompt, conversation history and the retrieved context. Inside
+a bucket a question is answered from cache when it matches a stored question
+exactly (after whitespace/case normalisation) or when the two question
+embeddings are within a cosine-distance threshold and both questions carry
+the same numbers and quoted phrases. Embeddings place "total for invoice 123"
+and "total for invoice 124" almost on top of each other, so those literals are
+compared exactly rather than trusted to the threshold.
+
+Because the context is part of the exact key, a paraphrase is only served from
+cache when retrieval produced the same chunks for it, and re-indexed documents
+simply stop matching. Question embeddings are computed lazily, only when a
+bucket already holds an answer that did not match exactly, so unique questions
+pay nothing beyond a hash.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Answers kept per bucket (same context, different questions)
+_MAX_ENTRIES_PER_BUCKET = 8
+
+
+# Numbers (dates, amounts, codes like TCO004) and quoted phrases; questions
+# that differ in any of these never share a semantic match
+_LITERAL_RE = re.compile(r'\d+(?:[.,:/-]\d+)*|"[^"]*"|“[^”]*”')
+
+
+def _normalize_question(question: str) -> str:
+    return " ".join(question.lower().split())
+
+
+def _literals(normalized: str) -> List[str]:
+    return _LITERAL_RE.findall(normalized)
+
+
+@dataclass
+class _CachedAnswer:
+    question: str  # normalized
+    answer: str
+    created_at: float
+    embedding: Optional[np.ndarray] = None  # unit vector, filled in on demand
+
+
+class SemanticResponseCache:
+    """Bounded LRU + TTL cache of LLM answers with semantic question matching."""
+
+    def __init__(
+        self,
+        embed_query: Optional[Callable[[str], Sequence[float]]] = None,
+        max_entries: int = 256,
+        ttl_seconds: float = 3600.0,
+        max_distance: float = 0.08,
+    ):
+        """
+        Args:
+            embed_query: Question -> embedding of the question text as-is (e.g.
+                EmbeddingService.encode_single_text, not the retrieval-prefixed
+                encode_query); without it only exact question matches are served
+            max_entries: Maximum cached answers across all buckets
+            ttl_seconds: Age after which an answer is no longer served
+            max_distance: Largest cosine distance between two questions that
+                still counts as the same question
+        """
+        self._embed_query = embed_query
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_distance = max_distance
+        self._buckets: "OrderedDict[str, List[_CachedAnswer]]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def bucket_key(*parts: str) -> str:
+        """Exact key over the parts of a request that are not the question."""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode("utf-8", "surrogatepass"))
+            digest.update(b"\x1f")
+        return digest.hexdigest()
+
+    async def lookup(self, bucket: str, question: str) -> Optional[str]:
+        """Return a cached answer for question in bucket, or None."""
+        entries = self._buckets.get(bucket)
+        if not entries:
+            self.misses += 1
+            return None
+
+        now = time.monotonic()
+        live = [e for e in entries if now - e.created_at < self.ttl_seconds]
+        if len(live) != len(entries):
+            self._size -= len(entries) - len(live)
+            if not live:
+                del self._buckets[bucket]
+                self.misses += 1
+                return None
+            self._buckets[bucket] = entries = live
+        self._buckets.move_to_end(bucket)
+
+        normalized = _normalize_question(question)
+        for entry in entries:
+            if entry.question == normalized:
+                return self._hit(entry, "exact")
+
+        if self._embed_query is not None:
+            literals = _literals(normalized)
+            candidates = [e for e in entries if _literals(e.question) == literals]
+            try:
+                if candidates:
+                    query_vec = await self._embed(normalized)
+                    best, best_distance = None, self.max_distance
+                    for entry in candidates:
+                        if entry.embedding is None:
+                            entry.embedding = await self._embed(entry.question)
+                        distance = 1.0 - float(np.dot(query_vec, entry.embedding))
+                        if distance <= best_distance:
+                            best, best_distance = entry, distance
+                    if best is not None:
+                        return self._hit(best, f"semantic, distance={best_distance:.3f}")
+            except Exception as e:
+                logger.warning(f"Response cache embedding failed, skipping semantic lookup: {e}")
+
+        self.misses += 1
+        return None
+
+    def store(self, bucket: str, question: str, answer: str) -> None:
+        """Remember answer for question in bucket, evicting least recently used buckets."""
+        if not answer or self.max_entries <= 0:
+            return
+        entries = self._buckets.setdefault(bucket, [])
+        self._buckets.move_to_end(bucket)
+        normalized = _normalize_question(question)
+        for i, entry in enumerate(entries):
+            if entry.question == normalized:
+                del entries[i]
+                self._size -= 1
+                break
+        entries.append(_CachedAnswer(normalized, answer, time.monotonic()))
+        self._size += 1
+        if len(entries) > _MAX_ENTRIES_PER_BUCKET:
+            del entries[0]
+            self._size -= 1
+        while self._size > self.max_entries and self._buckets:
+            _, evicted = self._buckets.popitem(last=False)
+            self._size -= len(evicted)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _hit(self, entry: _CachedAnswer, how: str) -> str:
+        self.hits += 1
+        logger.info(f"LLM response cache hit ({how})")
+        return entry.answer
+
+    async def _embed(self, text: str) -> np.ndarray:
+        vec = np.asarray(await asyncio.to_thread(self._embed_query, text), dtype=np.float32)
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else vec
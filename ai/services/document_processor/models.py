@@ -3,7 +3,7 @@ from typing import List, Dict, Optional
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class DocumentChunk:
     """Represents a chunk of text from a document"""
     text: str
@@ -15,7 +15,7 @@ class DocumentChunk:
     page_number: Optional[int] = None
 
 
-@dataclass 
+@dataclass(slots=True)
 class QueryResult:
     """Result from a document query"""
     message: str
@@ -26,7 +26,7 @@ class QueryResult:
     rerank_count: Optional[int] = None  # Number of chunks re-ranked
 
 
-@dataclass
+@dataclass(slots=True)
 class FileMetadata:
     """Metadata about a processed file"""
     file_path: str
@@ -39,7 +39,7 @@ class FileMetadata:
     hash: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingResult:
     """Result from processing a document"""
     success: bool
@@ -14,6 +14,7 @@ Target: ≤ 300 lines.  No business logic lives here.
 
 import asyncio
 import logging
+import os
 from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from .models import QueryResult
@@ -112,6 +113,7 @@ class DocumentProcessorOrchestrator:
             xai_api_key=xai_api_key,
             xai_model=xai_model,
             provider=llm_provider,
+            embed_query=self.embedding_service.encode_single_text,
         )
         self.file_validator = FileValidator(max_file_size_mb, ocr_service=ocr_service)
         self.database_service = database_service if database_service is not None else DatabaseService()
@@ -140,6 +142,7 @@ class DocumentProcessorOrchestrator:
             database_service=self.database_service,
             update_queue=_update_queue,
             spreadsheet_extractor=self.spreadsheet_extractor,
+            trie_persist_path=os.path.join(persist_dir, "filename_trie.marisa"),
         )
         _update_worker = UpdateWorker(
             update_queue=_update_queue,
@@ -227,11 +230,11 @@ class DocumentProcessorOrchestrator:
     def _schedule_suggestions_prewarm(self, directory_path: str) -> None:
         """Sync hook: schedule async suggestions pre-warm as a background task."""
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                loop.create_task(self._prewarm_suggestions(directory_path))
-        except Exception as e:
-            logger.warning("Could not schedule suggestions pre-warm: %s", e)
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning("Could not schedule suggestions pre-warm: no running event loop")
+            return
+        loop.create_task(self._prewarm_suggestions(directory_path))
 
     async def _prewarm_suggestions(self, directory_path: str) -> None:
         """Pre-warm the suggestions cache so the UI gets instant results."""
@@ -305,6 +308,7 @@ class DocumentProcessorOrchestrator:
         logger.info("Filename Trie cleared")
 
         self.pipeline.router.clear_cache()
+        self.llm_service.clear_response_cache()
 
         try:
             await self.database_service.delete_all_indexed_documents()
@@ -318,6 +322,7 @@ class DocumentProcessorOrchestrator:
             await self.vector_store.clear_collection()
             self.indexing._metadata_cache.clear()
             self.pipeline.router.clear_cache()
+            self.llm_service.clear_response_cache()
             logger.info("Document collection cleared successfully")
         except Exception as e:
             logger.error(f"Error clearing collection: {e}")
@@ -456,8 +461,12 @@ class DocumentProcessorOrchestrator:
         """Release all resources."""
         try:
             await self.llm_service.cleanup()
+            self.retrieval.shutdown()
             self.vector_store.cleanup()
             self.embedding_service.cleanup()
+            self.text_extractor.shutdown()
+            if self.text_extractor.ocr_service is not None:
+                self.text_extractor.ocr_service.shutdown()
             self.indexing._metadata_cache.clear()
             logger.info("DocumentProcessorOrchestrator cleaned up successfully")
         except Exception as e:
@@ -549,7 +549,7 @@ class QueryPipelineService:
         if not query or not str(query).strip():
             return None
         q = query.strip()
-        embedding = self.embedding_service.encode_query(q)
+        embedding = await asyncio.to_thread(self.embedding_service.encode_query, q)
         # Use high-recall aggregation params for value/total queries so Amount Due
         # and similar tail fields aren't cut off by the standard top-k cap.
         params_override = (
@@ -581,7 +581,7 @@ class QueryPipelineService:
         if not document_name or not str(document_name).strip():
             return None
         query = document_name.strip()
-        embedding = self.embedding_service.encode_query(query)
+        embedding = await asyncio.to_thread(self.embedding_service.encode_query, query)
         rag = await self.retrieval.retrieve_and_build_context(
             question=query,
             query_type="document_search",
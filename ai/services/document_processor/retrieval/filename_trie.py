@@ -5,23 +5,64 @@ Provides O(m) prefix-based filename search where m = query length,
 not number of files. Enables instant autocomplete and fast filename queries.
 
 Performance: 100-10,000x faster than SQL ILIKE for large directories.
+
+When ``marisa-trie`` is installed the prefix index is a static, succinct
+C++ trie (rebuilt lazily after enough mutations) instead of one Python
+object per character; otherwise the pure-Python TrieNode tree is used.
+In marisa mode the static trie can also be saved to disk and loaded on the
+next start, so a rescan of an unchanged directory needs no rebuild.
 """
 
+import heapq
 import logging
-from typing import List, Set, Optional, Dict
+import os
+from collections import OrderedDict
+from itertools import islice
+from typing import AbstractSet, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
 from pathlib import Path
-from collections import defaultdict
+
+try:
+    import marisa_trie
+except ImportError:  # optional accelerator; the TrieNode tree is used instead
+    marisa_trie = None
 
 logger = logging.getLogger(__name__)
 
+# Keys added or removed since the last marisa build are patched in at search
+# time; once this many accumulate the static trie is rebuilt on the next search.
+_PENDING_REBUILD_THRESHOLD = 256
+
+# Recent search / top_ranked answers (misses included), dropped on any change
+_RESULT_CACHE_SIZE = 1024
+
+_NO_PATHS: FrozenSet[str] = frozenset()
+
+# Paths stored for one filename: the path itself when there is only one (the
+# common case), a set once several files share the name
+_Paths = Union[str, Set[str]]
+
+
+def _iter_paths(paths: Union[_Paths, AbstractSet[str]]) -> Iterable[str]:
+    """Iterate the paths stored for one filename, whichever shape they have."""
+    return (paths,) if paths.__class__ is str else paths
+
 
 class TrieNode:
     """Node in the Trie data structure"""
     
+    # Slots drop the per-node __dict__: there is one node per filename character
+    __slots__ = ("children", "file_paths", "is_end", "max_rank")
+    
     def __init__(self):
         self.children: Dict[str, 'TrieNode'] = {}
-        self.file_paths: Set[str] = set()  # Files ending at this node
+        # Files ending at this node, the same object as FilenameTrie._paths
+        # holds for the name (a str or a set); other nodes share one empty
+        # frozenset.
+        self.file_paths: Union[_Paths, AbstractSet[str]] = _NO_PATHS
         self.is_end: bool = False  # True if this node represents end of a filename
+        # Upper bound on the rank of any file at or below this node. Not lowered
+        # on removal, so it stays a valid bound for pruning ranked lookups.
+        self.max_rank: float = float("-inf")
 
 
 class FilenameTrie:
@@ -32,41 +73,123 @@ class FilenameTrie:
     - O(m) prefix search where m = query length
     - Case-insensitive matching
     - Multiple files per prefix
-    - Fast autocomplete suggestions
+    - Fast autocomplete suggestions, best-ranked (e.g. most recently
+      modified) first
     """
     
-    def __init__(self):
+    def __init__(self, persist_path: Optional[str] = None):
+        """
+        Initialize the Trie.
+        
+        Args:
+            persist_path: File the marisa index is saved to and loaded from
+                (ignored without marisa-trie)
+        """
         self.root = TrieNode()
         self.file_count = 0
-        logger.info("FilenameTrie initialized")
+        # Kept up to date by add() so get_stats() never walks the trie. Nodes
+        # are never pruned, so neither value goes down on remove().
+        self.node_count = 1
+        self.max_depth = 0
+        # filename_lower -> file path(s); shared with TrieNode.file_paths in
+        # pure-Python mode and the only path store in marisa mode. A lone path
+        # is kept as a plain str, which saves an empty-ish set per filename.
+        self._paths: Dict[str, _Paths] = {}
+        # file_path -> rank used to order autocomplete suggestions
+        self._ranks: Dict[str, float] = {}
+        # marisa mode: static trie plus keys added / removed since it was built
+        self._static = None
+        self._pending: Set[str] = set()
+        self._stale = 0
+        # (kind, query, limit) -> result tuple; autocomplete re-sends the same
+        # prefixes on every keystroke, and misses walk the trie just as often
+        self._result_cache: "OrderedDict[Tuple, Tuple[str, ...]]" = OrderedDict()
+        self.persist_path = persist_path if marisa_trie is not None else None
+        self._static_saved = False  # _static matches the file at persist_path
+        backend = "marisa-trie" if marisa_trie is not None else "pure Python"
+        logger.info(f"FilenameTrie initialized ({backend})")
+        self._load_static()
     
-    def add(self, filename: str, file_path: str) -> None:
+    def add(self, filename: str, file_path: str, rank: float = 0.0) -> None:
         """
         Add a filename to the Trie.
         
         Args:
             filename: The filename (without path)
             file_path: Full path to the file
+            rank: Ordering score for autocomplete (higher first), e.g. mtime
         """
         if not filename or not file_path:
             return
+        self.add_many(((filename, file_path, rank),))
+        logger.debug(f"Added to Trie: {filename} -> {file_path}")
+    
+    def add_many(self, entries: Iterable[Tuple[str, str, float]]) -> None:
+        """
+        Add many filenames at once, e.g. everything found by a directory scan.
         
-        # Normalize: lowercase for case-insensitive search
-        filename_lower = filename.lower()
-        node = self.root
+        Same result as calling add() for each entry, without the per-call
+        overhead. In marisa mode new names are indexed by one static trie
+        build instead of being patched in at search time.
         
-        # Traverse/create path for each character
-        for char in filename_lower:
-            if char not in node.children:
-                node.children[char] = TrieNode()
-            node = node.children[char]
+        Args:
+            entries: (filename, file_path, rank) tuples
+        """
+        paths_by_name = self._paths
+        ranks = self._ranks
+        static = self._static
+        pending = self._pending
+        use_marisa = marisa_trie is not None
+        root = self.root
+        added = 0
         
-        # Mark end of filename and store file path
-        node.is_end = True
-        node.file_paths.add(file_path)
-        self.file_count += 1
+        for filename, file_path, rank in entries:
+            if not filename or not file_path:
+                continue
+            # Normalize: lowercase for case-insensitive search
+            filename_lower = filename.lower()
+            paths = paths_by_name.get(filename_lower)
+            if paths is None:
+                paths = paths_by_name[filename_lower] = file_path
+                if len(filename_lower) > self.max_depth:
+                    self.max_depth = len(filename_lower)
+                if use_marisa:
+                    if static is not None and filename_lower in static:
+                        self._stale -= 1  # removed earlier, still in the static trie
+                    else:
+                        pending.add(filename_lower)
+            elif paths.__class__ is str:
+                if paths != file_path:
+                    # Second file with this name: promote to a set
+                    paths = paths_by_name[filename_lower] = {paths, file_path}
+            else:
+                paths.add(file_path)
+            
+            if not use_marisa:
+                node = root
+                if rank > node.max_rank:
+                    node.max_rank = rank
+                # Traverse/create path for each character, raising rank bounds
+                for char in filename_lower:
+                    child = node.children.get(char)
+                    if child is None:
+                        child = node.children[char] = TrieNode()
+                        self.node_count += 1
+                    node = child
+                    if rank > node.max_rank:
+                        node.max_rank = rank
+                # Mark end of filename; the node shares the stored paths
+                node.is_end = True
+                node.file_paths = paths
+            
+            ranks[file_path] = rank
+            added += 1
         
-        logger.debug(f"Added to Trie: {filename} -> {file_path}")
+        self.file_count += added
+        if added:
+            self._result_cache.clear()
+        if use_marisa and len(pending) + self._stale > _PENDING_REBUILD_THRESHOLD:
+            self._rebuild_static()
     
     def remove(self, filename: str, file_path: str) -> None:
         """
@@ -80,24 +203,43 @@ class FilenameTrie:
             return
         
         filename_lower = filename.lower()
-        node = self.root
+        paths = self._paths.get(filename_lower)
+        if paths is None:
+            return  # File not in Trie
+        if paths.__class__ is str:
+            if paths != file_path:
+                return
+            remaining = None
+        else:
+            if file_path not in paths:
+                return
+            paths.remove(file_path)
+            # Back to a single path: store it as a plain str again
+            remaining = next(iter(paths)) if len(paths) == 1 else paths
         
-        # Traverse to the end node
-        for char in filename_lower:
-            if char not in node.children:
-                return  # File not in Trie
-            node = node.children[char]
+        self._ranks.pop(file_path, None)
+        self.file_count -= 1
+        self._result_cache.clear()
         
-        # Remove file path from this node
-        if file_path in node.file_paths:
-            node.file_paths.remove(file_path)
-            self.file_count -= 1
-            
-            # If no more files at this node, mark as not end
-            if not node.file_paths:
-                node.is_end = False
-            
-            logger.debug(f"Removed from Trie: {filename} -> {file_path}")
+        if remaining is None:
+            # No more files under this name, drop the key
+            del self._paths[filename_lower]
+            if marisa_trie is not None:
+                if filename_lower in self._pending:
+                    self._pending.discard(filename_lower)
+                else:
+                    self._stale += 1  # still in the static trie; filtered at search time
+        elif remaining is not paths:
+            self._paths[filename_lower] = remaining
+        
+        if marisa_trie is None and remaining is not paths:
+            node = self.root
+            for char in filename_lower:
+                node = node.children[char]
+            node.is_end = remaining is not None
+            node.file_paths = _NO_PATHS if remaining is None else remaining
+        
+        logger.debug(f"Removed from Trie: {filename} -> {file_path}")
     
     def search(self, query: str, max_results: Optional[int] = None) -> List[str]:
         """
@@ -117,42 +259,142 @@ class FilenameTrie:
         if not query_lower:
             return []
         
-        # Traverse to the node matching the query prefix
-        node = self.root
-        for char in query_lower:
-            if char not in node.children:
-                return []  # No matches
-            node = node.children[char]
+        cache_key = ("search", query_lower, max_results)
+        cached = self._cached_result(cache_key)
+        if cached is not None:
+            return cached
         
-        # Collect all file paths from this node and its children
         results = []
-        self._collect_all_paths(node, results, max_results)
+        if marisa_trie is not None:
+            self._collect_marisa_paths(query_lower, results, max_results)
+        else:
+            # Traverse to the node matching the query prefix
+            node = self.root
+            for char in query_lower:
+                node = node.children.get(char)
+                if node is None:
+                    break  # No matches
+            else:
+                # Collect all file paths from this node and its children
+                self._collect_all_paths(node, results, max_results)
         
+        self._cache_result(cache_key, results)
         logger.debug(f"Trie search '{query}' found {len(results)} files")
         return results
     
+    def _cached_result(self, key: Tuple) -> Optional[List[str]]:
+        """Return a copy of a cached result list, or None on a cache miss."""
+        cached = self._result_cache.get(key)
+        if cached is None:
+            return None
+        self._result_cache.move_to_end(key)
+        return list(cached)
+    
+    def _cache_result(self, key: Tuple, results: List[str]) -> None:
+        """Remember results for key, evicting the least recently used entry."""
+        self._result_cache[key] = tuple(results)
+        if len(self._result_cache) > _RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+    
+    def _collect_marisa_paths(self, prefix: str, results: List[str], max_results: Optional[int]) -> None:
+        """Collect file paths for every key under prefix from the marisa index."""
+        if len(self._pending) + self._stale > _PENDING_REBUILD_THRESHOLD:
+            self._rebuild_static()
+        
+        keys = self._static.iterkeys(prefix) if self._static is not None else ()
+        if self._pending:
+            keys = [*keys, *(k for k in self._pending if k.startswith(prefix))]
+        
+        for key in keys:
+            # Keys removed since the last build are still in the static trie
+            for file_path in _iter_paths(self._paths.get(key, _NO_PATHS)):
+                if max_results is not None and len(results) >= max_results:
+                    return
+                results.append(file_path)
+    
+    def _rebuild_static(self) -> None:
+        """Rebuild the static marisa trie from the current key set."""
+        self._static = marisa_trie.Trie(self._paths.keys())
+        self._pending.clear()
+        self._stale = 0
+        self._static_saved = False
+    
+    def _load_static(self) -> None:
+        """
+        Load the static marisa trie saved by a previous run, if any.
+        
+        Paths are not stored in the file: every loaded key counts as removed
+        until add() registers it again, so keys for files that are gone by
+        now are filtered out like any other stale key.
+        """
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return
+        try:
+            static = marisa_trie.Trie()
+            static.load(self.persist_path)
+        except Exception as e:
+            logger.warning(f"Failed to load filename trie from {self.persist_path}: {e}")
+            return
+        self._static = static
+        self._stale = len(static)
+        self._static_saved = True
+        logger.info(f"Filename trie loaded from {self.persist_path} ({len(static)} names)")
+    
+    def save(self) -> None:
+        """
+        Persist the marisa index to persist_path (no-op without one).
+        
+        Rebuilds the static trie first if keys changed since the last build.
+        Call once after a batch of add() calls, e.g. after a directory scan.
+        """
+        if not self.persist_path:
+            return
+        if self._static is None or self._pending or self._stale:
+            self._rebuild_static()
+        if self._static_saved:
+            return
+        try:
+            # Write then rename so a crash never leaves a truncated index behind
+            tmp_path = f"{self.persist_path}.tmp"
+            self._static.save(tmp_path)
+            os.replace(tmp_path, self.persist_path)
+            self._static_saved = True
+            logger.debug(f"Filename trie saved to {self.persist_path}")
+        except Exception as e:
+            logger.error(f"Failed to save filename trie: {e}")
+    
     def _collect_all_paths(self, node: TrieNode, results: List[str], max_results: Optional[int]) -> None:
         """
-        Recursively collect all file paths from a node and its children.
+        Collect all file paths from a node and its descendants.
+        
+        Walks depth-first with an explicit stack (children pushed in reverse
+        so they are visited in insertion order) and stops as soon as
+        max_results paths have been collected.
         
         Args:
-            node: Current Trie node
+            node: Trie node matching the query prefix
             results: List to collect results in
             max_results: Maximum results to collect (None = all)
         """
-        # Add files from current node
-        if node.is_end and node.file_paths:
-            for file_path in node.file_paths:
-                if max_results is not None and len(results) >= max_results:
-                    return
-                results.append(file_path)
-        
-        # Recursively collect from children
-        if max_results is None or len(results) < max_results:
-            for child_node in node.children.values():
-                self._collect_all_paths(child_node, results, max_results)
-                if max_results is not None and len(results) >= max_results:
-                    return
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            # Follow single-child chains (most of a filename) without the stack
+            while True:
+                if node.is_end:
+                    paths = _iter_paths(node.file_paths)
+                    if max_results is None:
+                        results.extend(paths)
+                    else:
+                        results.extend(islice(paths, max_results - len(results)))
+                        if len(results) >= max_results:
+                            return
+                children = node.children
+                if len(children) != 1:
+                    break
+                (node,) = children.values()
+            if children:
+                stack.extend(reversed(children.values()))
     
     def search_prefix(self, prefix: str) -> List[str]:
         """
@@ -179,11 +421,74 @@ class FilenameTrie:
         Returns:
             List of filenames matching the prefix
         """
-        file_paths = self.search(prefix, max_results=max_suggestions)
+        file_paths = self.top_ranked(prefix, max_suggestions)
         # Extract just filenames for autocomplete
         filenames = [Path(fp).name for fp in file_paths]
         return filenames[:max_suggestions]
     
+    def top_ranked(self, prefix: str, k: int) -> List[str]:
+        """
+        Return the k best-ranked file paths whose filename starts with prefix.
+        
+        The Python trie runs a best-first search ordered by each node's
+        max_rank (the PruningRadixTrie idea): a subtree is only expanded while
+        it could still beat the paths already found, so cost depends on k
+        rather than on how many files share the prefix. Equal ranks come
+        back shortest filename first.
+        
+        Args:
+            prefix: Filename prefix
+            k: Number of paths to return
+            
+        Returns:
+            Up to k file paths, highest rank first
+        """
+        prefix_lower = prefix.lower().strip() if prefix else ""
+        if not prefix_lower or k <= 0:
+            return []
+        
+        cache_key = ("top_ranked", prefix_lower, k)
+        cached = self._cached_result(cache_key)
+        if cached is not None:
+            return cached
+        results = self._top_ranked(prefix_lower, k)
+        self._cache_result(cache_key, results)
+        return results
+    
+    def _top_ranked(self, prefix_lower: str, k: int) -> List[str]:
+        """Uncached top_ranked() for a normalized, non-empty prefix."""
+        if marisa_trie is not None:
+            paths: List[str] = []
+            self._collect_marisa_paths(prefix_lower, paths, None)
+            return heapq.nlargest(k, paths, key=self._ranks.__getitem__)
+        
+        node = self.root
+        for char in prefix_lower:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        
+        # One heap holds both subtrees (keyed by their rank bound) and
+        # concrete paths (keyed by their rank); a path that reaches the top
+        # outranks everything still unexpanded, so it is final.
+        ranks = self._ranks
+        results: List[str] = []
+        heap = [(-node.max_rank, 0, node)]
+        counter = 1
+        while heap and len(results) < k:
+            _, _, item = heapq.heappop(heap)
+            if item.__class__ is str:
+                results.append(item)
+                continue
+            if item.is_end:
+                for file_path in _iter_paths(item.file_paths):
+                    heapq.heappush(heap, (-ranks[file_path], counter, file_path))
+                    counter += 1
+            for child in item.children.values():
+                heapq.heappush(heap, (-child.max_rank, counter, child))
+                counter += 1
+        return results
+    
     def contains(self, filename: str) -> bool:
         """
         Check if a filename exists in the Trie.
@@ -194,15 +499,7 @@ class FilenameTrie:
         Returns:
             True if filename exists in Trie
         """
-        filename_lower = filename.lower()
-        node = self.root
-        
-        for char in filename_lower:
-            if char not in node.children:
-                return False
-            node = node.children[char]
-        
-        return node.is_end and len(node.file_paths) > 0
+        return bool(self._paths.get(filename.lower()))
     
     def get_stats(self) -> Dict:
         """
@@ -211,29 +508,35 @@ class FilenameTrie:
         Returns:
             Dictionary with Trie stats
         """
+        if marisa_trie is not None:
+            return {
+                "file_count": self.file_count,
+                "backend": "marisa-trie",
+                "key_count": len(self._paths),
+                "depth": self.max_depth,
+            }
         return {
             "file_count": self.file_count,
-            "node_count": self._count_nodes(self.root),
-            "depth": self._max_depth(self.root)
+            "backend": "python",
+            "node_count": self.node_count,
+            "depth": self.max_depth,
         }
     
-    def _count_nodes(self, node: TrieNode) -> int:
-        """Count total nodes in Trie"""
-        count = 1
-        for child in node.children.values():
-            count += self._count_nodes(child)
-        return count
-    
-    def _max_depth(self, node: TrieNode) -> int:
-        """Get maximum depth of Trie"""
-        if not node.children:
-            return 0
-        return 1 + max(self._max_depth(child) for child in node.children.values())
-    
     def clear(self) -> None:
         """Clear all entries from the Trie"""
         self.root = TrieNode()
         self.file_count = 0
+        self.node_count = 1
+        self.max_depth = 0
+        self._paths = {}
+        self._ranks = {}
+        self._static = None
+        self._pending = set()
+        self._stale = 0
+        self._static_saved = False
+        self._result_cache.clear()
+        if self.persist_path and os.path.exists(self.persist_path):
+            os.remove(self.persist_path)
         logger.info("FilenameTrie cleared")
     
     def search_by_file_type(self, query: str, file_type: str) -> List[str]:
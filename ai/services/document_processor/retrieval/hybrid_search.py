@@ -11,11 +11,15 @@ This approach is used by:
 """
 
 import logging
-from typing import List, Dict, Tuple
-from collections import defaultdict
+from typing import List, Dict, Optional, Tuple
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Ranks covered by the precomputed 1/(k+rank) table; longer lists extend it
+_RRF_TABLE_SIZE = 10_000
+
 
 class HybridSearchService:
     """Combines multiple search methods using Reciprocal Rank Fusion"""
@@ -29,14 +33,23 @@ class HybridSearchService:
                Higher k = more weight to lower ranks
         """
         self.k = k
+        # 1 / (k + rank) for rank = 1.._RRF_TABLE_SIZE
+        self._rrf_table = 1.0 / (k + np.arange(1, _RRF_TABLE_SIZE + 1, dtype=np.float64))
         logger.info(f"HybridSearchService initialized (RRF k={k})")
     
+    def _reciprocal_ranks(self, count: int) -> np.ndarray:
+        """1 / (k + rank) for rank = 1..count, read from the precomputed table"""
+        if count > len(self._rrf_table):
+            self._rrf_table = 1.0 / (self.k + np.arange(1, count + 1, dtype=np.float64))
+        return self._rrf_table[:count]
+    
     def fuse_results(
         self,
         semantic_results: List[Tuple[str, float, Dict]],
         keyword_results: List[Tuple[str, float, Dict]],
         semantic_weight: float = 0.5,
-        keyword_weight: float = 0.5
+        keyword_weight: float = 0.5,
+        top_k: Optional[int] = None
     ) -> List[Tuple[str, float, Dict]]:
         """
         Combine semantic and keyword search results using Reciprocal Rank Fusion (RRF)
@@ -48,6 +61,7 @@ class HybridSearchService:
             keyword_results: List of (id, score, metadata) from keyword search
             semantic_weight: Weight for semantic search (0-1)
             keyword_weight: Weight for keyword search (0-1)
+            top_k: Only return the best top_k documents (default: all)
             
         Returns:
             Fused results as List of (id, fused_score, metadata), sorted by score
@@ -57,30 +71,56 @@ class HybridSearchService:
         semantic_weight = semantic_weight / total_weight
         keyword_weight = keyword_weight / total_weight
         
-        # Calculate RRF scores
-        rrf_scores = defaultdict(float)
-        doc_metadata = {}  # Store metadata for each doc
-        
-        # Process semantic results
-        for rank, (doc_id, score, metadata) in enumerate(semantic_results, start=1):
-            rrf_scores[doc_id] += semantic_weight * (1.0 / (self.k + rank))
-            if doc_id not in doc_metadata:
-                doc_metadata[doc_id] = metadata
-        
-        # Process keyword results
-        for rank, (doc_id, score, metadata) in enumerate(keyword_results, start=1):
-            rrf_scores[doc_id] += keyword_weight * (1.0 / (self.k + rank))
-            if doc_id not in doc_metadata:
-                doc_metadata[doc_id] = metadata
-        
-        # Sort by fused score (descending)
+        # The first metadata seen for an id is the one kept (semantic first);
+        # dict order then gives every distinct id its slot in first-seen order
+        first_metadata: Dict[str, Dict] = {}
+        for doc_id, _score, metadata in semantic_results:
+            first_metadata.setdefault(doc_id, metadata)
+        for doc_id, _score, metadata in keyword_results:
+            first_metadata.setdefault(doc_id, metadata)
+        doc_ids = list(first_metadata)
+        doc_metadata = list(first_metadata.values())
+        slot_of = {doc_id: slot for slot, doc_id in enumerate(doc_ids)}
+        result_slots = np.fromiter(
+            [slot_of[doc_id] for results in (semantic_results, keyword_results) for doc_id, _, _ in results],
+            dtype=np.intp,
+            count=len(semantic_results) + len(keyword_results),
+        )
+
+        n_docs = len(doc_ids)
+        if n_docs == 0:
+            return []
+
+        # RRF contributions for ranks 1..len of each list. One bincount over
+        # both lists adds them per id in the same order as the scalar loop,
+        # including an id that appears twice in one list
+        rrf_scores = np.bincount(
+            result_slots,
+            weights=np.concatenate((
+                semantic_weight * self._reciprocal_ranks(len(semantic_results)),
+                keyword_weight * self._reciprocal_ranks(len(keyword_results)),
+            )),
+            minlength=n_docs,
+        )
+
+        if top_k is not None and top_k < n_docs:
+            # Partial selection in O(n); keep every candidate tied with the k-th
+            # score so ties still break by first-seen order after the sort
+            if top_k <= 0:
+                return []
+            kth_score = -np.partition(-rrf_scores, top_k - 1)[top_k - 1]
+            candidates = np.flatnonzero(rrf_scores >= kth_score)
+        else:
+            candidates = np.arange(n_docs)
+
+        # Descending score, ties in first-seen order (same as a stable sort)
+        order = candidates[np.lexsort((candidates, -rrf_scores[candidates]))]
+        if top_k is not None:
+            order = order[:top_k]
+
         fused_results = [
-            (doc_id, score, doc_metadata[doc_id])
-            for doc_id, score in sorted(
-                rrf_scores.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )
+            (doc_ids[slot], float(rrf_scores[slot]), doc_metadata[slot])
+            for slot in order.tolist()
         ]
         
         logger.debug(
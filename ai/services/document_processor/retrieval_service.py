@@ -15,6 +15,7 @@ import asyncio
 import logging
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -31,6 +32,16 @@ from .corpus_summary import summarize_corpus
 
 logger = logging.getLogger(__name__)
 
+# Threads reserved for query-time searches (vector + BM25 run side by side)
+_SEARCH_WORKERS = 4
+
+# Quoted names and bare filenames with a known extension, matched in one pass
+_EXPLICIT_FILENAME_RE = re.compile(
+    r'"(?P<quoted>[^"]+)"'
+    r"|\b(?P<with_ext>[A-Za-z][A-Za-z0-9_.-]+\.(?:pdf|docx|txt|xlsx|xls|pptx))\b",
+    re.IGNORECASE,
+)
+
 
 def _corpus_has_any_document_category(docs: List[Any]) -> bool:
     return any((getattr(d, "document_category", None) or "").strip() for d in docs)
@@ -109,6 +120,22 @@ class RetrievalService:
         self.retrieval_config = retrieval_config
         self.filename_trie = filename_trie
         self.database_service = database_service
+        # Query-time searches get their own threads: on the default executor they
+        # queue behind background indexing (hashing, extraction, store writes).
+        self._search_pool: Optional[ThreadPoolExecutor] = None
+
+    def _get_search_pool(self) -> ThreadPoolExecutor:
+        if self._search_pool is None:
+            self._search_pool = ThreadPoolExecutor(
+                max_workers=_SEARCH_WORKERS, thread_name_prefix="search"
+            )
+        return self._search_pool
+
+    def shutdown(self) -> None:
+        """Release the search thread pool, if it was started."""
+        if self._search_pool is not None:
+            self._search_pool.shutdown(wait=False, cancel_futures=True)
+            self._search_pool = None
 
     # ------------------------------------------------------------------
     # Public API (called by QueryPipelineService)
@@ -517,19 +544,15 @@ class RetrievalService:
         Detect explicit document identifiers so we can resolve to a single file.
         Handles: quoted names, full filenames with extension, and stems like BIP-12046.
         """
-        quoted = re.findall(r'"([^"]+)"', question)
-        if quoted:
-            return quoted[0]
-
-        with_ext = re.search(
-            r"\b([A-Za-z][A-Za-z0-9_.-]+\.(pdf|docx|txt|xlsx|xls|pptx))\b",
-            question,
-            re.IGNORECASE,
-        )
-        if with_ext:
-            return with_ext.group(1)
-
-        return None
+        # A quoted name wins over a bare filename even when it comes later
+        with_ext = None
+        for match in _EXPLICIT_FILENAME_RE.finditer(question):
+            quoted = match.group("quoted")
+            if quoted is not None:
+                return quoted
+            if with_ext is None:
+                with_ext = match.group("with_ext")
+        return with_ext
 
     async def _select_relevant_files(self, question: str) -> Optional[List[str]]:
         """
@@ -578,12 +601,17 @@ class RetrievalService:
         )
 
         if query_embedding is None:
-            query_embedding = self.embedding_service.encode_query(query)
+            # Off the loop: the model is shared with background indexing, whose
+            # encodes hold the tokenizer lock for a whole batch
+            query_embedding = await asyncio.to_thread(self.embedding_service.encode_query, query)
 
+        search_pool = self._get_search_pool()
         semantic_task = asyncio.create_task(
-            self.vector_store.search_similar(query_embedding, top_k)
+            self.vector_store.search_similar(query_embedding, top_k, executor=search_pool)
+        )
+        bm25_task = asyncio.get_running_loop().run_in_executor(
+            search_pool, self.bm25_service.search, query, top_k
         )
-        bm25_task = asyncio.to_thread(self.bm25_service.search, query, top_k)
         semantic_results, bm25_results = await asyncio.gather(semantic_task, bm25_task)
 
         if not semantic_results["documents"] or not semantic_results["documents"][0]:
@@ -11,8 +11,10 @@ Particularly good for:
 
 import logging
 import pickle
+import threading
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
+import numpy as np
 from rank_bm25 import BM25Okapi
 import re
 
@@ -24,6 +26,64 @@ _STOP_WORDS = frozenset({
     "this", "that", "its", "has", "not", "do", "if",
 })
 
+# Alphanumeric runs, optionally joined by dots/dashes/# so codes like
+# G.P.#, T.C.O. and BIP-12046 stay whole
+_TOKEN_RE = re.compile(r'[a-z0-9]+(?:[.\-#]+[a-z0-9]*)*')
+_CODE_SEPARATOR_RE = re.compile(r'[.\-#]+')
+
+
+class _PostingsIndex:
+    """
+    Term -> (documents, score contributions) view of a BM25Okapi index.
+
+    BM25Okapi.get_scores walks every document in Python for each query token.
+    Here each term's per-document score contribution is precomputed once into
+    flat arrays (CSR layout), so a query only touches the documents that
+    contain its terms. Contributions use the same float operations as
+    get_scores, so scores (and their ranking) are identical.
+    """
+
+    def __init__(self, bm25: BM25Okapi):
+        self.source = bm25
+        self.corpus_size = bm25.corpus_size
+        # bm25.idf holds every corpus term exactly once
+        self.term_ids: Dict[str, int] = {term: i for i, term in enumerate(bm25.idf)}
+        lookup = self.term_ids.__getitem__
+        term_col: List[int] = []
+        freq_col: List[int] = []
+        terms_per_doc: List[int] = []
+        for freqs in bm25.doc_freqs:
+            term_col.extend(map(lookup, freqs))
+            freq_col.extend(freqs.values())
+            terms_per_doc.append(len(freqs))
+
+        terms = np.asarray(term_col, dtype=np.int64)
+        docs = np.repeat(np.arange(len(terms_per_doc), dtype=np.int64), terms_per_doc)
+        # Group by term, documents ascending; (term, doc) pairs are unique, so
+        # the faster unstable sort on a combined key is deterministic
+        order = np.argsort(terms * len(terms_per_doc) + docs)
+        self.docs = docs[order]
+        q_freq = np.asarray(freq_col, dtype=np.int64)[order]
+        self.offsets = np.zeros(len(self.term_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=len(self.term_ids)), out=self.offsets[1:])
+
+        k1, b = bm25.k1, bm25.b
+        doc_len = np.array(bm25.doc_len)[self.docs]
+        idf = np.fromiter(bm25.idf.values(), dtype=np.float64, count=len(bm25.idf))[terms[order]]
+        self.contributions = idf * (
+            q_freq * (k1 + 1) / (q_freq + k1 * (1 - b + b * doc_len / bm25.avgdl))
+        )
+
+    def get_scores(self, query: List[str]) -> np.ndarray:
+        score = np.zeros(self.corpus_size)
+        for q in query:
+            term_id = self.term_ids.get(q)
+            if term_id is None:
+                continue
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            score[self.docs[start:end]] += self.contributions[start:end]
+        return score
+
 
 class BM25Service:
     """Handles keyword-based search using BM25 algorithm"""
@@ -45,6 +105,13 @@ class BM25Service:
         self.bm25: Optional[BM25Okapi] = None
         self.corpus: List[Dict] = []  # List of {id, text, metadata}
         self.tokenized_corpus: List[List[str]] = []
+        # Built from self.bm25 on the first search after each rebuild
+        self._postings: Optional[_PostingsIndex] = None
+        self._postings_lock = threading.Lock()
+        # Guards swapping corpus/bm25; save() builds outside it and only installs
+        # its index if no removal replaced the corpus (bumping _generation) meanwhile
+        self._corpus_lock = threading.Lock()
+        self._generation = 0
         
         # Load existing index if available
         self._load_index()
@@ -66,22 +133,19 @@ class BM25Service:
         Returns:
             List of tokens
         """
-        # Convert to lowercase for case-insensitive matching
-        text = text.lower()
-        
-        # Enhanced tokenization that preserves special codes
-        # Captures: alphanumeric + optional (dot/dash/# + alphanumeric) patterns
-        # Also captures standalone alphanumeric tokens
-        tokens = re.findall(r'[a-z0-9]+(?:[.\-#]+[a-z0-9]*)*', text)
-
+        # Lowercase for case-insensitive matching; codes with dots/dashes/#
+        # are kept whole and their longer parts are indexed as well
         extended_tokens = []
-        for token in tokens:
+        append = extended_tokens.append
+        for token in _TOKEN_RE.findall(text.lower()):
             if token in _STOP_WORDS:
                 continue
-            extended_tokens.append(token)
-            if any(c in token for c in '.#-'):
-                parts = re.split(r'[.\-#]+', token)
-                extended_tokens.extend([p for p in parts if len(p) > 2])
+            append(token)
+            # Tokens are ASCII [a-z0-9.#-], so non-alnum means a separator is present
+            if not token.isalnum():
+                extended_tokens.extend(
+                    [p for p in _CODE_SEPARATOR_RE.split(token) if len(p) > 2]
+                )
 
         return extended_tokens
     
@@ -94,9 +158,12 @@ class BM25Service:
             documents: List of dicts with 'id', 'text', 'metadata'
         """
         try:
-            for doc in documents:
-                self.corpus.append(doc)
-                self.tokenized_corpus.append(self._tokenize(doc['text']))
+            # Tokenize first so a failure leaves corpus and tokenized_corpus aligned
+            tokenize = self._tokenize
+            tokenized = [tokenize(doc['text']) for doc in documents]
+            with self._corpus_lock:
+                self.corpus.extend(documents)
+                self.tokenized_corpus.extend(tokenized)
         except Exception as e:
             logger.error(f"Failed to add documents to BM25: {e}")
             raise
@@ -107,31 +174,49 @@ class BM25Service:
         Returns the number of chunks removed. Used before re-indexing a changed file
         so stale entries do not accumulate.
         """
-        before = len(self.corpus)
-        if before == 0:
-            return 0
+        with self._corpus_lock:
+            before = len(self.corpus)
+            if before == 0:
+                return 0
 
-        paired = [
-            (doc, tok)
-            for doc, tok in zip(self.corpus, self.tokenized_corpus)
-            if doc.get("metadata", {}).get("file_path") != file_path
-        ]
-        removed = before - len(paired)
-        if removed == 0:
-            return 0
+            paired = [
+                (doc, tok)
+                for doc, tok in zip(self.corpus, self.tokenized_corpus)
+                if doc.get("metadata", {}).get("file_path") != file_path
+            ]
+            removed = before - len(paired)
+            if removed == 0:
+                return 0
 
-        self.corpus = [p[0] for p in paired]
-        self.tokenized_corpus = [p[1] for p in paired]
-        self.bm25 = BM25Okapi(self.tokenized_corpus) if self.tokenized_corpus else None
+            self.corpus = [p[0] for p in paired]
+            self.tokenized_corpus = [p[1] for p in paired]
+            self.bm25 = BM25Okapi(self.tokenized_corpus) if self.tokenized_corpus else None
+            self._generation += 1
         logger.debug(f"Removed {removed} BM25 chunks for {file_path}")
         return removed
 
     def save(self) -> None:
         """Rebuild BM25 index from corpus, then persist. Call once after batch indexing is complete."""
-        if self.tokenized_corpus:
-            self.bm25 = BM25Okapi(self.tokenized_corpus)
-            logger.debug(f"BM25 index rebuilt with {len(self.corpus)} documents")
-        self._save_index()
+        # Runs in a worker thread while indexing may keep appending on the event
+        # loop: work on a snapshot, trimmed to the pairs both lists already hold.
+        # A removal during the build shifts the corpus under the snapshot, so the
+        # index is only installed if none happened, and rebuilt otherwise.
+        while True:
+            with self._corpus_lock:
+                generation = self._generation
+                corpus, tokenized_corpus = list(self.corpus), list(self.tokenized_corpus)
+            n = min(len(corpus), len(tokenized_corpus))
+            corpus, tokenized_corpus = corpus[:n], tokenized_corpus[:n]
+            bm25 = BM25Okapi(tokenized_corpus) if tokenized_corpus else None
+            with self._corpus_lock:
+                if generation == self._generation:
+                    if bm25 is not None:
+                        self.bm25 = bm25
+                    break
+            logger.debug("BM25 corpus changed during rebuild, rebuilding again")
+        if bm25 is not None:
+            logger.debug(f"BM25 index rebuilt with {n} documents")
+        self._save_index(bm25, corpus, tokenized_corpus)
     
     def search(self, query: str, top_k: int = 15) -> List[Tuple[str, float, Dict]]:
         """
@@ -157,7 +242,7 @@ class BM25Service:
                 return []
             
             # Get BM25 scores
-            scores = self.bm25.get_scores(tokenized_query)
+            scores = self._get_postings().get_scores(tokenized_query)
             
             # Get top-k indices
             top_indices = scores.argsort()[-top_k:][::-1]
@@ -181,6 +266,19 @@ class BM25Service:
             logger.error(f"BM25 search failed: {e}")
             return []
     
+    def _get_postings(self) -> _PostingsIndex:
+        """Postings view of the current self.bm25, rebuilt after each index rebuild."""
+        bm25 = self.bm25
+        postings = self._postings
+        if postings is not None and postings.source is bm25:
+            return postings
+        with self._postings_lock:  # concurrent searches build it once
+            postings = self._postings
+            if postings is None or postings.source is not bm25:
+                postings = _PostingsIndex(bm25)
+                self._postings = postings
+            return postings
+
     def get_texts(self, chunk_ids: List[str]) -> Dict[str, str]:
         """Return a mapping of chunk_id -> text for the requested IDs.
         
@@ -192,9 +290,12 @@ class BM25Service:
 
     def clear(self) -> None:
         """Clear all BM25 data"""
-        self.bm25 = None
-        self.corpus = []
-        self.tokenized_corpus = []
+        with self._corpus_lock:
+            self.bm25 = None
+            self._postings = None
+            self.corpus = []
+            self.tokenized_corpus = []
+            self._generation += 1
         
         # Delete persisted files
         if self.bm25_index_path.exists():
@@ -204,18 +305,20 @@ class BM25Service:
         
         logger.info("BM25 index cleared")
     
-    def _save_index(self) -> None:
+    def _save_index(
+        self, bm25: Optional[BM25Okapi], corpus: List[Dict], tokenized_corpus: List[List[str]]
+    ) -> None:
         """Persist BM25 index to disk"""
         try:
             # Save BM25 index
             with open(self.bm25_index_path, 'wb') as f:
-                pickle.dump(self.bm25, f)
+                pickle.dump(bm25, f)
             
             # Save corpus and tokenized corpus
             with open(self.documents_path, 'wb') as f:
                 pickle.dump({
-                    'corpus': self.corpus,
-                    'tokenized_corpus': self.tokenized_corpus
+                    'corpus': corpus,
+                    'tokenized_corpus': tokenized_corpus
                 }, f)
             
             logger.debug(f"BM25 index saved to {self.persist_dir}")
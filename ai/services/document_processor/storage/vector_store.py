@@ -1,8 +1,12 @@
 import asyncio
 import logging
 import threading
-from typing import List, Dict, Optional, Any
+from concurrent.futures import Executor
+from typing import List, Dict, Optional, Any, Union
 from datetime import datetime, timezone
+
+import numpy as np
+
 from ..models import DocumentChunk
 
 
@@ -55,17 +59,24 @@ class VectorStoreService:
     async def batch_insert_chunks(
         self,
         chunks: List[DocumentChunk],
-        embeddings: List[List[float]],
+        embeddings: Union[np.ndarray, List[List[float]]],
     ):
-        """Batch insert chunks into the vector store."""
-        if not chunks or not embeddings:
+        """
+        Batch insert chunks into the vector store.
+
+        Args:
+            chunks: Chunks to upsert
+            embeddings: One vector per chunk; a float32 (N, dim) array from
+                EmbeddingService.encode_texts is passed to Chroma without copying
+        """
+        if not chunks or len(embeddings) == 0:
             return
 
         try:
             ids = []
             documents = []
             metadatas = []
-            for chunk, embedding in zip(chunks, embeddings):
+            for chunk in chunks:
                 chunk_id = f"{chunk.file_path}_chunk_{chunk.chunk_id}"
                 metadata = {
                     "file_path": chunk.file_path,
@@ -103,8 +114,12 @@ class VectorStoreService:
         query_embedding: List[float],
         max_results: int = 5,
         where: Optional[Dict[str, Any]] = None,
+        executor: Optional[Executor] = None,
     ):
-        """Search for similar documents. Optional where filters by metadata."""
+        """Search for similar documents. Optional where filters by metadata.
+
+        The blocking query runs on executor, or the loop's default one if None.
+        """
         try:
             kwargs: Dict[str, Any] = dict(
                 query_embeddings=[query_embedding],
@@ -118,7 +133,7 @@ class VectorStoreService:
                 self._initialize_client()
                 return self.collection.query(**kwargs)
 
-            return await asyncio.to_thread(_query)
+            return await asyncio.get_running_loop().run_in_executor(executor, _query)
         except Exception as e:
             logger.error(f"Error searching vector store: {e}")
             raise
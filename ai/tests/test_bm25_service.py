@@ -0,0 +1,69 @@
+"""Tests for BM25Service keyword search."""
+
+import random
+
+from rank_bm25 import BM25Okapi
+
+from services.document_processor.storage.bm25_service import BM25Service, _PostingsIndex
+
+
+def test_postings_scores_match_bm25okapi():
+    rng = random.Random(0)
+    vocab = [f"w{i}" for i in range(300)]
+    corpus = [[rng.choice(vocab[: rng.randint(1, 300)]) for _ in range(rng.randint(1, 60))] for _ in range(400)]
+    bm25 = BM25Okapi(corpus)
+    postings = _PostingsIndex(bm25)
+    for _ in range(50):
+        query = [rng.choice(vocab + ["unseen"]) for _ in range(rng.randint(1, 6))]
+        assert postings.get_scores(query).tobytes() == bm25.get_scores(query).tobytes()
+
+
+def test_search_follows_index_rebuilds(tmp_path):
+    service = BM25Service(persist_dir=str(tmp_path))
+    service.add_documents([
+        {"id": "a:0", "text": "delivery receipt TCO004", "metadata": {"file_path": "a"}},
+        {"id": "b:0", "text": "bring-in permit", "metadata": {"file_path": "b"}},
+        {"id": "b:1", "text": "purchase order", "metadata": {"file_path": "b"}},
+        {"id": "b:2", "text": "quotation summary", "metadata": {"file_path": "b"}},
+    ])
+    service.save()
+    assert [r[0] for r in service.search("TCO004")] == ["a:0"]
+
+    service.add_documents([{"id": "c:0", "text": "permit TCO004 TCO004", "metadata": {"file_path": "c"}}])
+    service.save()
+    assert [r[0] for r in service.search("TCO004")] == ["c:0", "a:0"]
+
+    service.remove_file_chunks("c")
+    assert [r[0] for r in service.search("TCO004")] == ["a:0"]
+
+
+def test_removal_during_save_does_not_install_a_stale_index(tmp_path, monkeypatch):
+    from services.document_processor.storage import bm25_service
+
+    service = BM25Service(persist_dir=str(tmp_path))
+    service.add_documents([
+        {"id": "a:0", "text": "bring-in permit", "metadata": {"file_path": "a"}},
+        {"id": "a:1", "text": "purchase order", "metadata": {"file_path": "a"}},
+        {"id": "b:0", "text": "delivery receipt TCO004", "metadata": {"file_path": "b"}},
+        {"id": "c:0", "text": "quotation summary", "metadata": {"file_path": "c"}},
+        {"id": "c:1", "text": "payment schedule", "metadata": {"file_path": "c"}},
+    ])
+
+    builds = []
+
+    def build_then_remove(tokenized_corpus):
+        # First build is save()'s snapshot; a worker removes a file meanwhile
+        builds.append(len(tokenized_corpus))
+        index = BM25Okapi(tokenized_corpus)
+        if len(builds) == 1:
+            service.remove_file_chunks("a")
+        return index
+
+    monkeypatch.setattr(bm25_service, "BM25Okapi", build_then_remove)
+    service.save()
+
+    assert builds == [5, 3, 3]  # snapshot, removal, save's rebuild
+    assert service.bm25.corpus_size == len(service.corpus) == 3
+    assert [r[0] for r in service.search("TCO004")] == ["b:0"]
+    reloaded = BM25Service(persist_dir=str(tmp_path))
+    assert [doc["id"] for doc in reloaded.corpus] == ["b:0", "c:0", "c:1"]
@@ -0,0 +1,66 @@
+"""Tests for the cross-file embedding batcher."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from services.document_processor.extraction.embedding_batcher import EmbeddingBatcher
+
+
+class _FakeEmbeddingService:
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def encode_texts(self, texts):
+        self.calls.append(list(texts))
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        return np.array([[float(len(t))] for t in texts], dtype=np.float32)
+
+    def get_embedding_dimension(self):
+        return 1
+
+
+def test_concurrent_requests_share_one_model_call():
+    service = _FakeEmbeddingService()
+    batcher = EmbeddingBatcher(service, max_batch=128, max_wait_ms=20)
+
+    async def run():
+        return await asyncio.gather(
+            batcher.encode(["a", "bb"]),
+            batcher.encode(["ccc"]),
+            batcher.encode([]),
+            batcher.encode(["dddd", "e"]),
+        )
+
+    results = asyncio.run(run())
+    assert all(r.dtype == np.float32 for r in results)
+    assert results[2].shape == (0, 1)
+    assert [r.tolist() for r in results] == [[[1.0], [2.0]], [[3.0]], [], [[4.0], [1.0]]]
+    assert service.calls == [["a", "bb", "ccc", "dddd", "e"]]
+
+
+def test_full_batch_flushes_and_errors_reach_every_caller():
+    service = _FakeEmbeddingService()
+    batcher = EmbeddingBatcher(service, max_batch=2, max_wait_ms=200)
+
+    async def run():
+        return await asyncio.gather(*(batcher.encode([str(i)]) for i in range(5)))
+
+    results = asyncio.run(asyncio.wait_for(run(), timeout=5))
+    assert [r.tolist() for r in results] == [[[1.0]]] * 5
+    assert [len(c) for c in service.calls] == [2, 2, 1]
+
+    failing = EmbeddingBatcher(_FakeEmbeddingService(fail=True), max_wait_ms=1)
+
+    async def run_failing():
+        return await asyncio.gather(
+            failing.encode(["a"]), failing.encode(["b"]), return_exceptions=True
+        )
+
+    errors = asyncio.run(run_failing())
+    assert all(isinstance(e, RuntimeError) for e in errors)
+    with pytest.raises(RuntimeError):
+        asyncio.run(failing.encode(["c"]))
@@ -0,0 +1,90 @@
+"""Tests for the filename trie, on both the marisa and pure-Python backends."""
+
+import pytest
+
+from services.document_processor.retrieval import filename_trie
+from services.document_processor.retrieval.filename_trie import FilenameTrie
+
+
+@pytest.fixture(params=["marisa", "python"])
+def backend(request, monkeypatch):
+    if request.param == "marisa":
+        if filename_trie.marisa_trie is None:
+            pytest.skip("marisa-trie not installed")
+    else:
+        monkeypatch.setattr(filename_trie, "marisa_trie", None)
+    return request.param
+
+
+def test_saved_index_reloads_and_drops_names_not_added_again(tmp_path):
+    if filename_trie.marisa_trie is None:
+        pytest.skip("marisa-trie not installed")
+    persist_path = str(tmp_path / "filenames.marisa")
+    trie = FilenameTrie(persist_path=persist_path)
+    trie.add_many([
+        ("Report.pdf", "/docs/Report.pdf", 3.0),
+        ("Receipt.pdf", "/docs/Receipt.pdf", 2.0),
+        ("Invoice.xlsx", "/docs/Invoice.xlsx", 1.0),
+    ])
+    trie.save()
+
+    reloaded = FilenameTrie(persist_path=persist_path)
+    # Loaded names count as removed until a rescan registers them again
+    assert reloaded.search("re") == []
+    # Receipt.pdf was deleted while the app was down, so the rescan skips it
+    reloaded.add_many([
+        ("Report.pdf", "/docs/Report.pdf", 3.0),
+        ("Invoice.xlsx", "/docs/Invoice.xlsx", 1.0),
+    ])
+    assert reloaded.search("re") == ["/docs/Report.pdf"]
+    assert reloaded.top_ranked("i", 5) == ["/docs/Invoice.xlsx"]
+    assert not reloaded.contains("receipt.pdf")
+
+    # Saving again writes only the names that are still present
+    reloaded.add("Notes.txt", "/docs/Notes.txt", 4.0)
+    reloaded.save()
+    again = FilenameTrie(persist_path=persist_path)
+    assert sorted(again._static.keys()) == ["invoice.xlsx", "notes.txt", "report.pdf"]
+
+
+def test_cached_results_are_dropped_after_add_many_and_remove(backend):
+    trie = FilenameTrie()
+    trie.add("Report.pdf", "/docs/Report.pdf", 1.0)
+    assert trie.search("rep") == ["/docs/Report.pdf"]
+    assert trie.search("new") == []
+    assert trie.top_ranked("rep", 5) == ["/docs/Report.pdf"]
+
+    trie.add_many([
+        ("New.txt", "/docs/New.txt", 1.0),
+        ("Report_v2.pdf", "/docs/Report_v2.pdf", 2.0),
+    ])
+    assert trie.search("new") == ["/docs/New.txt"]
+    assert sorted(trie.search("rep")) == ["/docs/Report.pdf", "/docs/Report_v2.pdf"]
+    assert trie.top_ranked("rep", 5) == ["/docs/Report_v2.pdf", "/docs/Report.pdf"]
+
+    trie.remove("Report_v2.pdf", "/docs/Report_v2.pdf")
+    assert trie.search("rep") == ["/docs/Report.pdf"]
+    assert trie.top_ranked("rep", 5) == ["/docs/Report.pdf"]
+    trie.remove("New.txt", "/docs/New.txt")
+    assert trie.search("new") == []
+
+
+def test_shared_filename_goes_from_set_back_to_single_path(backend):
+    trie = FilenameTrie()
+    trie.add("Notes.txt", "/a/Notes.txt", 1.0)
+    assert trie._paths["notes.txt"] == "/a/Notes.txt"
+
+    trie.add("notes.TXT", "/b/notes.TXT", 2.0)
+    assert trie._paths["notes.txt"] == {"/a/Notes.txt", "/b/notes.TXT"}
+    assert sorted(trie.search("notes")) == ["/a/Notes.txt", "/b/notes.TXT"]
+    assert trie.top_ranked("notes", 1) == ["/b/notes.TXT"]
+
+    trie.remove("notes.TXT", "/b/notes.TXT")
+    assert trie._paths["notes.txt"] == "/a/Notes.txt"
+    assert trie.search("notes") == ["/a/Notes.txt"]
+    assert trie.top_ranked("notes", 5) == ["/a/Notes.txt"]
+    assert trie.file_count == 1
+
+    trie.remove("Notes.txt", "/a/Notes.txt")
+    assert not trie.contains("notes.txt")
+    assert trie.search("notes") == []
@@ -0,0 +1,28 @@
+"""Tests for Reciprocal Rank Fusion in HybridSearchService."""
+
+from services.document_processor.retrieval.hybrid_search import HybridSearchService
+
+
+def _results(ids):
+    return [(doc_id, 1.0, {"id": doc_id, "rank": rank}) for rank, doc_id in enumerate(ids, start=1)]
+
+
+def test_fuse_results_scores_and_order():
+    fused = HybridSearchService(k=60).fuse_results(_results(["a", "b", "c"]), _results(["c", "d"]))
+    assert [doc_id for doc_id, _, _ in fused] == ["c", "a", "b", "d"]
+    assert fused[0][1] == 0.5 / 63 + 0.5 / 61
+    # First metadata seen for an id wins
+    assert fused[0][2]["rank"] == 3
+
+
+def test_fuse_results_top_k_matches_full_sort_prefix():
+    semantic = _results([f"s{i}" for i in range(50)] + ["x"])
+    keyword = _results(["x"] + [f"k{i}" for i in range(50)])
+    service = HybridSearchService()
+    full = service.fuse_results(semantic, keyword)
+    for top_k in (0, 1, 2, 5, 101, 500):
+        assert service.fuse_results(semantic, keyword, top_k=top_k) == full[:top_k]
+
+
+def test_fuse_results_empty():
+    assert HybridSearchService().fuse_results([], []) == []
@@ -0,0 +1,65 @@
+"""Tests for token usage accounting on streamed LLM responses."""
+
+import asyncio
+from types import SimpleNamespace
+
+from services.document_processor.llm.llm_service import LLMService
+
+
+class _FakeLiteLLM:
+    def __init__(self, deltas):
+        self.deltas = deltas
+        self.calls = []
+
+    async def acompletion(self, **kwargs):
+        self.calls.append(kwargs)
+        include_usage = kwargs.get("stream_options", {}).get("include_usage", False)
+
+        async def chunks():
+            for text in self.deltas:
+                delta = SimpleNamespace(content=text)
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+            if include_usage:
+                usage = SimpleNamespace(prompt_tokens=12, completion_tokens=3, total_tokens=15)
+                yield SimpleNamespace(choices=[], usage=usage)
+
+        return chunks()
+
+
+def _service(provider, fake):
+    service = LLMService(
+        ollama_base_url="http://localhost:11434",
+        ollama_model="llama3",
+        openai_api_key="key",
+        provider=provider,
+    )
+    service._litellm = lambda: fake
+    return service
+
+
+def test_generate_response_records_streamed_usage():
+    fake = _FakeLiteLLM(["The total ", "is $120."])
+    service = _service("openai", fake)
+
+    answer = asyncio.run(service.generate_response("What is the total?", "Invoice: $120"))
+
+    assert answer == "The total is $120."
+    assert fake.calls[0]["stream"] is True
+    assert fake.calls[0]["stream_options"] == {"include_usage": True}
+    assert service.get_token_usage() == {"prompt": 12, "completion": 3, "total": 15}
+
+
+def test_chat_messages_stream_records_usage_and_skips_unsupported_providers():
+    fake = _FakeLiteLLM(["hi"])
+    service = _service("openai", fake)
+
+    async def collect():
+        return [d async for d in service.chat_messages_stream([{"role": "user", "content": "hello"}])]
+
+    assert asyncio.run(collect()) == ["hi"]
+    assert service.get_token_usage()["total"] == 15
+
+    ollama = _service("ollama", _FakeLiteLLM(["hi"]))
+    assert asyncio.run(ollama.generate_response("q", "context")) == "hi"
+    assert "stream_options" not in ollama._litellm().calls[0]
+    assert ollama.get_token_usage()["total"] == 0
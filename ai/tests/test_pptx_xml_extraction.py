@@ -0,0 +1,57 @@
+"""Tests for the direct-XML PPTX reader — must match the python-pptx object-model path."""
+
+import pytest
+from services.document_processor.extraction.text_extractor import TextExtractor
+
+pptx = pytest.importorskip("pptx")
+from pptx.util import Inches  # noqa: E402
+
+
+def _build_deck(path):
+    prs = pptx.Presentation()
+    for i in range(11):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"Title {i}"
+        body = slide.placeholders[1].text_frame
+        body.text = f"Body {i}"
+        body.add_paragraph().text = "   "
+    table = prs.slides[2].shapes.add_table(2, 2, Inches(1), Inches(2), Inches(4), Inches(1)).table
+    for r in range(2):
+        for c in range(2):
+            table.cell(r, c).text = f"r{r}c{c}"
+    outer = prs.slides[3].shapes.add_group_shape()
+    inner = outer.shapes.add_group_shape()
+    inner.shapes.add_textbox(0, 0, Inches(1), Inches(1)).text_frame.text = "nested"
+    # Move the last slide to the front so part names no longer match presentation order
+    slide_ids = prs.slides._sldIdLst
+    last = slide_ids[-1]
+    slide_ids.remove(last)
+    slide_ids.insert(0, last)
+    prs.save(path)
+
+
+def _object_model_text(extractor, path):
+    extractor._extract_pptx_xml = lambda file_path: None
+    return extractor._extract_pptx(path)
+
+
+def test_xml_reader_matches_python_pptx(tmp_path):
+    path = str(tmp_path / "deck.pptx")
+    _build_deck(path)
+    xml_text = TextExtractor()._extract_pptx_xml(path)
+    assert xml_text == _object_model_text(TextExtractor(), path)
+
+
+def test_xml_reader_follows_presentation_order(tmp_path):
+    path = str(tmp_path / "deck.pptx")
+    _build_deck(path)
+    text = TextExtractor()._extract_pptx_xml(path)
+    assert text.startswith("Slide 1:\nTitle 10\n")
+    assert "Headers: r0c0 | r0c1\nRow 1: r1c0 | r1c1" in text
+    assert "nested" in text
+
+
+def test_xml_reader_returns_none_for_non_zip(tmp_path):
+    path = tmp_path / "broken.pptx"
+    path.write_bytes(b"not a zip archive")
+    assert TextExtractor()._extract_pptx_xml(str(path)) is None
@@ -0,0 +1,61 @@
+"""Tests for the semantic LLM response cache."""
+
+import asyncio
+
+from services.document_processor.llm.response_cache import SemanticResponseCache
+
+_VECTORS = {
+    "what is the invoice total?": [1.0, 0.0, 0.0],
+    "how much is the invoice in total?": [0.99, 0.1, 0.0],
+    "who signed the contract?": [0.0, 1.0, 0.0],
+}
+
+
+def _embed(text):
+    return _VECTORS[" ".join(text.lower().split())]
+
+
+def test_exact_and_semantic_hits_within_bucket():
+    cache = SemanticResponseCache(_embed)
+    bucket = SemanticResponseCache.bucket_key("model", "context A")
+    cache.store(bucket, "What is the invoice total?", "$120")
+
+    async def run():
+        assert await cache.lookup(bucket, "  what is the INVOICE total? ") == "$120"
+        assert await cache.lookup(bucket, "How much is the invoice in total?") == "$120"
+        assert await cache.lookup(bucket, "Who signed the contract?") is None
+        other = SemanticResponseCache.bucket_key("model", "context B")
+        assert await cache.lookup(other, "What is the invoice total?") is None
+
+    asyncio.run(run())
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_expired_entries_and_lru_eviction():
+    cache = SemanticResponseCache(None, max_entries=2, ttl_seconds=0)
+    cache.store("a", "q", "answer")
+    assert asyncio.run(cache.lookup("a", "q")) is None
+    assert len(cache) == 0
+
+    cache = SemanticResponseCache(None, max_entries=2)
+    for bucket in ("a", "b", "c"):
+        cache.store(bucket, "q", bucket)
+    assert len(cache) == 2
+    assert asyncio.run(cache.lookup("a", "q")) is None
+    assert asyncio.run(cache.lookup("c", "q")) == "c"
+
+
+def test_questions_differing_in_numbers_or_quotes_do_not_match():
+    # Embeddings that cannot tell these apart, as with a real model
+    cache = SemanticResponseCache(lambda text: [1.0, 0.0])
+    bucket = SemanticResponseCache.bucket_key("model", "context")
+    cache.store(bucket, "What is the total for invoice 123?", "$120")
+    cache.store(bucket, 'Who signed "Lease A"?', "Ann")
+
+    async def run():
+        assert await cache.lookup(bucket, "What is the total for invoice 124?") is None
+        assert await cache.lookup(bucket, "Total for March 2024?") is None
+        assert await cache.lookup(bucket, 'Who signed "Lease B"?') is None
+        assert await cache.lookup(bucket, "what's the total of invoice 123") == "$120"
+
+    asyncio.run(run())
@@ -0,0 +1,27 @@
+"""Tests for .txt extraction: encodings and line endings."""
+
+import codecs
+
+from services.document_processor.extraction import text_extractor
+from services.document_processor.extraction.text_extractor import TextExtractor
+
+
+def test_crlf_and_cr_line_endings_become_lf(tmp_path):
+    extractor = TextExtractor()
+    crlf = tmp_path / "windows.txt"
+    crlf.write_bytes(b"Para one line.\r\n\r\nPara two.\r\n")
+    old_mac = tmp_path / "mac.txt"
+    old_mac.write_bytes(b"Para one line.\r\rPara two.\r")
+    utf16 = tmp_path / "utf16.txt"
+    utf16.write_bytes(codecs.BOM_UTF16_LE + "Para one line.\r\n\r\nPara two.\r\n".encode("utf-16-le"))
+
+    for path in (crlf, old_mac, utf16):
+        assert extractor._extract_txt(str(path)) == "Para one line.\n\nPara two.\n"
+
+
+def test_mmap_path_normalizes_line_endings(tmp_path, monkeypatch):
+    monkeypatch.setattr(text_extractor, "_MMAP_TEXT_THRESHOLD", 0)
+    path = tmp_path / "large.txt"
+    path.write_bytes(b"Para one line.\r\n\r\nPara two.\rEnd.\r\n")
+
+    assert TextExtractor()._extract_txt(str(path)) == "Para one line.\n\nPara two.\nEnd.\n"